@@ -4,15 +4,18 @@ import re
 import glob
 import sys
 import string
-import math
 
-def calculate_out_dimension(external_dim, offset, angle):
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld.bendtable import bend_geometry
+
+def calculate_out_dimension(external_dim, inner_radius, thickness, angle):
     """
     Oblicza długość zewnętrzną (out) wg wzoru:
-    x_out = x_zewn + offset * tan((180 - kąt) / 2)
+    x_out = x_zewn + offset * tan((180 - kąt) / 2), offset = R_wewn + grubość
+    (offset * tan z tablicy geometrii gięcia dld.bendtable)
     """
-    angle_rad = math.radians((180 - angle) / 2)
-    return round(external_dim + offset * math.tan(angle_rad))
+    return round(external_dim + bend_geometry(angle, inner_radius, thickness).setback)
 
 def calculate_in_dimension(external_dim, inner_radius, thickness, angle):
     """
@@ -20,8 +23,7 @@ def calculate_in_dimension(external_dim, inner_radius, thickness, angle):
     x_in = x_zewn + (łuk po neutralnej) / 2
     gdzie łuk po neutralnej = (R_wewn + 1/2 * grubość) * (pi * kąt / 180)
     """
-    neutral_arc_length = (inner_radius + thickness / 2) * math.radians(angle)
-    return round(external_dim + neutral_arc_length / 2)
+    return round(external_dim + bend_geometry(angle, inner_radius, thickness).neutral_arc / 2)
 
 def process_file(filename, output_dir):
     if not os.path.isfile(filename):
@@ -42,16 +44,13 @@ def process_file(filename, output_dir):
     # Pobranie wartości kąta
     angle = float(root.find(".//VDeformableComponentAngle").get("value", "0"))
 
-    # Pobranie offsetu (r+g)
-    offset = inner_radius + thickness
-
     # Pobranie wymiarów z pliku
     external_a = float(root.find(".//StaticComponent[WorkpieceComponentName[@value='MainPlane']]/StaticComponentPart/StaticComponentHull").get("value", "").split()[2])
     external_b = float(root.find(".//StaticComponent[WorkpieceComponentName[@value='SC00']]/StaticComponentPart/StaticComponentHull").get("value", "").split()[6])
 
     # Obliczenia wymiarów OUT
-    a_out = calculate_out_dimension(external_a, offset, angle)
-    b_out = calculate_out_dimension(external_b, offset, angle)
+    a_out = calculate_out_dimension(external_a, inner_radius, thickness, angle)
+    b_out = calculate_out_dimension(external_b, inner_radius, thickness, angle)
 
     # Obliczenia wymiarów IN
     a_in = calculate_in_dimension(external_a, inner_radius, thickness, angle)
@@ -7,51 +7,11 @@ import re
 import glob
 import sys
 import string
-import math
 
-def parse_outline_value(value_str):
-    """
-    Z pliku Delem (np. '4 0 6.613518 200 6.613518 false ...')
-    wyciąga pary (x, y) i zwraca listę krotek [(x1,y1), (x2,y2), ...].
-    Pomija słowa 'outline', 'true', 'false'.
-    """
-    tokens = value_str.split()
-    numeric_vals = []
-    for t in tokens:
-        if t.lower() in ['outline', 'true', 'false']:
-            continue
-        try:
-            numeric_vals.append(float(t))
-        except ValueError:
-            pass
-    if not numeric_vals:
-        return []
-    # Pierwsza liczba to ilość punktów w Outline
-    segment_count = int(numeric_vals[0])
-    coords = numeric_vals[1:]
-    points = []
-    for i in range(0, len(coords), 2):
-        if i + 1 < len(coords):
-            x = coords[i]
-            y = coords[i + 1]
-            points.append((x, y))
-    return points
-
-def bounding_box(coords):
-    """
-    Dla listy punktów [(x1,y1), (x2,y2), ...]
-    zwraca (xmin, xmax, ymin, ymax).
-    Jeśli brak punktów, zwraca (0,0,0,0).
-    """
-    if not coords:
-        return 0, 0, 0, 0
-    xs = [p[0] for p in coords]
-    ys = [p[1] for p in coords]
-    return min(xs), max(xs), min(ys), max(ys)
-
-def width_height_from_box(xmin, xmax, ymin, ymax):
-    """Zwraca (width, height) = (xmax - xmin, ymax - ymin)."""
-    return abs(xmax - xmin), abs(ymax - ymin)
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld import GEOMETRY, build_chain, load_workpiece, outline_sizes, parse_workpiece
+from dld.archive import is_archive, iter_archive, member_output_dir
 
 def normalize_angle(angle_deg):
     """
@@ -64,108 +24,65 @@ def normalize_angle(angle_deg):
         return angle_deg - 360
     return angle_deg
 
-def process_file(filename, output_dir):
-    if not os.path.isfile(filename):
-        print(f"Brak pliku: {filename}")
-        return
+def process_file(filename, output_dir, wp=None):
+    """
+    Liczy wymiary detalu i zapisuje wynik_<nazwa>.txt w output_dir.
+    wp – Workpiece odczytany wcześniej (np. z członka archiwum; filename jest
+    wtedy nazwą członka); bez wp plik jest odczytywany z dysku.
+    """
+    if wp is None:
+        if not os.path.isfile(filename):
+            print(f"Brak pliku: {filename}")
+            return
 
-    try:
-        tree = ET.parse(filename)
-        root = tree.getroot()
-    except ET.ParseError as e:
-        print(f"Błąd parsowania pliku {filename}: {e}")
-        return
+        try:
+            wp = load_workpiece(filename, sections=GEOMETRY)
+        except ET.ParseError as e:
+            print(f"Błąd parsowania pliku {filename}: {e}")
+            return
 
     # Zmienne ogólne
-    dimension_type = None
-    thickness_val = 0.0
+    dimension_type = wp.dimensions or None
+    thickness_val = wp.thickness
     radius_val = 0.0
 
     mainplane_value = None       # a (z bounding box)
     sc_components = {}           # np. {"SC00": float, "SC01": float, ...}
     bends_info = []              # lista słowników z info o DC (kąty, łuki)
 
-    for elem in root.iter():
-        tag_name = elem.tag.lower()
-
-        # Atrybuty ogólne
-        if tag_name.endswith("workpiecedimensions"):
-            dimension_type = elem.get("value", "")
-        if tag_name.endswith("workpiecethickness"):
-            try:
-                thickness_val = float(elem.get("value", "0"))
-            except ValueError:
-                thickness_val = 0.0
-        if tag_name.endswith("preferredinnerradius"):
-            try:
-                radius_val = float(elem.get("value", "0"))
-            except ValueError:
-                radius_val = 0.0
-
-        # Odczyt Outline/Hull -> bounding box
-        if tag_name.endswith("staticcomponent"):
-            wp_name = elem.find("./WorkpieceComponentName")
-            if wp_name is not None:
-                comp_name = wp_name.get("value", "")
-                hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
-                if hull_elem is not None:
-                    val_str = hull_elem.get("value", "")
-                    coords = parse_outline_value(val_str)
-                    box = bounding_box(coords)
-                    width, height = width_height_from_box(*box)
-                    # Bierzemy mniejszy wymiar (według wcześniejszych założeń)
-                    value_min = min(width, height)
-
-                    if comp_name == "MainPlane":
-                        mainplane_value = value_min
-                    else:
-                        # Jeśli nazwa to SCxx -> zapisz
-                        if re.match(r'^SC\d+', comp_name):
-                            sc_components[comp_name] = value_min
-
-        # Deformowalny komponent (VDeformableComponent) -> gięcia DCxx
-        if tag_name.endswith("vdeformablecomponent"):
-            wp_name = elem.find("./WorkpieceComponentName")
-            if wp_name is not None:
-                comp_name = wp_name.get("value", "")
-                if re.match(r'^DC\d+', comp_name):
-                    # Wyciągamy łuk z bounding box
-                    hulls_elem = elem.find("./VDeformableComponentHulls")
-                    arc_value = 0.0
-                    if hulls_elem is not None:
-                        val_str = hulls_elem.get("value", "")
-                        coords = parse_outline_value(val_str)
-                        box = bounding_box(coords)
-                        width, height = width_height_from_box(*box)
-                        arc_value = min(width, height)
-
-                    # Wczytujemy kąt
-                    angle_elem = elem.find("./VDeformableComponentAngle")
-                    angle_after = 0.0
-                    if angle_elem is not None:
-                        try:
-                            angle_after = float(angle_elem.get("value", "0"))
-                        except ValueError:
-                            angle_after = 0.0
-
-                    # Alternatywnie, kąt może być w <VBendDeformation><AngleAfter>...
-                    deformation_elem = elem.find("./VBendDeformation")
-                    if deformation_elem is not None:
-                        angle_after_elem = deformation_elem.find("./AngleAfter")
-                        if angle_after_elem is not None:
-                            try:
-                                angle_after = float(angle_after_elem.get("value", "0"))
-                            except ValueError:
-                                pass
-
-                    angle_normalized = normalize_angle(angle_after)
-
-                    bends_info.append({
-                        "name": comp_name,
-                        "arc": arc_value,        # bounding box minimal dimension
-                        "angle_raw": angle_after,
-                        "angle_norm": angle_normalized
-                    })
+    # Promień – ostatni PreferredInnerRadius stref gięcia (WorkpieceMap; BendSequence nie jest czytany)
+    for part in wp.deformable_components:
+        if part.preferred_inner_radius is not None:
+            radius_val = part.preferred_inner_radius
+
+    # Odczyt Outline/Hull -> bounding box: obrysy SC i DC pliku liczone razem (dld.bbox)
+    static_hulls = [sc for sc in wp.static_components if sc.hull is not None]
+    bend_zones = [dc for dc in wp.deformable_components if re.match(r'^DC\d+', dc.name)]
+    sizes = outline_sizes([sc.hull for sc in static_hulls] + [dc.hulls for dc in bend_zones])
+    # Bierzemy mniejszy wymiar (według wcześniejszych założeń)
+    min_dims = sizes.min_dim.tolist()
+
+    for sc, value_min in zip(static_hulls, min_dims):
+        if sc.name == "MainPlane":
+            mainplane_value = value_min
+        else:
+            # Jeśli nazwa to SCxx -> zapisz
+            if re.match(r'^SC\d+', sc.name):
+                sc_components[sc.name] = value_min
+
+    # Deformowalny komponent (VDeformableComponent) -> gięcia DCxx
+    # (łuk z bounding box; strefa bez Hulls daje 0.0)
+    for dc, arc_value in zip(bend_zones, min_dims[len(static_hulls):]):
+        # Kąt: VBendDeformation/AngleAfter, a w razie braku VDeformableComponentAngle
+        angle_after = dc.bend_angle
+        angle_normalized = normalize_angle(angle_after)
+
+        bends_info.append({
+            "name": dc.name,
+            "arc": arc_value,        # bounding box minimal dimension
+            "angle_raw": angle_after,
+            "angle_norm": angle_normalized
+        })
 
     # Sprawdzamy, czy mamy potrzebne informacje
     missing_info = []
@@ -182,43 +99,10 @@ def process_file(filename, output_dir):
         print(f"Plik {filename}: Brak odczytu: {', '.join(missing_info)}.")
         return
 
-    # Bierzemy pierwsze (albo jedyne) gięcie:
-    # (uwaga: jeżeli w pliku jest wiele DC, trzeba by to rozdzielić osobno
-    #  lub wykrywać, które DC wpływa na który wymiar. Tu – jeden DC wystarcza.)
-    bend = bends_info[0]
-    angle_deg = abs(bend["angle_norm"])  # w stopniach, np. 90
-    arc_bb   = bend["arc"]              # bounding-box łuku (dla neutral axis)
-
-    # offset = (r_in + g)
+    # offset = (r_in + g) – do wydruku; w obliczeniach każde gięcie bierze
+    # własny PreferredInnerRadius (radius_val tylko dla stref bez promienia)
     offset_val = radius_val + thickness_val
 
-    # Wyliczamy "czystą" wartość tangensa wg formuły:
-    #   tan((180 - kąt) / 2)  -- w stopniach
-    #   (dla 90° => (180-90)=90 => 90/2=45 => tan(45)=1 => out = offset)
-    #   (dla 80° => (180-80)=100 => 50 => tan(50) ≈ 1.19175 => out = 1.19 * offset)
-    half_angle = (180.0 - angle_deg) / 2.0
-    if half_angle < 0:
-        # teoretycznie gdyby kąt >180 => (180-angle) jest ujemne...
-        # tu wg przykładu 80, 90 – raczej ok
-        half_angle = abs(half_angle)
-    half_angle_rad = math.radians(half_angle)
-    tan_val = math.tan(half_angle_rad)
-
-    # Długość łuku "po neutralnej" = (kąt w radianach) * (r_in + g/2)
-    #  - ale w pliku bounding-box "arc_bb" może już być praktycznie
-    #    równy tej długości (jeśli Delem zapisał łuk w skali neutralnej).
-    #  - natomiast w Twoim przykładzie (11.989263) to jest właściwie
-    #    (π/2)*(r_in + g/2) ≈ 11.99 -> pasuje do 90°, radius=5.6326 +2=7.6326
-    #
-    # Jeżeli chcesz liczyć "z definicji":
-    #   angle_rad = kąt_w_stopniach * π/180
-    #   arc_neutral = angle_rad * (radius_val + thickness_val/2)
-    #
-    #  a potem porównywać z tym co jest w arc_bb.
-    #  W przykładach jest spójne, bo arc_bb ~ arc_neutral.
-    angle_rad = math.radians(angle_deg)
-    arc_neutral = angle_rad * (radius_val + thickness_val / 2.0)
-
     # ---------------------------------------------------------
     # Teraz ustalamy a, b, c... z mainplane_value i sc_components
     #  (tzw. wartości "zewn." = bounding box)
@@ -282,43 +166,30 @@ def process_file(filename, output_dir):
     #
     #  gdzie arc = arc_neutral (lub b["arc"], jeśli to jest odczytane
     #  na poziomie neutralnym). W twoich przykładach sprawdza się b["arc"].
-    #  Dla uproszczenia – zakładamy, że każdy z tych odcinków
-    #  jest "pod wpływem" jednego zgięcia. W realnych detalach może być więcej.
+    #  Sumujemy po wszystkich gięciach sąsiadujących z danym odcinkiem.
     # ---------------------------------------------------------
 
-    # Dla jednego DC = bend:
-    #   offset_part = offset_val * tan_val
-    #   arc_part    = arc_bb/2  (bo w pliku jest arc_bb ~ arc_neutral)
+    # Każda flansza dostaje offsety WŁASNYCH gięć (łańcuch z Left/RightStaticComponent,
+    # dld.chain) – flansza środkowa (np. SC00 w prd.8_300_100_50_) sumuje oba sąsiednie:
+    #   offset_part = (r + g) * tan((180 - |kąt|) / 2)
+    #   arc_part    = łuk/2  (bo w pliku jest arc_bb ~ arc_neutral)
     #
-    # Przy kąt=90 => tan_val=1, offset_part = offset_val
+    # Przy kąt=90 => tan=1, offset_part = r + g
     #               arc_bb= ok.12 => arc_bb/2=6 => stąd np. 90.37 + 9.63 => 100
     #               i 90.37 + 6 => 96.37 (~96)
-    # Przy kąt=80 => tan_val= ~1.19 => offset_part ~ 1.19*(r+g)
+    # Przy kąt=80 => tan= ~1.19 => offset_part ~ 1.19*(r+g)
     #
-    offset_part = offset_val * tan_val
-    arc_part    = arc_bb / 2.0   # lub arc_neutral/2.0
-
-    # Obliczamy a(out), a(in)
-    a_out = a_zewn + offset_part
-    a_in  = a_zewn + arc_part
-
-    # dla SCxx -> b, c...
-    #  też to samo, zakładając że to samo gięcie DC00 dotyczy b, c itd.
-    #  w Twoich przykładach: SC00 => b
-    out_values = {}
-    in_values  = {}
-
-    # Zaczynamy od "a"
-    out_values["a"] = a_out
-    in_values["a"]  = a_in
+    chain = build_chain(wp)
+    lengths = {"MainPlane": a_zewn}
+    lengths.update(sc_components)
+    dims = chain.dimensions(lengths, thickness_val, radius_val)
 
+    out_values = {"a": dims["MainPlane"].out}
+    in_values  = {"a": dims["MainPlane"].inner}
     for sc_name in sorted_sc_names:
         label = sc_labels[sc_name]
-        x_zewn = sc_components[sc_name]
-        x_out = x_zewn + offset_part
-        x_in  = x_zewn + arc_part
-        out_values[label] = x_out
-        in_values[label]  = x_in
+        out_values[label] = dims[sc_name].out
+        in_values[label]  = dims[sc_name].inner
 
     # Zaokrąglamy do integerów:
     #  w przykładach widać, że 90.367398 + 9.6326 = 100.0 -> super
@@ -403,12 +274,41 @@ def process_file(filename, output_dir):
     except IOError as e:
         print(f"Błąd zapisu pliku {output_filename}: {e}")
 
+def process_archive(archive_path):
+    """
+    Przetwarza pliki .dld z archiwum zip/tar bez rozpakowywania.
+    Wyniki trafiają do wyniki1/<nazwa archiwum>/<katalogi członka>/.
+    """
+    output_root = os.path.join(os.path.dirname(os.path.abspath(archive_path)), "wyniki1",
+                               os.path.basename(archive_path))
+    count = 0
+    for member_name, member in iter_archive(archive_path):
+        count += 1
+        try:
+            wp = parse_workpiece(member, sections=GEOMETRY)
+        except ET.ParseError as e:
+            print(f"Błąd parsowania pliku {member_name}: {e}")
+            continue
+        output_dir = member_output_dir(output_root, member_name)
+        os.makedirs(output_dir, exist_ok=True)
+        process_file(member_name, output_dir, wp)
+
+    if not count:
+        print(f"Nie znaleziono żadnych plików .dld w archiwum: {archive_path}")
+        return
+    print(f"\nPrzetworzono {count} plików .dld z archiwum: {archive_path}")
+
 def main():
     if len(sys.argv) > 1:
         folder = sys.argv[1]
     else:
         folder = os.getcwd()
 
+    # Archiwum zip/tar z programami – czytamy je bez rozpakowywania
+    if is_archive(folder):
+        process_archive(folder)
+        return
+
     if not os.path.isdir(folder):
         print(f"Podany folder nie istnieje: {folder}")
         return
@@ -75,6 +75,37 @@ def same_edge(e1, e2, tol=1e-6):
     backward = close(p1,q2) and close(p2,q1)
     return (forward or backward)
 
+def _grid_cell(p, cell_size):
+    """Komórka siatki (kwadrat o boku cell_size), w której leży punkt p."""
+    return (math.floor(p[0] / cell_size), math.floor(p[1] / cell_size))
+
+def build_edge_grid(edges, tol=1e-6):
+    """
+    Siatka krawędzi do szybkiego same_edge: komórka każdego z dwóch końców
+    krawędzi -> lista krawędzi. Bok komórki to 2*tol, więc punkty bliższe
+    niż tol (w każdej osi) leżą w tej samej albo w sąsiedniej komórce.
+    """
+    cell_size = 2 * tol
+    grid = {}
+    for e in edges:
+        for p in e:
+            grid.setdefault(_grid_cell(p, cell_size), []).append(e)
+    return grid
+
+def has_same_edge(edge, grid, tol=1e-6):
+    """
+    Czy w siatce (build_edge_grid) jest krawędź 'taka sama' jak edge (same_edge).
+    Pasująca krawędź ma jeden z końców przy edge[0] (w przód lub wstecz),
+    więc sprawdzamy tylko krawędzie z 3x3 komórek wokół edge[0].
+    """
+    cx, cy = _grid_cell(edge[0], 2 * tol)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for other in grid.get((cx + dx, cy + dy), ()):
+                if same_edge(edge, other, tol):
+                    return True
+    return False
+
 def measure_free_edge(hull_pts, shortcontours):
     """
     Dla prostokątnego (najczęściej 4-wierzchołkowego) `hull_pts`
@@ -100,17 +131,15 @@ def measure_free_edge(hull_pts, shortcontours):
 
     # zbierz krawędzie shortcontour
     #  bo np. SC00 może mieć 2 <DeformableCompShortening> z DC00 i DC01
-    used_edges = []
+    # Krawędzie trafiają do siatki po końcach – dopasowanie krawędzi hull
+    # sprawdza tylko sąsiednie komórki (liniowo względem liczby krawędzi).
+    sc_edges = []
     for sc_poly in shortcontours:
-        sc_edges = edges_of_polygon(sc_poly, close_loop=True)
-        # dopasuj sc_edges do hull_edges
-        for he in hull_edges:
-            for se in sc_edges:
-                if same_edge(he, se):
-                    used_edges.append(he)
-
-    # Teraz krawędzie wolne to hull_edges \ used_edges
-    free_edges = [he for he in hull_edges if he not in used_edges]
+        sc_edges.extend(edges_of_polygon(sc_poly, close_loop=True))
+    sc_grid = build_edge_grid(sc_edges)
+
+    # Teraz krawędzie wolne to krawędzie hull bez odpowiednika w shortcontour
+    free_edges = [he for he in hull_edges if not has_same_edge(he, sc_grid)]
 
     if not free_edges:
         # Brak wolnej krawędzi -> w specyficznych sytuacjach
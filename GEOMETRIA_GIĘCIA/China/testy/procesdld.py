@@ -1,8 +1,13 @@
 import xml.etree.ElementTree as ET
 import os
+import sys
 import math
 import pandas as pd
 
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from dld.archive import is_archive, iter_archive, member_output_dir
+
 def parse_outline(value):
     tokens = value.split()
     try:
@@ -27,12 +32,14 @@ def compute_lengths(points):
         lengths.append(length)
     return lengths, sum(lengths)
 
-def process_dld_file(filepath, output_dir):
+def process_dld_file(filepath, output_dir, source_name=None):
+    # filepath – ścieżka albo strumień członka archiwum (wtedy source_name = nazwa członka)
+    source_name = source_name or filepath
     try:
         tree = ET.parse(filepath)
         root = tree.getroot()
     except ET.ParseError as e:
-        print(f"Błąd parsowania pliku {filepath}: {e}")
+        print(f"Błąd parsowania pliku {source_name}: {e}")
         return
 
     results = []
@@ -47,12 +54,30 @@ def process_dld_file(filepath, output_dir):
 
     if results:
         df = pd.DataFrame(results)
-        output_filename = os.path.join(output_dir, os.path.basename(filepath).replace(".dld", "_results.xlsx"))
+        output_filename = os.path.join(output_dir, os.path.basename(source_name).replace(".dld", "_results.xlsx"))
         df.to_excel(output_filename, index=False)
         print(f"Wyniki zapisano do: {output_filename}")
 
-def process_all_dld_files():
-    folder = os.getcwd()
+def process_archive(archive_path):
+    output_root = os.path.join(os.path.dirname(os.path.abspath(archive_path)), "wyniki_dld",
+                               os.path.basename(archive_path))
+    count = 0
+    for member_name, member in iter_archive(archive_path):
+        count += 1
+        output_dir = member_output_dir(output_root, member_name)
+        os.makedirs(output_dir, exist_ok=True)
+        process_dld_file(member, output_dir, member_name)
+    if not count:
+        print("Brak plików .dld w archiwum.")
+        return
+    print("Przetwarzanie zakończone.")
+
+def process_all_dld_files(source=None):
+    # source – folder z plikami .dld lub archiwum zip/tar (domyślnie bieżący folder)
+    if source is not None and is_archive(source):
+        process_archive(source)
+        return
+    folder = source or os.getcwd()
     output_dir = os.path.join(folder, "wyniki_dld")
     os.makedirs(output_dir, exist_ok=True)
     
@@ -66,4 +91,4 @@ def process_all_dld_files():
     print("Przetwarzanie zakończone.")
 
 if __name__ == "__main__":
-    process_all_dld_files()
+    process_all_dld_files(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -7,48 +7,9 @@ import re
 import glob
 import sys
 
-def parse_outline_value(value_str):
-    """
-    Z pliku Delem (np. '4 0 6.613518 200 6.613518 false ...') 
-    wyciąga pary (x, y) i zwraca listę krotek [(x1,y1), (x2,y2), ...].
-    Pomija słowa 'true'/'false'.
-    """
-    tokens = value_str.split()
-    numeric_vals = []
-    for t in tokens:
-        if t.lower() in ['outline', 'true', 'false']:
-            continue
-        try:
-            numeric_vals.append(float(t))
-        except ValueError:
-            pass
-    if not numeric_vals:
-        return []
-    segment_count = int(numeric_vals[0])
-    coords = numeric_vals[1:]
-    points = []
-    for i in range(0, len(coords), 2):
-        if i+1 < len(coords):
-            x = coords[i]
-            y = coords[i+1]
-            points.append((x, y))
-    return points
-
-def bounding_box(coords):
-    """
-    Dla listy punktów [(x1,y1), (x2,y2), ...] 
-    zwraca (xmin, xmax, ymin, ymax).
-    Jeśli brak punktów, zwraca (0,0,0,0).
-    """
-    if not coords:
-        return 0, 0, 0, 0
-    xs = [p[0] for p in coords]
-    ys = [p[1] for p in coords]
-    return min(xs), max(xs), min(ys), max(ys)
-
-def width_height_from_box(xmin, xmax, ymin, ymax):
-    """Zwraca (width, height) = (xmax - xmin, ymax - ymin)."""
-    return abs(xmax - xmin), abs(ymax - ymin)
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld.bbox import outline_sizes
 
 def process_file(filename, output_dir):
     if not os.path.isfile(filename):
@@ -69,6 +30,7 @@ def process_file(filename, output_dir):
     mainplane_info = {}
     sc00_info = {}
     bends = []  # Lista na informacje o gięciach
+    hull_values = []  # Obrysy pliku – bounding boxy liczone razem po przejściu (dld.bbox)
     
     # Przeszukujemy XML
     for elem in root.iter():
@@ -96,27 +58,13 @@ def process_file(filename, output_dir):
                 
                 hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
                 if hull_elem is not None:
-                    val_str = hull_elem.get("value", "")
-                    coords = parse_outline_value(val_str)
-                    box = bounding_box(coords)
-                    width, height = width_height_from_box(*box)
-                    a = max(width, height)
-                    b = min(width, height)
+                    hull = len(hull_values)
+                    hull_values.append(hull_elem.get("value", ""))
                     
                     if comp_name == "MainPlane":
-                        mainplane_info = {
-                            "box": box,
-                            "width": width,
-                            "height": height,
-                            "a": a
-                        }
+                        mainplane_info = {"hull": hull}
                     elif comp_name == "SC00":
-                        sc00_info = {
-                            "box": box,
-                            "width": width,
-                            "height": height,
-                            "b": b
-                        }
+                        sc00_info = {"hull": hull}
         
         # Deformowalny komponent - Gięcie
         if tag_name.endswith("vdeformablecomponent"):
@@ -127,11 +75,8 @@ def process_file(filename, output_dir):
                 if re.match(r'^DC\d+', comp_name):
                     hulls_elem = elem.find("./VDeformableComponentHulls")
                     if hulls_elem is not None:
-                        val_str = hulls_elem.get("value", "")
-                        coords = parse_outline_value(val_str)
-                        box = bounding_box(coords)
-                        width, height = width_height_from_box(*box)
-                        arc = min(width, height)
+                        hull = len(hull_values)
+                        hull_values.append(hulls_elem.get("value", ""))
                         
                         # Pobranie wartości kąta, grubości i promienia
                         angle_elem = elem.find("./VDeformableComponentAngle")
@@ -147,12 +92,26 @@ def process_file(filename, output_dir):
                             "angle": angle,
                             "thickness": thickness_val,  # Używamy ogólnej grubości
                             "radius": radius_val,        # Używamy ogólnego promienia
-                            "box": box,
-                            "width": width,
-                            "height": height,
-                            "arc": arc
+                            "hull": hull
                         })
     
+    # Bounding boxy wszystkich obrysów pliku jednym wywołaniem:
+    # a = większy wymiar MainPlane, b = mniejszy wymiar SC00, łuk = mniejszy wymiar DC
+    sizes = outline_sizes(hull_values)
+    for info in [mainplane_info, sc00_info] + bends:
+        if not info:
+            continue
+        hull = info.pop("hull")
+        info["box"] = tuple(sizes.boxes[hull].tolist())
+        info["width"] = sizes.width[hull].item()
+        info["height"] = sizes.height[hull].item()
+    if mainplane_info:
+        mainplane_info["a"] = max(mainplane_info["width"], mainplane_info["height"])
+    if sc00_info:
+        sc00_info["b"] = min(sc00_info["width"], sc00_info["height"])
+    for bend in bends:
+        bend["arc"] = min(bend["width"], bend["height"])
+    
     # Sprawdzamy odczyty
     missing_info = []
     if not mainplane_info:
@@ -0,0 +1,111 @@
+import csv
+import glob
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld import cut_plans, load_workpiece, strip_parts
+from dld.cutting import STANDARD_LENGTHS
+
+# Plik wynikowy (w folderze z plikami .dld)
+PLAN_CIECIA = "plan_ciecia.csv"
+
+
+def wczytaj_ilosci(sciezka):
+    """
+    Ilości sztuk z pliku CSV (";" lub ","): nazwa pliku .dld (z rozszerzeniem
+    lub bez) i ilość. Wiersze bez liczby w drugiej kolumnie (nagłówek) są pomijane.
+    """
+    ilosci = {}
+    with open(sciezka, newline="", encoding="utf-8-sig") as f:
+        probka = f.readline()
+        f.seek(0)
+        for wiersz in csv.reader(f, delimiter=";" if ";" in probka else ","):
+            if len(wiersz) < 2:
+                continue
+            try:
+                ilosc = int(float(wiersz[1].replace(",", ".")))
+            except ValueError:
+                continue
+            nazwa = os.path.basename(wiersz[0].strip())
+            if nazwa.lower().endswith(".dld"):
+                nazwa = nazwa[:-4]
+            ilosci[nazwa] = ilosc
+    return ilosci
+
+
+def main():
+    """
+    Plan cięcia pasów dla detali giętych z pasa (liczy się tylko rozwinięcie).
+
+    Uruchomienie:
+        python plan_ciecia.py [folder_z_dld] [ilości.csv] [długości_pasów np. 3000,2500] [rzaz]
+
+    Rozwinięcie każdego detalu z dld.blank (K z tablicy DLD_K_TABLE),
+    szerokość pasa – długość linii gięcia z rozwinięcia. Bez pliku ilości
+    każdy plik .dld to jedna sztuka; pliki .dld, których nie ma w pliku
+    ilości, są wypisywane i pomijane. Detale grupowane są po grubości
+    i szerokości pasa; dla każdej grupy wybierana jest długość pasa
+    o najmniejszym zużyciu. Detale dłuższe niż każdy pas są wypisywane
+    i zostają poza planem. Plan zapisywany do plan_ciecia.csv.
+    """
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    ilosci = wczytaj_ilosci(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2] else {}
+    dlugosci = (tuple(float(d) for d in sys.argv[3].split(",")) if len(sys.argv) > 3 and sys.argv[3]
+                else STANDARD_LENGTHS)
+    rzaz = float(sys.argv[4].replace(",", ".")) if len(sys.argv) > 4 else 0.0
+
+    pliki = sorted(glob.glob(os.path.join(folder, "*.dld")))
+    if not pliki:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    detale = []
+    for plik in pliki:
+        try:
+            detale.append((plik, load_workpiece(plik)))
+        except ET.ParseError as e:
+            print(f"Błąd parsowania pliku {plik}: {e}")
+
+    czesci = strip_parts([wp for _, wp in detale])
+    nazwy = [os.path.splitext(os.path.basename(plik))[0] for plik, _ in detale]
+    # nazwa pliku w planie zamiast nazwy detalu z programu (te się powtarzają)
+    czesci = [c._replace(name=n) for c, n in zip(czesci, nazwy)]
+    sztuki = [ilosci.get(n, 0 if ilosci else 1) for n in nazwy]
+    bez_ilosci = [n for n in nazwy if ilosci and n not in ilosci]
+    if bez_ilosci:
+        print(f"Brak w pliku ilości ({len(bez_ilosci)}, pominięte): {', '.join(bez_ilosci)}")
+
+    start = time.perf_counter()
+    plany = cut_plans(czesci, sztuki, stock_lengths=dlugosci, kerf=rzaz)
+    print(f"Detali: {len(czesci)}, sztuk: {sum(sztuki)}, grup: {len(plany)} "
+          f"({time.perf_counter() - start:.1f} s)")
+
+    wiersze = []
+    for (grubosc, szerokosc), plan in sorted(plany.items()):
+        print(f"\nGrubość {grubosc:g} mm, pas {szerokosc:g} x {plan.stock_length:g} mm: "
+              f"{plan.strips} pasów (min. {plan.lower_bound}), wykorzystanie {plan.utilisation:.1%}, "
+              f"metoda {plan.method}")
+        for (nazwa, dlugosc), ile in Counter(plan.unplaced).items():
+            print(f"  nie mieści się na pasie: {nazwa} {dlugosc:.1f}" + (f" x{ile}" if ile > 1 else ""))
+        for numer, wzor in enumerate(plan.patterns, 1):
+            odcinki = ", ".join(f"{nazwa} {dlugosc:.1f}" + (f" x{ile}" if ile > 1 else "")
+                                for (nazwa, dlugosc), ile in Counter(wzor.cuts).items())
+            print(f"  {wzor.count:4d} x [{odcinki}]  odpad {wzor.waste:.1f}")
+            wiersze.append((f"{grubosc:g}", f"{szerokosc:g}", f"{plan.stock_length:g}", numer, wzor.count,
+                            odcinki, round(wzor.waste, 1)))
+
+    wynik = os.path.join(folder, PLAN_CIECIA)
+    with open(wynik, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(("Grubość", "Szerokość pasa", "Długość pasa", "Wzór", "Pasów", "Odcinki", "Odpad [mm]"))
+        writer.writerows(wiersze)
+    print(f"\nZapisano plan cięcia: {wynik}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import glob
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld import load_workpiece
+from dld.flat import flat_patterns, write_dxf, write_svg
+
+# Katalog wynikowy (w folderze z plikami .dld)
+KATALOG_WYNIKOW = "rozwiniecia"
+
+
+def main():
+    """
+    Rozwinięcia detali z programów Delem do DXF i SVG (do rozkroju / nestingu).
+
+    Uruchomienie:
+        python rozwiniecia.py [folder_z_dld]
+
+    Dla każdego pliku .dld z folderu zapisuje <nazwa>.dxf i <nazwa>.svg
+    w podkatalogu rozwiniecia: obrys zewnętrzny (warstwa OBRYS), otwory
+    (OTWORY) i linie gięcia (GIECIA).
+    """
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    pliki = sorted(glob.glob(os.path.join(folder, "*.dld")))
+    if not pliki:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    detale = []
+    for plik in pliki:
+        try:
+            detale.append((plik, load_workpiece(plik)))
+        except ET.ParseError as e:
+            print(f"Błąd parsowania pliku {plik}: {e}")
+
+    wyniki = os.path.join(folder, KATALOG_WYNIKOW)
+    os.makedirs(wyniki, exist_ok=True)
+    rozwiniecia = flat_patterns([wp for _, wp in detale])
+    for (plik, wp), rozwiniecie in zip(detale, rozwiniecia):
+        nazwa = os.path.splitext(os.path.basename(plik))[0]
+        write_dxf(rozwiniecie, os.path.join(wyniki, nazwa + ".dxf"))
+        write_svg(rozwiniecie, os.path.join(wyniki, nazwa + ".svg"))
+        xmin, ymin, xmax, ymax = rozwiniecie.bounds
+        uwagi = f", bez połączenia: {', '.join(rozwiniecie.unplaced)}" if rozwiniecie.unplaced else ""
+        print(f"{nazwa}: {xmax - xmin:.2f} x {ymax - ymin:.2f} mm, pole {rozwiniecie.area:.0f} mm²{uwagi}")
+
+    print(f"Zapisano {len(rozwiniecia)} rozwinięć w katalogu '{wyniki}'.")
+
+
+if __name__ == "__main__":
+    main()
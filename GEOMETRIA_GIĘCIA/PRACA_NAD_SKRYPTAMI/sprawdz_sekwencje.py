@@ -0,0 +1,64 @@
+import glob
+import os
+from collections import Counter
+import sys
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld import check_files
+from dld.sequence import STATUS_UNVERIFIED
+
+
+def main():
+    """
+    Kontrola sekwencji gięć przed wysłaniem programów na prasę.
+
+    Uruchomienie:
+        python sprawdz_sekwencje.py [folder_z_dld]
+
+    Każdy krok BendSequence symulowany jest na zgiętym detalu (dld.sequence):
+    kolizje flansz ze stemplem, matrycą, belką i stołem, flansze nie
+    sięgające ramion matrycy, strefy bez kroku gięcia. Wymiary narzędzi
+    z tablicy DLD_TOOL_TABLE (albo z nazw i wartości domyślnych). Status:
+    OK / BŁĄD – wynik przy znanych wymiarach, NIEPOTWIERDZONE – wynik zależy
+    od wymiarów domyślnych (nie jest decyzją o wysłaniu na prasę).
+    Pliki sprawdzane są równolegle.
+    """
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    pliki = sorted(glob.glob(os.path.join(folder, "*.dld")))
+    if not pliki:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    liczniki = Counter()
+    for plik, wynik in zip(pliki, check_files(pliki)):
+        nazwa = os.path.splitext(os.path.basename(plik))[0]
+        if wynik is None:
+            print(f"Błąd parsowania pliku {plik}")
+            continue
+        if not wynik.has_sequence:
+            print(f"{nazwa}: brak sekwencji gięć")
+            continue
+        liczniki[wynik.status] += 1
+        print(f"{nazwa}: {wynik.status} (kroków: {len(wynik.steps)})")
+        for kolizja in wynik.collisions:
+            print(f"  krok {kolizja.step}: {kolizja.piece} koliduje z {kolizja.tool} "
+                  f"(przy {kolizja.stage:.0%} gięcia)")
+        for problem in wynik.problems:
+            print(f"  {problem}")
+        for kolizja in wynik.unverified_collisions:
+            print(f"  krok {kolizja.step}: {kolizja.piece} może kolidować z {kolizja.tool} "
+                  f"(przy {kolizja.stage:.0%} gięcia, wymiary domyślne)")
+        for problem in wynik.unverified:
+            print(f"  {problem} (wymiary domyślne)")
+        for rodzaj, narzedzie, pola in wynik.guessed_tools:
+            print(f"  {rodzaj} {narzedzie or '(brak nazwy)'}: domyślne {', '.join(pola)}")
+
+    print(f"\nSprawdzono {len(pliki)} plików: " + ", ".join(f"{s}: {n}" for s, n in sorted(liczniki.items())))
+    if liczniki[STATUS_UNVERIFIED]:
+        print("Wyniki NIEPOTWIERDZONE opierają się na domyślnych wymiarach narzędzi – "
+              "uzupełnij tablicę DLD_TOOL_TABLE.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import glob
+import os
+import sys
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld import fold_files, outside_dimensions
+
+
+def main():
+    """
+    Wymiary detali po zgięciu, mierzone na bryle 3D (dld.fold).
+
+    Uruchomienie:
+        python wymiary_3d.py [folder_z_dld]
+
+    Dla każdego pliku .dld z folderu: gabaryt zgiętego detalu (X x Y x Z
+    w układzie MainPlaneTransformation) i wymiar zewnętrzny każdej flanszy
+    (do ostrego narożnika wirtualnego). Pliki gięte są równolegle.
+    """
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    pliki = sorted(glob.glob(os.path.join(folder, "*.dld")))
+    if not pliki:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    for plik, detal in zip(pliki, fold_files(pliki)):
+        nazwa = os.path.splitext(os.path.basename(plik))[0]
+        if detal is None:
+            print(f"Błąd parsowania pliku {plik}")
+            continue
+        (xmin, ymin, zmin), (xmax, ymax, zmax) = detal.bounds
+        uwagi = f", bez połączenia: {', '.join(detal.unplaced)}" if detal.unplaced else ""
+        print(f"{nazwa}: {xmax - xmin:.2f} x {ymax - ymin:.2f} x {zmax - zmin:.2f} mm{uwagi}")
+        for flansza, wymiar in outside_dimensions(detal).items():
+            print(f"  {flansza}: {wymiar:.2f} mm")
+
+
+if __name__ == "__main__":
+    main()
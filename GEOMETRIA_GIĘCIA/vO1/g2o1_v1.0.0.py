@@ -7,48 +7,93 @@ import re
 import glob
 import sys
 
-def parse_outline_value(value_str):
-    """
-    Z pliku Delem (np. '4 0 6.613518 200 6.613518 false ...')
-    wyciąga pary (x, y) i zwraca listę krotek [(x1,y1), (x2,y2), ...].
-    Pomija słowa 'true'/'false' i 'Outline'.
-    """
-    tokens = value_str.split()
-    numeric_vals = []
-    for t in tokens:
-        if t.lower() in ['outline', 'true', 'false']:
-            continue
-        try:
-            numeric_vals.append(float(t))
-        except ValueError:
-            pass
-    if not numeric_vals:
-        return []
-    segment_count = int(numeric_vals[0])
-    coords = numeric_vals[1:]
-    points = []
-    for i in range(0, len(coords), 2):
-        if i + 1 < len(coords):
-            x = coords[i]
-            y = coords[i + 1]
-            points.append((x, y))
-    return points
-
-def bounding_box(coords):
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld.bbox import outline_sizes
+from dld.dispatch import TagDispatcher
+
+# --- Obsługa elementów XML wg tagu (rejestr budowany raz, przy imporcie) ---
+PARSER = TagDispatcher()
+
+
+def _add_hull(state, value):
     """
-    Dla listy punktów [(x1,y1), (x2,y2), ...]
-    zwraca (xmin, xmax, ymin, ymax).
-    Jeśli brak punktów, zwraca (0,0,0,0).
+    Dopisuje obrys do listy obrysów pliku i zwraca jego numer; wymiary
+    wszystkich obrysów liczy po przejściu jedno outline_sizes (dld.bbox).
     """
-    if not coords:
-        return 0, 0, 0, 0
-    xs = [p[0] for p in coords]
-    ys = [p[1] for p in coords]
-    return min(xs), max(xs), min(ys), max(ys)
+    state["hulls"].append(value)
+    return len(state["hulls"]) - 1
+
+
+@PARSER.on("WorkpieceDimensions")
+def _workpiece_dimensions(elem, state):
+    state["dimension_type"] = elem.get("value", "")
+
+
+@PARSER.on("WorkpieceThickness")
+def _workpiece_thickness(elem, state):
+    try:
+        state["thickness"] = float(elem.get("value", "0"))
+    except ValueError:
+        state["thickness"] = 0.0
+
+
+@PARSER.on("PreferredInnerRadius")
+def _preferred_inner_radius(elem, state):
+    try:
+        state["radius"] = float(elem.get("value", "0"))
+    except ValueError:
+        state["radius"] = 0.0
+
+
+@PARSER.on("StaticComponent")
+def _static_component(elem, state):
+    """Odczyt Outline/Hull -> bounding box (MainPlane i SCxx)."""
+    wp_name = elem.find("./WorkpieceComponentName")
+    if wp_name is None:
+        return
+    comp_name = wp_name.get("value", "")
+    hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
+    if hull_elem is None:
+        return
+    hull = _add_hull(state, hull_elem.get("value", ""))
+
+    if comp_name == "MainPlane":
+        state["mainplane"] = hull
+    elif re.match(r'^SC\d+', comp_name):
+        state["sc"][comp_name] = hull
+
+
+@PARSER.on("VDeformableComponent")
+def _vdeformable_component(elem, state):
+    """Deformowalny komponent - Gięcie (DCxx)."""
+    wp_name = elem.find("./WorkpieceComponentName")
+    if wp_name is None:
+        return
+    comp_name = wp_name.get("value", "")
+    # gięcia mają nazwy DCxx
+    if not re.match(r'^DC\d+', comp_name):
+        return
+    hulls_elem = elem.find("./VDeformableComponentHulls")
+    if hulls_elem is None:
+        return
+    hull = _add_hull(state, hulls_elem.get("value", ""))
+
+    angle_elem = elem.find("./VDeformableComponentAngle")
+    try:
+        angle = float(angle_elem.get("value", "0")) if angle_elem is not None else 0.0
+    except ValueError:
+        angle = 0.0
+
+    # Grubość i promień – wartości odczytane do tej chwili (kolejność w pliku)
+    state["bends"].append({
+        "name": comp_name,
+        "angle": angle,
+        "thickness": state["thickness"],
+        "radius": state["radius"],
+        "hull": hull,
+    })
 
-def width_height_from_box(xmin, xmax, ymin, ymax):
-    """Zwraca (width, height) = (xmax - xmin, ymax - ymin)."""
-    return abs(xmax - xmin), abs(ymax - ymin)
 
 def process_file(filename, output_dir):
     if not os.path.isfile(filename):
@@ -62,88 +107,31 @@ def process_file(filename, output_dir):
         print(f"Błąd parsowania pliku {filename}: {e}")
         return
 
-    # Zmienne ogólne
-    dimension_type = None
-    thickness_val = 0.0       # grubość
-    radius_val = 0.0          # promień wewnętrzny
-
-    mainplane_value = None     # długość (a)
-    sc_components = {}         # np. {"SC00": float, "SC01": float, ...}
-    bends = []                 # lista info o gięciach (DCxx)
-
-    # --- Parsujemy strukturę XML ---
-    for elem in root.iter():
-        tag_name = elem.tag.lower()
-
-        # Atrybuty ogólne
-        if tag_name.endswith("workpiecedimensions"):
-            dimension_type = elem.get("value", "")  # "Outside" / "Inside"
-        if tag_name.endswith("workpiecethickness"):
-            try:
-                thickness_val = float(elem.get("value", "0"))
-            except ValueError:
-                thickness_val = 0.0
-        if tag_name.endswith("preferredinnerradius"):
-            try:
-                radius_val = float(elem.get("value", "0"))
-            except ValueError:
-                radius_val = 0.0
-
-        # Odczyt Outline/Hull -> bounding box
-        # dla MainPlane i wszystkich SCxx
-        if tag_name.endswith("staticcomponent"):
-            wp_name = elem.find("./WorkpieceComponentName")
-            if wp_name is not None:
-                comp_name = wp_name.get("value", "")
-
-                hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
-                if hull_elem is not None:
-                    val_str = hull_elem.get("value", "")
-                    coords = parse_outline_value(val_str)
-                    box = bounding_box(coords)
-                    width, height = width_height_from_box(*box)
-                    # Według uwagi w przykładach – bierzemy MNIEJSZY wymiar
-                    comp_val = min(width, height)
-
-                    if comp_name == "MainPlane":
-                        mainplane_value = comp_val
-                    else:
-                        # Jeśli nazwa to SCxx -> zapisz
-                        if re.match(r'^SC\d+', comp_name):
-                            sc_components[comp_name] = comp_val
-
-        # Deformowalny komponent - Gięcie (DCxx)
-        if tag_name.endswith("vdeformablecomponent"):
-            wp_name = elem.find("./WorkpieceComponentName")
-            if wp_name is not None:
-                comp_name = wp_name.get("value", "")
-                # gięcia mają nazwy DCxx
-                if re.match(r'^DC\d+', comp_name):
-                    hulls_elem = elem.find("./VDeformableComponentHulls")
-                    if hulls_elem is not None:
-                        val_str = hulls_elem.get("value", "")
-                        coords = parse_outline_value(val_str)
-                        box = bounding_box(coords)
-                        width, height = width_height_from_box(*box)
-                        # łuk = min(width, height)
-                        arc = min(width, height)
-
-                        angle_elem = elem.find("./VDeformableComponentAngle")
-                        try:
-                            angle = float(angle_elem.get("value", "0")) if angle_elem is not None else 0.0
-                        except ValueError:
-                            angle = 0.0
-
-                        bends.append({
-                            "name": comp_name,
-                            "angle": angle,
-                            "thickness": thickness_val,
-                            "radius": radius_val,
-                            "box": box,
-                            "width": width,
-                            "height": height,
-                            "arc": arc
-                        })
+    # --- Parsujemy strukturę XML: jedno przejście, obsługa elementów wg tagu (PARSER) ---
+    state = PARSER.dispatch(root, {
+        "dimension_type": None,
+        "thickness": 0.0,
+        "radius": 0.0,
+        "mainplane": None,
+        "sc": {},
+        "bends": [],
+        "hulls": [],
+    })
+    dimension_type = state["dimension_type"]
+    thickness_val = state["thickness"]
+    radius_val = state["radius"]
+    # bounding boxy wszystkich obrysów pliku naraz
+    sizes = outline_sizes(state["hulls"])
+    min_dims = sizes.min_dim.tolist()
+    mainplane_value = None if state["mainplane"] is None else min_dims[state["mainplane"]]   # a (z bounding box)
+    sc_components = {name: min_dims[hull] for name, hull in state["sc"].items()}  # np. {"SC00": float, ...}
+    bends = state["bends"]                 # lista info o gięciach (DCxx)
+    for bend in bends:
+        hull = bend.pop("hull")
+        bend["box"] = tuple(sizes.boxes[hull].tolist())
+        bend["width"] = sizes.width[hull].item()
+        bend["height"] = sizes.height[hull].item()
+        bend["arc"] = min_dims[hull]  # łuk = min(width, height)
 
     # --- Sprawdzamy odczyty ---
     missing_info = []
@@ -8,49 +8,10 @@ import glob
 import sys
 import string
 
-def parse_outline_value(value_str):
-    """
-    Z pliku Delem (np. '4 0 6.613518 200 6.613518 false ...')
-    wyciąga pary (x, y) i zwraca listę krotek [(x1,y1), (x2,y2), ...].
-    Pomija słowa 'outline', 'true', 'false'.
-    """
-    tokens = value_str.split()
-    numeric_vals = []
-    for t in tokens:
-        if t.lower() in ['outline', 'true', 'false']:
-            continue
-        try:
-            numeric_vals.append(float(t))
-        except ValueError:
-            pass
-    if not numeric_vals:
-        return []
-    # Pierwsza liczba to ilość punktów w Outline
-    segment_count = int(numeric_vals[0])
-    coords = numeric_vals[1:]
-    points = []
-    for i in range(0, len(coords), 2):
-        if i + 1 < len(coords):
-            x = coords[i]
-            y = coords[i + 1]
-            points.append((x, y))
-    return points
-
-def bounding_box(coords):
-    """
-    Dla listy punktów [(x1,y1), (x2,y2), ...]
-    zwraca (xmin, xmax, ymin, ymax).
-    Jeśli brak punktów, zwraca (0,0,0,0).
-    """
-    if not coords:
-        return 0, 0, 0, 0
-    xs = [p[0] for p in coords]
-    ys = [p[1] for p in coords]
-    return min(xs), max(xs), min(ys), max(ys)
-
-def width_height_from_box(xmin, xmax, ymin, ymax):
-    """Zwraca (width, height) = (xmax - xmin, ymax - ymin)."""
-    return abs(xmax - xmin), abs(ymax - ymin)
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld.bbox import outline_sizes
+from dld.dispatch import TagDispatcher
 
 def normalize_angle(angle_deg):
     """
@@ -63,6 +24,99 @@ def normalize_angle(angle_deg):
         return angle_deg - 360
     return angle_deg
 
+# --- Obsługa elementów XML wg tagu (rejestr budowany raz, przy imporcie) ---
+PARSER = TagDispatcher()
+
+
+def _add_hull(state, value):
+    """
+    Dopisuje obrys do listy obrysów pliku i zwraca jego numer; wymiary
+    wszystkich obrysów liczy po przejściu jedno outline_sizes (dld.bbox).
+    """
+    state["hulls"].append(value)
+    return len(state["hulls"]) - 1
+
+
+@PARSER.on("WorkpieceDimensions")
+def _workpiece_dimensions(elem, state):
+    state["dimension_type"] = elem.get("value", "")
+
+
+@PARSER.on("WorkpieceThickness")
+def _workpiece_thickness(elem, state):
+    try:
+        state["thickness"] = float(elem.get("value", "0"))
+    except ValueError:
+        state["thickness"] = 0.0
+
+
+@PARSER.on("PreferredInnerRadius")
+def _preferred_inner_radius(elem, state):
+    try:
+        state["radius"] = float(elem.get("value", "0"))
+    except ValueError:
+        state["radius"] = 0.0
+
+
+@PARSER.on("StaticComponent")
+def _static_component(elem, state):
+    """Odczyt Outline/Hull -> bounding box (MainPlane i SCxx)."""
+    wp_name = elem.find("./WorkpieceComponentName")
+    if wp_name is None:
+        return
+    comp_name = wp_name.get("value", "")
+    hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
+    if hull_elem is None:
+        return
+    hull = _add_hull(state, hull_elem.get("value", ""))
+
+    if comp_name == "MainPlane":
+        state["mainplane"] = hull
+    elif re.match(r'^SC\d+', comp_name):
+        state["sc"][comp_name] = hull
+
+
+@PARSER.on("VDeformableComponent")
+def _vdeformable_component(elem, state):
+    """Deformowalny komponent (VDeformableComponent) -> gięcia DCxx."""
+    wp_name = elem.find("./WorkpieceComponentName")
+    if wp_name is None:
+        return
+    comp_name = wp_name.get("value", "")
+    if not re.match(r'^DC\d+', comp_name):
+        return
+
+    hulls_elem = elem.find("./VDeformableComponentHulls")
+    arc = None
+    if hulls_elem is not None:
+        arc = _add_hull(state, hulls_elem.get("value", ""))
+
+    angle_elem = elem.find("./VDeformableComponentAngle")
+    angle_after = 0.0
+    if angle_elem is not None:
+        try:
+            angle_after = float(angle_elem.get("value", "0"))
+        except ValueError:
+            angle_after = 0.0
+
+    # Ewentualnie w VBendDeformation/AngleAfter
+    deformation_elem = elem.find("./VBendDeformation")
+    if deformation_elem is not None:
+        angle_after_elem = deformation_elem.find("./AngleAfter")
+        if angle_after_elem is not None:
+            try:
+                angle_after = float(angle_after_elem.get("value", "0"))
+            except ValueError:
+                pass
+
+    state["bends"].append({
+        "name": comp_name,
+        "arc": arc,
+        "angle_raw": angle_after,
+        "angle_norm": normalize_angle(angle_after)
+    })
+
+
 def process_file(filename, output_dir):
     if not os.path.isfile(filename):
         print(f"Brak pliku: {filename}")
@@ -75,96 +129,27 @@ def process_file(filename, output_dir):
         print(f"Błąd parsowania pliku {filename}: {e}")
         return
 
-    # Zmienne ogólne
-    dimension_type = None
-    thickness_val = 0.0
-    radius_val = 0.0
-
-    mainplane_value = None       # a (z bounding box) => 'zewn.'
-    sc_components = {}           # np. {"SC00": float, "SC01": float, ...} => 'zewn.'
-    
-    # Informacja o gięciach (DCxx). Przyjmujemy, że jedno DC "wpływa" na a lub b, ...
-    bends_info = []              # [{"name":..., "arc":..., "angle":..., "angle_norm":...}, ...]
-
-    # --- Parsujemy strukturę XML ---
-    for elem in root.iter():
-        tag_name = elem.tag.lower()
-
-        # Atrybuty ogólne
-        if tag_name.endswith("workpiecedimensions"):
-            dimension_type = elem.get("value", "")
-        if tag_name.endswith("workpiecethickness"):
-            try:
-                thickness_val = float(elem.get("value", "0"))
-            except ValueError:
-                thickness_val = 0.0
-        if tag_name.endswith("preferredinnerradius"):
-            try:
-                radius_val = float(elem.get("value", "0"))
-            except ValueError:
-                radius_val = 0.0
-
-        # Odczyt Outline/Hull -> bounding box
-        if tag_name.endswith("staticcomponent"):
-            wp_name = elem.find("./WorkpieceComponentName")
-            if wp_name is not None:
-                comp_name = wp_name.get("value", "")
-                hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
-                if hull_elem is not None:
-                    val_str = hull_elem.get("value", "")
-                    coords = parse_outline_value(val_str)
-                    box = bounding_box(coords)
-                    width, height = width_height_from_box(*box)
-                    value_min = min(width, height)  # bierzemy mniejszy wymiar
-
-                    if comp_name == "MainPlane":
-                        mainplane_value = value_min
-                    elif re.match(r'^SC\d+', comp_name):
-                        sc_components[comp_name] = value_min
-
-        # Deformowalny komponent (DCxx)
-        if tag_name.endswith("vdeformablecomponent"):
-            wp_name = elem.find("./WorkpieceComponentName")
-            if wp_name is not None:
-                comp_name = wp_name.get("value", "")
-                if re.match(r'^DC\d+', comp_name):
-                    # Łuk
-                    hulls_elem = elem.find("./VDeformableComponentHulls")
-                    arc_val = 0.0
-                    if hulls_elem is not None:
-                        val_str = hulls_elem.get("value", "")
-                        coords = parse_outline_value(val_str)
-                        box = bounding_box(coords)
-                        w, h = width_height_from_box(*box)
-                        arc_val = min(w, h)
-
-                    # Kąt
-                    angle_elem = elem.find("./VDeformableComponentAngle")
-                    angle_after = 0.0
-                    if angle_elem is not None:
-                        try:
-                            angle_after = float(angle_elem.get("value", "0"))
-                        except ValueError:
-                            angle_after = 0.0
-
-                    # Ewentualnie w VBendDeformation/AngleAfter
-                    deformation_elem = elem.find("./VBendDeformation")
-                    if deformation_elem is not None:
-                        angle_after_elem = deformation_elem.find("./AngleAfter")
-                        if angle_after_elem is not None:
-                            try:
-                                angle_after = float(angle_after_elem.get("value", "0"))
-                            except ValueError:
-                                pass
-
-                    angle_norm = normalize_angle(angle_after)
-
-                    bends_info.append({
-                        "name": comp_name,
-                        "arc": arc_val,
-                        "angle_raw": angle_after,
-                        "angle_norm": angle_norm
-                    })
+    # --- Parsujemy strukturę XML: jedno przejście, obsługa elementów wg tagu (PARSER) ---
+    state = PARSER.dispatch(root, {
+        "dimension_type": None,
+        "thickness": 0.0,
+        "radius": 0.0,
+        "mainplane": None,
+        "sc": {},
+        "bends": [],
+        "hulls": [],
+    })
+    dimension_type = state["dimension_type"]
+    thickness_val = state["thickness"]
+    radius_val = state["radius"]
+    # min(szerokość, wysokość) bounding boxów wszystkich obrysów pliku naraz
+    min_dims = outline_sizes(state["hulls"]).min_dim.tolist()
+    mainplane_value = None if state["mainplane"] is None else min_dims[state["mainplane"]]   # a (z bounding box)
+    sc_components = {name: min_dims[hull] for name, hull in state["sc"].items()}  # np. {"SC00": float, ...}
+    bends_info = state["bends"]            # lista słowników z info o DC
+    for bend in bends_info:
+        # numer obrysu -> łuk = min(w, h); strefa bez Hulls ma łuk 0
+        bend["arc"] = 0.0 if bend["arc"] is None else min_dims[bend["arc"]]
 
     # Sprawdzamy brakujące
     missing_info = []
@@ -1,30 +1,29 @@
 import os
+import sys
 import xml.etree.ElementTree as ET
 
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dld import BLANK_LENGTH, WORKPIECE, format_number, load_workpiece
+
 def parse_dld_file(file_path):
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+        # BendSequence potrzebny jest tylko do BlankLength – odczyt kończy się zaraz po nim
+        wp = load_workpiece(file_path, sections=(WORKPIECE, BLANK_LENGTH))
 
         # Inicjalizacja zmiennych
-        workpiece_name = None
-        material_thickness = None
+        workpiece_name = wp.name
+        material_thickness = format_number(wp.thickness)
         preferred_inner_radius = None
         blank_length = None
         segments = []
 
-        # Parsowanie danych z pliku
-        for workpiece in root.iter('Workpiece'):
-            workpiece_name = workpiece.find('WorkpieceName').get('value')
-            material_thickness = workpiece.find('WorkpieceThickness').get('value')
-
-        for v_deformable_component in root.iter('VDeformableComponent'):
-            preferred_inner_radius = v_deformable_component.find('PreferredInnerRadius').get('value')
+        for v_deformable_component in wp.deformable_components:
+            preferred_inner_radius = format_number(v_deformable_component.preferred_inner_radius)
 
-        for static_component in root.iter('StaticComponent'):
-            hull = static_component.find('StaticComponentPart').find('StaticComponentHull')
-            if hull is not None:
-                outline_values = hull.get('value').split()
+        for static_component in wp.static_components:
+            if static_component.hull is not None:
+                outline_values = static_component.hull.split()
                 points = []
 
                 # Filtrowanie i przetwarzanie punktów
@@ -43,8 +42,8 @@ def parse_dld_file(file_path):
                     segment_length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
                     segments.append(segment_length)
 
-        for bend_sequence in root.iter('BendSequence'):
-            blank_length = bend_sequence.find('BlankLength').get('value')
+        if wp.blank_length is not None:
+            blank_length = format_number(wp.blank_length)
 
         # Wyświetlanie wyników
         print(f"Nazwa produktu: {workpiece_name}")
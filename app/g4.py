@@ -4,63 +4,20 @@
 import xml.etree.ElementTree as ET
 import os
 import re
+import sys
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dld import outline_points
 
 def parse_outline_value(value_str):
     """
-    Z pliku Delem (np. '4 0 6.613518 200 6.613518 false ...') 
+    Z pliku Delem (np. '4 0 6.613518 200 6.613518 false ...')
     wyciąga pary (x, y) i zwraca listę krotek [(x1,y1), (x2,y2), ...].
-    Pomija słowa 'true'/'false'.
+    Wartości Outlines ('1 Outline 4 ...', np. VDeformableComponentHulls)
+    dają punkty wszystkich obrysów – patrz dld.outline.decode_outlines.
     """
-    tokens = value_str.split()
-    # Pierwszy token to liczba segmentów (np. '4' lub '1 Outline 4'), 
-    # ale często bywa to zlepione. Rozbijmy i zbierzmy same liczby float, 
-    # ignorując 'Outline', 'true', 'false' itd.
-    
-    numeric_vals = []
-    for t in tokens:
-        # Pomijamy 'Outline', 'true', 'false' itp.
-        if t.lower() in ['outline', 'true', 'false']:
-            continue
-        # Spróbujmy skonwertować na float
-        try:
-            numeric_vals.append(float(t))
-        except ValueError:
-            # Jeśli się nie da (np. to może być 'Line' lub inny napis), ignorujemy
-            pass
-    
-    # Teraz numeric_vals to ciąg liczb, np.
-    # [4, 0, 6.613518, 200, 6.613518, 200, 6.613518, 200, 300, ... ]
-    # Pierwsza liczba to z reguły ilość segmentów. 
-    # My chcemy pary (x,y) z kolejnych liczb.
-    
-    if not numeric_vals:
-        return []
-    
-    # Jeśli pierwsza liczba to segmentCount -> usuńmy ją
-    # (często to '4' albo '1' w wypadku '1 Outline 4')
-    segment_count = int(numeric_vals[0])
-    coords = numeric_vals[1:]  # reszta
-    
-    # Czasem bywa, że jest '1 Outline 4' => segment_count = 1, 
-    # a potem jest 4 (jako kolejna).
-    # Bywa więc, że realnie ta pierwsza "1" wcale nie jest segmentCountem 
-    # do samych współrzędnych. 
-    # Dla pewności możesz wykryć, jeżeli w coords wciaż są np. 4 segmenty,
-    # to nadpisz segment_count = 4. 
-    # TUTAJ: uprościmy (bo w Delem różnie bywa). 
-    # W razie czego możesz w pętli sprawdzać i adaptować.
-    
-    # Teraz z coords bierzemy parami (x, y)
-    points = []
-    # lecimy co 2
-    for i in range(0, len(coords), 2):
-        # Upewniamy się, że nie wyjdziemy poza listę
-        if i+1 < len(coords):
-            x = coords[i]
-            y = coords[i+1]
-            points.append((x, y))
-    
-    return points
+    return outline_points(value_str)
 
 def bounding_box(coords):
     """
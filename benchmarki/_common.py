@@ -0,0 +1,75 @@
+"""
+Wspólne elementy benchmarków z katalogu benchmarki/.
+
+Import ustawia katalog główny projektu w sys.path (biblioteka dld/), więc
+w skryptach stoi przed importami z dld:
+
+    from _common import ROOT, argument, dld_files, stop_on_errors, timed
+    from dld import parse_workpiece
+
+    folder = argument(1, ROOT)
+    repeats = argument(2, 5, int)
+    best = timed(func, repeats, arg1, arg2)    # najlepszy czas func(arg1, arg2) [s]
+"""
+
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Dopuszczalna różnica wyniku od znanej odpowiedzi [mm]
+KNOWN_TOLERANCE = 1e-3
+
+
+def argument(index, default, convert=str):
+    """Argument wywołania sys.argv[index] zamieniony przez convert albo default, gdy go brak."""
+    return convert(sys.argv[index]) if len(sys.argv) > index else default
+
+
+def dld_files(folder):
+    """Pliki .dld z folderu i podfolderów, posortowane."""
+    return sorted(glob.glob(os.path.join(folder, "**", "*.dld"), recursive=True))
+
+
+def timed(func, repeats, *args):
+    """Najlepszy z repeats przebiegów czas wywołania func(*args) [s]."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def stop_on_errors(bad):
+    """Kończy benchmark kodem błędu, gdy sprawdzenie poprawności znalazło bad > 0 niezgodności."""
+    if bad:
+        raise SystemExit(f"Niezgodności: {bad} – pomiar czasu pominięty")
+
+
+def _differs(result, expected):
+    if isinstance(expected, dict):
+        return (not isinstance(result, dict) or result.keys() != expected.keys()
+                or any(_differs(result[k], v) for k, v in expected.items()))
+    if isinstance(expected, float):
+        return result is None or abs(result - expected) > KNOWN_TOLERANCE
+    return result != expected
+
+
+def known_answers(checks):
+    """
+    Sprawdzenia o znanej odpowiedzi – lista (opis, wynik, oczekiwany); liczby
+    float porównywane z tolerancją KNOWN_TOLERANCE, słowniki klucz po kluczu.
+    Wypisuje wynik; przy niezgodności kończy benchmark (SystemExit).
+    """
+    wrong = [(label, result, expected) for label, result, expected in checks if _differs(result, expected)]
+    for label, result, expected in wrong:
+        print(f"  {label}: {result} zamiast {expected}")
+    if wrong:
+        raise SystemExit(f"Znane wyniki: niezgodnych {len(wrong)} z {len(checks)}")
+    print(f"Znane wyniki: {len(checks)} zgodnych")
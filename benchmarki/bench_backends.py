@@ -0,0 +1,55 @@
+"""
+Porównanie backendów XML parsera dld (ElementTree i lxml) na plikach .dld:
+oba muszą dać identyczny Workpiece (lub oba ET.ParseError); potem pomiar czasu.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_backends.py [folder_z_dld] [powtórzenia]
+"""
+
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import parse_workpiece
+from dld.backends import lxml_etree
+
+BACKENDS = ("etree", "lxml")
+
+
+def parse_or_error(path, backend):
+    try:
+        return parse_workpiece(path, backend=backend)
+    except ET.ParseError:
+        return "ParseError"
+
+
+def parse_all(files, backend):
+    for path in files:
+        parse_or_error(path, backend)
+
+
+def main():
+    if lxml_etree is None:
+        print("lxml nie jest zainstalowany – dostępny jest tylko backend 'etree'.")
+        return
+
+    folder = argument(1, ROOT)
+    repeats = argument(2, 5, int)
+    files = dld_files(folder)
+    if not files:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    bad = [f for f in files if parse_or_error(f, "etree") != parse_or_error(f, "lxml")]
+    for path in bad:
+        print(f"RÓŻNICA wyników: {path}")
+    print(f"Sprawdzono {len(files)} plików, różnic: {len(bad)}")
+    stop_on_errors(bad)
+
+    n = len(files)
+    for backend in BACKENDS:
+        best = timed(parse_all, repeats, files, backend)
+        print(f"  {backend:6s} {best * 1000 / n:8.3f} ms/plik")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Sprawdzenie i benchmark wsadowych bounding boxów (dld.bbox).
+
+Zbiera obrysy StaticComponentHull i VDeformableComponentHulls wszystkich
+plików .dld z folderu, a następnie:
+1. porównuje outline_sizes z dotychczasowym bounding_box / width_height_from_box
+   liczonym osobno dla każdego obrysu (te same punkty – dld.outline_points),
+2. mierzy sam kernel: listy xs / ys i min/max dla każdego obrysu kontra jedna
+   redukcja reduceat na tablicy poszarpanej (punkty zdekodowane wcześniej),
+3. mierzy całość (dekodowanie + wymiary) dla całego folderu.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_bbox.py [folder_z_dld] [powtórzenia]
+"""
+
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import outline_points, parse_workpiece
+from dld.bbox import bounding_boxes, box_sizes, outline_sizes, pack_points
+
+
+def bounding_box(coords):
+    """Dotychczasowa wersja ze skryptów g2o1."""
+    if not coords:
+        return 0, 0, 0, 0
+    xs = [p[0] for p in coords]
+    ys = [p[1] for p in coords]
+    return min(xs), max(xs), min(ys), max(ys)
+
+
+def width_height_from_box(xmin, xmax, ymin, ymax):
+    return abs(xmax - xmin), abs(ymax - ymin)
+
+
+def per_outline(points_list):
+    result = []
+    for coords in points_list:
+        width, height = width_height_from_box(*bounding_box(coords))
+        result.append(min(width, height))
+    return result
+
+
+def collect_hulls(files):
+    values = []
+    for path in files:
+        try:
+            wp = parse_workpiece(path)
+        except ET.ParseError:
+            continue
+        values.extend(sc.hull for sc in wp.static_components if sc.hull is not None)
+        values.extend(dc.hulls for dc in wp.deformable_components if dc.hulls is not None)
+    return values
+
+
+def main():
+    folder = argument(1, ROOT)
+    repeats = argument(2, 5, int)
+
+    files = dld_files(folder)
+    values = collect_hulls(files)
+    if not values:
+        print(f"Nie znaleziono obrysów w plikach .dld w folderze: {folder}")
+        return
+
+    points_list = [outline_points(v) for v in values]
+    expected = per_outline(points_list)
+    sizes = outline_sizes(values)
+    bad = sum(1 for a, b in zip(expected, sizes.min_dim.tolist()) if a != b)
+    print(f"Plików: {len(files)}, obrysów: {len(values)}, różnic: {bad}")
+    stop_on_errors(bad)
+
+    points, offsets = pack_points(values)
+    kernel_before = timed(lambda: per_outline(points_list), repeats)
+    kernel_after = timed(lambda: box_sizes(bounding_boxes(points, offsets)), repeats)
+    total_before = timed(lambda: per_outline([outline_points(v) for v in values]), repeats)
+    total_after = timed(lambda: outline_sizes(values), repeats)
+
+    n = len(values)
+    print(f"Najlepszy z {repeats} przebiegów, µs/obrys:")
+    print(f"  kernel  min/max na listach:  {kernel_before * 1e6 / n:8.3f}")
+    print(f"  kernel  reduceat (wsadowo):  {kernel_after * 1e6 / n:8.3f}  ({kernel_before / kernel_after:.1f}x)")
+    print(f"  całość  obrys po obrysie:    {total_before * 1e6 / n:8.3f}")
+    print(f"  całość  outline_sizes:       {total_after * 1e6 / n:8.3f}  ({total_before / total_after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
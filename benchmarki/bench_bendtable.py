@@ -0,0 +1,61 @@
+"""
+Sprawdzenie i benchmark tablicy geometrii gięcia (dld.bendtable).
+
+Z plików .dld z folderu zbiera gięcia (kąt, promień, grubość) wszystkich
+detali, powiela je do zadanej liczby flansz, a następnie:
+1. porównuje bend_geometry z wartościami liczonymi od nowa (compute_bend_geometry),
+2. mierzy czas: liczenie tan / radians dla każdej flanszy kontra tablica,
+3. wypisuje liczniki trafień / obliczeń i rozmiar tablicy.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_bendtable.py [folder_z_dld] [liczba_flansz] [powtórzenia]
+"""
+
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import parse_workpiece
+from dld.bendtable import BendGeometryCache, compute_bend_geometry
+
+
+def collect_bends(files):
+    bends = []
+    for path in files:
+        try:
+            wp = parse_workpiece(path)
+        except ET.ParseError:
+            continue
+        for dc in wp.deformable_components:
+            bends.append((dc.bend_angle, dc.preferred_inner_radius or 0.0, wp.thickness))
+    return bends
+
+
+def main():
+    folder = argument(1, ROOT)
+    count = argument(2, 20000, int)
+    repeats = argument(3, 5, int)
+
+    files = dld_files(folder)
+    sample = collect_bends(files)
+    if not sample:
+        print(f"Nie znaleziono gięć w plikach .dld w folderze: {folder}")
+        return
+    flanges = (sample * (count // len(sample) + 1))[:count]
+
+    table = BendGeometryCache()
+    bad = sum(1 for key in flanges if table.get(*key) != compute_bend_geometry(*key))
+    print(f"Plików: {len(files)}, gięć: {len(sample)}, różnych kluczy: {len(set(sample))}, "
+          f"flansz: {count}, różnic: {bad}")
+    stop_on_errors(bad)
+
+    table.clear()
+    before = timed(lambda: [compute_bend_geometry(*key) for key in flanges], repeats)
+    after = timed(lambda: [table.get(*key) for key in flanges], repeats)
+    print(f"Najlepszy z {repeats} przebiegów, µs/flanszę:")
+    print(f"  liczone od nowa:  {before * 1e6 / count:7.3f}")
+    print(f"  tablica:          {after * 1e6 / count:7.3f}  ({before / after:.1f}x)")
+    print(f"Tablica: {table.stats}, kluczy: {len(table)}")
+
+
+if __name__ == "__main__":
+    main()
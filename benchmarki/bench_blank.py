@@ -0,0 +1,98 @@
+"""
+Sprawdzenie i benchmark rozwinięć z tablicy współczynników K (dld.blank).
+
+Wczytuje pliki .dld z folderu, a następnie:
+1. liczy rozwinięcia blank_lengths (K z tablicy; bez tablicy DEFAULT_K_FACTOR)
+   i porównuje je z BendSequence/BlankLength plików, które ją mają,
+2. powiela detale do zadanej liczby i mierzy czas: rozwinięcie liczone detal
+   po detalu (wzór skryptowy, jak oblicz_prostke) kontra jedno blank_lengths.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_blank.py [folder_z_dld] [liczba_detali] [powtórzenia] [tablica_k.csv]
+"""
+
+import math
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import parse_workpiece
+from dld.bbox import outline_sizes
+from dld.blank import KFactorTable, blank_lengths, load_k_table
+
+# Tyle największych różnic względem BlankLength wypisujemy
+SHOW_WORST = 5
+
+
+def per_part(workpieces, table):
+    """Rozwinięcie detal po detalu: obrysy flansz osobno, łuki w pętli."""
+    result = []
+    for wp in workpieces:
+        k_factor = table.lookup(wp.material, wp.thickness, wp.die)
+        total = 0.0
+        for sc in wp.static_components:
+            if sc.hull is None:
+                continue
+            sizes = outline_sizes([sc.hull])
+            if sc.shortenings:
+                edge = outline_sizes([sc.shortenings[0][1]])
+                total += float(sizes.width[0] if edge.width[0] < edge.height[0] else sizes.height[0])
+            else:
+                total += float(sizes.min_dim[0])
+        for dc in wp.deformable_components:
+            angle = dc.bend_angle
+            if angle > 180:
+                angle -= 360
+            radius = dc.actual_inner_radius if dc.actual_inner_radius is not None else dc.preferred_inner_radius
+            total += math.radians(180 - abs(angle)) * ((radius or 0.0) + k_factor * wp.thickness)
+        result.append(total)
+    return result
+
+
+def main():
+    folder = argument(1, ROOT)
+    count = argument(2, 5000, int)
+    repeats = argument(3, 3, int)
+    table = argument(4, KFactorTable(), load_k_table)
+
+    files = dld_files(folder)
+    sample = []
+    for path in files:
+        try:
+            sample.append(parse_workpiece(path))
+        except ET.ParseError:
+            continue
+    if not sample:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    report = blank_lengths(sample, table)
+    known = ~np.isnan(report.delta)
+    print(f"Plików: {len(files)}, detali: {len(sample)}, z BlankLength: {int(known.sum())}, "
+          f"wpisów tablicy K: {len(table)}")
+    if known.any():
+        delta = np.abs(report.delta[known])
+        print(f"|rozwinięcie - BlankLength|: mediana {np.median(delta):.2e} mm, maks. {delta.max():.2e} mm, "
+              f"> 0.01 mm: {int((delta > 0.01).sum())}")
+        for i in np.argsort(-np.abs(np.nan_to_num(report.delta)))[:SHOW_WORST]:
+            if abs(np.nan_to_num(report.delta[i])) > 0.01:
+                print(f"  {report.names[i]}: {report.computed[i]:.3f} / {report.from_file[i]:.3f} mm "
+                      f"(K = {report.k_factors[i]})")
+
+    parts = (sample * (count // len(sample) + 1))[:count]
+    expected = per_part(parts, table)
+    computed = blank_lengths(parts, table).computed
+    bad = sum(1 for a, b in zip(expected, computed.tolist()) if not math.isclose(a, b, abs_tol=1e-9))
+    print(f"Detali: {count}, różnic detal po detalu / blank_lengths: {bad}")
+    stop_on_errors(bad)
+
+    before = timed(lambda: per_part(parts, table), repeats)
+    after = timed(lambda: blank_lengths(parts, table), repeats)
+    print(f"Najlepszy z {repeats} przebiegów, {count} detali:")
+    print(f"  detal po detalu:  {before * 1000:8.1f} ms")
+    print(f"  blank_lengths:    {after * 1000:8.1f} ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Sprawdzenie i benchmark planu cięcia pasów (dld.cutting).
+
+Najpierw sprawdza znane wyniki (known_checks): wybór długości pasa na
+granicy siatki solvera i odcinek dłuższy niż każdy pas (poza planem). Potem wczytuje pliki .dld z folderu, z ich
+rozwinięć (strip_parts) buduje zlecenie – każdy detal w losowej ilości
+sztuk – a następnie:
+1. sprawdza plany: każdy pas mieści swoje odcinki (z rzazem), liczba
+   sztuk każdego detalu (w planie i poza nim) zgodna z zamówieniem,
+2. porównuje liczbę pasów: rozwiązanie startowe (FFD / procedura
+   sekwencyjna) kontra plan po poprawie w budżecie czasu
+   (i dolne ograniczenie), z czasem liczenia.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_cutting.py [folder_z_dld] [maks_sztuk_detalu] [budżet_s] [rzaz]
+"""
+
+import os
+import random
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+from _common import ROOT, argument, dld_files, known_answers, stop_on_errors
+from dld import parse_workpiece
+from dld.cutting import StripPart, cut_plans, strip_parts
+
+# Dopuszczalne przekroczenie długości pasa [mm]
+TOLERANCE = 1e-6
+
+
+def check(plan, ordered, kerf):
+    """Lista problemów planu (pusta, gdy wszystko się zgadza)."""
+    problems = []
+    cut = Counter()
+    for pattern in plan.patterns:
+        used = sum(length + kerf for _, length in pattern.cuts)
+        if used > plan.stock_length + TOLERANCE:
+            problems.append(f"wzór {used:.1f} mm dłuższy niż pas {plan.stock_length:g}")
+        for cut_part in pattern.cuts:
+            cut[cut_part] += pattern.count
+    cut.update(plan.unplaced)
+    if cut != ordered:
+        problems.append("liczba sztuk niezgodna z zamówieniem")
+    return problems
+
+
+def known_checks():
+    """
+    Plany o znanej odpowiedzi: odcinek o 0,01 mm krótszy od pasa mieści się
+    na nim; dłuższy od pasa w siatce solvera przechodzi na kolejną długość;
+    dłuższy od każdego pasa zostaje poza planem, reszta grupy jest cięta.
+    """
+    fits = cut_plans([StripPart("a", 2, 100, 2999.99)], [1], stock_lengths=(3000,))
+    skips = cut_plans([StripPart("a", 2, 100, 2000.04)], [1], stock_lengths=(2000.05, 3000))
+    long = cut_plans([StripPart("a", 2, 100, 3000.01), StripPart("b", 2, 100, 1000.0)], [2, 3],
+                     stock_lengths=(3000,))
+    return [
+        ("odcinek 2999,99 na pasie 3000", fits[(2, 100)].stock_length, 3000.0),
+        ("odcinek 2000,04 przy pasach 2000,05 / 3000", skips[(2, 100)].stock_length, 3000.0),
+        ("odcinek 2000,04 – pasów", skips[(2, 100)].strips, 1),
+        ("odcinek 3000,01 – poza planem", long[(2, 100)].unplaced, (("a", 3000.01),) * 2),
+        ("odcinek 3000,01 – pasów na resztę", long[(2, 100)].strips, 1),
+    ]
+
+
+def main():
+    folder = argument(1, ROOT)
+    most = argument(2, 40, int)
+    budget = argument(3, 0.5, float)
+    kerf = argument(4, 0.0, float)
+    known_answers(known_checks())
+
+    files = dld_files(folder)
+    sample = []
+    for path in files:
+        try:
+            sample.append(parse_workpiece(path))
+        except ET.ParseError:
+            continue
+    if not sample:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    # nazwa pliku zamiast nazwy z programu (te się powtarzają między plikami)
+    parts = [p._replace(name=os.path.relpath(path, folder))
+             for p, path in zip(strip_parts(sample), files) if p.length > 0 and p.width > 0]
+    rng = random.Random(0)
+    quantities = [rng.randint(1, most) for _ in parts]
+    print(f"Plików: {len(files)}, detali: {len(parts)}, sztuk: {sum(quantities)}")
+
+    start = time.perf_counter()
+    ffd = cut_plans(parts, quantities, kerf=kerf, time_budget=0.0)
+    ffd_time = time.perf_counter() - start
+    start = time.perf_counter()
+    plans = cut_plans(parts, quantities, kerf=kerf, time_budget=budget)
+    dp_time = time.perf_counter() - start
+
+    bad = 0
+    for key, plan in plans.items():
+        ordered = Counter()
+        for part, quantity in zip(parts, quantities):
+            if (part.thickness, round(part.width, 1)) == key:
+                ordered[(part.name, part.length)] += quantity
+        problems = check(plan, ordered, kerf)
+        if problems:
+            bad += 1
+            print(f"  grupa {key}: {'; '.join(problems)}")
+    stop_on_errors(bad)
+
+    def totals(result):
+        strips = sum(p.strips for p in result.values())
+        length = sum(p.strips * p.stock_length for p in result.values())
+        return strips, length / 1000
+
+    lower = sum(p.lower_bound for p in plans.values())
+    optimal = sum(p.optimal for p in plans.values())
+    print(f"Grup (grubość, szerokość pasa): {len(plans)}, z planem równym dolnemu ograniczeniu: {optimal}")
+    print(f"  bez poprawy:         {totals(ffd)[0]:5d} pasów, {totals(ffd)[1]:9.1f} m   {ffd_time * 1000:8.1f} ms")
+    print(f"  z poprawą ({budget:g} s):   {totals(plans)[0]:5d} pasów, {totals(plans)[1]:9.1f} m   "
+          f"{dp_time * 1000:8.1f} ms")
+    print(f"  dolne ograniczenie:  {lower:5d} pasów")
+    unplaced = sum(len(p.unplaced) for p in plans.values())
+    if unplaced:
+        print(f"  poza planem (dłuższe niż pas): {unplaced} sztuk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Sprawdzenie i benchmark wsadowego przeliczania wymiarów out / in (dld.dimensions).
+
+Wykaz części budowany jest z flansz plików .dld z folderu (x(zewn.) z bounding
+boxów, kąt, promień i grubość każdego gięcia), powielanych do zadanej liczby
+pozycji, a następnie:
+1. porównuje convert_dimensions z dotychczasowymi calculate_out_dimension /
+   calculate_in_dimension (MODUŁ4 v1.0, g2o1_v.china3) liczonymi pozycja po pozycji,
+2. sprawdza tryby Outside / Inside: wymiar w trybie musi wrócić do tego samego x(zewn.),
+3. mierzy czas obu wersji dla całego wykazu.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_dimensions.py [folder_z_dld] [liczba_pozycji] [powtórzenia]
+"""
+
+import math
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import parse_workpiece
+from dld.bbox import outline_sizes
+from dld.dimensions import convert_dimensions
+
+
+def calculate_out_dimension(zewn_value, offset, angle_deg):
+    """Dotychczasowa wersja z g2o1_v.china3."""
+    tan_value = math.tan(math.radians((180 - angle_deg) / 2))
+    return zewn_value + offset * tan_value
+
+
+def calculate_in_dimension(zewn_value, neutral_radius, angle_deg):
+    arc_length = neutral_radius * math.radians(angle_deg)
+    return zewn_value + arc_length / 2
+
+
+def per_line(lines):
+    out = []
+    inner = []
+    for length, angle, radius, thickness in lines:
+        out.append(calculate_out_dimension(length, radius + thickness, angle))
+        inner.append(calculate_in_dimension(length, radius + thickness / 2, angle))
+    return out, inner
+
+
+def collect_lines(files):
+    """Pozycje (x(zewn.), kąt, promień, grubość): każda flansza z kątem pierwszego gięcia detalu."""
+    lines = []
+    for path in files:
+        try:
+            wp = parse_workpiece(path)
+        except ET.ParseError:
+            continue
+        bends = [dc for dc in wp.deformable_components if dc.bend_angle]
+        hulls = [sc.hull for sc in wp.static_components if sc.hull is not None]
+        if not bends or not hulls:
+            continue
+        radius = bends[0].preferred_inner_radius or 0.0
+        for length in outline_sizes(hulls).min_dim.tolist():
+            lines.append((length, bends[0].bend_angle, radius, wp.thickness))
+    return lines
+
+
+def main():
+    folder = argument(1, ROOT)
+    count = argument(2, 2000, int)
+    repeats = argument(3, 5, int)
+
+    files = dld_files(folder)
+    sample = collect_lines(files)
+    if not sample:
+        print(f"Nie znaleziono flansz z gięciami w plikach .dld w folderze: {folder}")
+        return
+    lines = (sample * (count // len(sample) + 1))[:count]
+    lengths, angles, radii, thickness = (np.array(col) for col in zip(*lines))
+
+    expected_out, expected_in = per_line(lines)
+    dims = convert_dimensions(lengths, angles, radii, thickness)
+    bad = sum(1 for a, b in zip(expected_out, dims.out.tolist()) if not math.isclose(a, b, abs_tol=1e-9))
+    bad += sum(1 for a, b in zip(expected_in, dims.inner.tolist()) if not math.isclose(a, b, abs_tol=1e-9))
+    print(f"Plików: {len(files)}, flansz: {len(sample)}, pozycji wykazu: {count}, różnic: {bad}")
+
+    modes = np.where(np.arange(count) % 2 == 0, "Outside", "Inside")
+    nominal = np.where(modes == "Outside", dims.out, dims.inner)
+    back = convert_dimensions(nominal, angles, radii, thickness, mode=modes)
+    print(f"Tryby Outside / Inside -> x(zewn.): maks. odchyłka {np.abs(back.length - lengths).max():.2e} mm")
+    stop_on_errors(bad)
+
+    before = timed(lambda: per_line(lines), repeats)
+    after = timed(lambda: convert_dimensions(lengths, angles, radii, thickness), repeats)
+    print(f"Najlepszy z {repeats} przebiegów, cały wykaz:")
+    print(f"  pozycja po pozycji:   {before * 1000:8.3f} ms")
+    print(f"  convert_dimensions:   {after * 1000:8.3f} ms  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark: przejście po drzewie .dld w skryptach g2o1 – dawna pętla
+z tag.lower().endswith(...) dla każdego elementu kontra rejestr TagDispatcher.
+
+Oba warianty dostają to samo, już sparsowane drzewo (czas ET.parse nie jest
+wliczany) i muszą dać identyczny stan (grubość, promień, MainPlane, SCxx, DCxx).
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_dispatch.py [folder_z_dld] [powtórzenia]
+"""
+
+import importlib.util
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, timed
+from dld.bbox import outline_sizes
+
+# Skrypt z nazwą zawierającą kropki – ładujemy go po ścieżce
+_spec = importlib.util.spec_from_file_location(
+    "g2o1_china1", os.path.join(ROOT, "GEOMETRIA_GIĘCIA", "China", "g2o1_v.china1.py"))
+g2o1 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(g2o1)
+
+
+def legacy_outline_min(value_str):
+    """Dawne parse_outline_value + bounding_box + width_height_from_box skryptów g2o1."""
+    numeric_vals = []
+    for t in value_str.split():
+        if t.lower() in ['outline', 'true', 'false']:
+            continue
+        try:
+            numeric_vals.append(float(t))
+        except ValueError:
+            pass
+    coords = numeric_vals[1:]
+    points = [(coords[i], coords[i + 1]) for i in range(0, len(coords) - 1, 2)]
+    if not points:
+        return 0.0
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(abs(max(xs) - min(xs)), abs(max(ys) - min(ys)))
+
+
+def legacy_scan(root):
+    """Dawna pętla z g2o1_v.china1.process_file (przed rejestrem tagów)."""
+    dimension_type = None
+    thickness_val = 0.0
+    radius_val = 0.0
+    mainplane_value = None
+    sc_components = {}
+    bends_info = []
+    arc = 0.0
+
+    for elem in root.iter():
+        tag_name = elem.tag.lower()
+
+        if tag_name.endswith("workpiecedimensions"):
+            dimension_type = elem.get("value", "")
+        if tag_name.endswith("workpiecethickness"):
+            try:
+                thickness_val = float(elem.get("value", "0"))
+            except ValueError:
+                thickness_val = 0.0
+        if tag_name.endswith("preferredinnerradius"):
+            try:
+                radius_val = float(elem.get("value", "0"))
+            except ValueError:
+                radius_val = 0.0
+
+        if tag_name.endswith("staticcomponent"):
+            wp_name = elem.find("./WorkpieceComponentName")
+            if wp_name is not None:
+                comp_name = wp_name.get("value", "")
+                hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
+                if hull_elem is not None:
+                    value_min = legacy_outline_min(hull_elem.get("value", ""))
+                    if comp_name == "MainPlane":
+                        mainplane_value = value_min
+                    elif re.match(r'^SC\d+', comp_name):
+                        sc_components[comp_name] = value_min
+
+        if tag_name.endswith("vdeformablecomponent"):
+            wp_name = elem.find("./WorkpieceComponentName")
+            if wp_name is not None:
+                comp_name = wp_name.get("value", "")
+                if re.match(r'^DC\d+', comp_name):
+                    hulls_elem = elem.find("./VDeformableComponentHulls")
+                    if hulls_elem is not None:
+                        arc = legacy_outline_min(hulls_elem.get("value", ""))
+                    angle_after = 0.0
+                    angle_elem = elem.find("./VDeformableComponentAngle")
+                    if angle_elem is not None:
+                        try:
+                            angle_after = float(angle_elem.get("value", "0"))
+                        except ValueError:
+                            angle_after = 0.0
+                    angle_after_elem = elem.find("./VBendDeformation/AngleAfter")
+                    if angle_after_elem is not None:
+                        try:
+                            angle_after = float(angle_after_elem.get("value", "0"))
+                        except ValueError:
+                            pass
+                    bends_info.append({
+                        "name": comp_name,
+                        "arc": arc,
+                        "angle_raw": angle_after,
+                        "angle_norm": g2o1.normalize_angle(angle_after)
+                    })
+
+    return {
+        "dimension_type": dimension_type,
+        "thickness": thickness_val,
+        "radius": radius_val,
+        "mainplane": mainplane_value,
+        "sc": sc_components,
+        "bends": bends_info,
+    }
+
+
+def dispatch_scan(root):
+    state = g2o1.PARSER.dispatch(root, {
+        "dimension_type": None,
+        "thickness": 0.0,
+        "radius": 0.0,
+        "mainplane": None,
+        "sc": {},
+        "bends": [],
+        "hulls": [],
+    })
+    state.pop("arc", None)
+    # Numery obrysów -> wymiary, jak w process_file (jedno outline_sizes na plik)
+    min_dims = outline_sizes(state.pop("hulls")).min_dim.tolist()
+    if state["mainplane"] is not None:
+        state["mainplane"] = min_dims[state["mainplane"]]
+    state["sc"] = {name: min_dims[hull] for name, hull in state["sc"].items()}
+    for bend in state["bends"]:
+        bend["arc"] = 0.0 if bend["arc"] is None else min_dims[bend["arc"]]
+    return state
+
+
+def load_trees(folder):
+    trees = []
+    for path in dld_files(folder):
+        try:
+            trees.append((path, ET.parse(path).getroot()))
+        except ET.ParseError:
+            continue
+    return trees
+
+
+def scan_all(scan, trees):
+    for _, root in trees:
+        scan(root)
+
+
+def main():
+    folder = argument(1, ROOT)
+    repeats = argument(2, 5, int)
+
+    trees = load_trees(folder)
+    if not trees:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    for path, root in trees:
+        if legacy_scan(root) != dispatch_scan(root):
+            raise SystemExit(f"RÓŻNICA wyników dla pliku: {path}")
+
+    n = len(trees)
+    elements = sum(sum(1 for _ in root.iter()) for _, root in trees)
+    before = timed(scan_all, repeats, legacy_scan, trees)
+    after = timed(scan_all, repeats, dispatch_scan, trees)
+
+    print(f"Plików: {n}, elementów XML: {elements} (najlepszy z {repeats} przebiegów)")
+    print(f"  endswith (przed):     {before * 1000 / n:8.3f} ms/plik  ({before:.3f} s)")
+    print(f"  TagDispatcher (po):   {after * 1000 / n:8.3f} ms/plik  ({after:.3f} s)")
+    print(f"  przyspieszenie:       {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Sprawdzenie i benchmark rozwinięć wielokątnych (dld.flat).
+
+Wczytuje pliki .dld z folderu, a następnie:
+1. sprawdza każde rozwinięcie: wszystkie komponenty ustawione, pole obrysu
+   równe sumie pól obrysów SC / DC (brak nakładania się), wymiar bounding
+   boxa równy BlankLength (detale z BlankLength i równoległymi gięciami),
+2. powiela detale do zadanej liczby (jak zlecenie z powtarzającymi się
+   programami) i mierzy czas: każdy detal liczony od nowa kontra flat_patterns
+   z cache geometrii.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_flat.py [folder_z_dld] [liczba_detali] [powtórzenia]
+"""
+
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import parse_workpiece
+from dld.flat import FlatPatternCache, compute_flat_pattern, flat_patterns, geometry_key
+
+# Dopuszczalna różnica pola / wymiaru [mm², mm]
+TOLERANCE = 1e-3
+
+
+def polygon_area(points):
+    area = 0.0
+    pts = points.tolist()
+    for (x1, y1), (x2, y2) in zip(pts, pts[1:] + pts[:1]):
+        area += x1 * y2 - x2 * y1
+    return abs(area) / 2.0
+
+
+def check(wp, pattern):
+    """Lista problemów rozwinięcia (pusta, gdy wszystko się zgadza)."""
+    problems = []
+    if pattern.unplaced:
+        problems.append(f"nieustawione: {', '.join(pattern.unplaced)}")
+    pieces_area = sum(polygon_area(points) for _, points in pattern.pieces)
+    if abs(pieces_area - pattern.area) > TOLERANCE * max(1.0, pieces_area):
+        problems.append(f"pole {pattern.area:.3f} zamiast {pieces_area:.3f}")
+    if wp.blank_length:
+        xmin, ymin, xmax, ymax = pattern.bounds
+        if min(abs(xmax - xmin - wp.blank_length), abs(ymax - ymin - wp.blank_length)) > TOLERANCE:
+            problems.append(f"wymiar {xmax - xmin:.3f} x {ymax - ymin:.3f}, BlankLength {wp.blank_length:.3f}")
+    return problems
+
+
+def main():
+    folder = argument(1, ROOT)
+    count = argument(2, 2000, int)
+    repeats = argument(3, 3, int)
+
+    files = dld_files(folder)
+    sample = []
+    for path in files:
+        try:
+            sample.append(parse_workpiece(path))
+        except ET.ParseError:
+            continue
+    if not sample:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    cache = FlatPatternCache()
+    bad = 0
+    for wp, pattern in zip(sample, flat_patterns(sample, cache)):
+        problems = check(wp, pattern)
+        if problems:
+            bad += 1
+            print(f"  {wp.name}: {'; '.join(problems)}")
+    print(f"Plików: {len(files)}, detali: {len(sample)}, różnych geometrii: {len(cache)}, "
+          f"z błędami: {bad}")
+    stop_on_errors(bad)
+
+    parts = (sample * (count // len(sample) + 1))[:count]
+
+    def uncached():
+        return [compute_flat_pattern(geometry_key(wp), wp.name) for wp in parts]
+
+    def cached():
+        cache.clear()
+        return flat_patterns(parts, cache)
+
+    before = timed(uncached, repeats)
+    after = timed(cached, repeats)
+    print(f"Najlepszy z {repeats} przebiegów, {count} detali:")
+    print(f"  każdy od nowa:       {before * 1000:8.1f} ms")
+    print(f"  flat_patterns+cache: {after * 1000:8.1f} ms  ({before / after:.1f}x), {cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
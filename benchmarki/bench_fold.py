@@ -0,0 +1,122 @@
+"""
+Sprawdzenie i benchmark gięcia detali w 3D (dld.fold).
+
+Najpierw sprawdza znane wyniki: wymiary zewnętrzne kątownika 100/50
+(prd.4_100k9050) i ceownika 300/100/50 (prd.8_300_100_50_) z GEOMETRIA_GIĘCIA.
+Potem wczytuje pliki .dld z folderu, a następnie:
+1. sprawdza każdy zgięty detal: narożniki pasów stref gięcia leżą na
+   wierzchołkach flansz po obu stronach (brak rozerwania), kąt między
+   normalnymi flansz równy ugięciu strefy, wymiar zewnętrzny flanszy
+   zmierzony na bryle równy wymiarowi z rozwinięcia + Σ (r + g)·tan(θ/2)
+   (r + g/2 – promień łuku stref na powierzchni środkowej),
+2. mierzy czas fold_files dla wszystkich plików: w jednym procesie
+   oraz w puli procesów.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_fold.py [folder_z_dld] [powtórzenia]
+"""
+
+import math
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from _common import ROOT, argument, dld_files, known_answers, stop_on_errors, timed
+from dld import parse_workpiece
+from dld.flat import flat_pattern
+from dld.fold import ARC_STEPS, fold_files, fold_workpiece, outside_dimensions
+
+# Dopuszczalna różnica położenia / wymiaru [mm], cosinusa kąta
+TOLERANCE = 1e-6
+
+
+def expected_dimensions(part, pattern):
+    """Wymiary zewnętrzne flansz ze wzoru: rozwinięcie flanszy + Σ (r + g)·tan(θ/2)."""
+    pieces = dict(pattern.pieces)
+    flat_zones = {z.name: z for z in pattern.zones}
+    result = {}
+    for name in pieces:
+        zones = [z for z in part.zones if name in (z.left, z.right) and z.centre is not None]
+        if not zones or name in flat_zones:
+            continue
+        u = np.array(flat_zones[zones[0].name].direction)
+        projection = pieces[name] @ np.array([u[1], -u[0]])
+        length = float(projection.max() - projection.min())
+        for z in zones:
+            if abs(abs(z.axis @ zones[0].axis) - 1.0) > TOLERANCE:
+                continue
+            theta = math.radians(abs(z.angle))
+            outer = z.radius + part.thickness / 2.0
+            length += outer if abs(theta - math.pi) < TOLERANCE else outer * math.tan(theta / 2.0)
+        result[name] = length
+    return result
+
+
+def check(wp):
+    """Lista problemów zgiętego detalu (pusta, gdy wszystko się zgadza)."""
+    part = fold_workpiece(wp)
+    problems = []
+    if part.unplaced:
+        problems.append(f"bez położenia: {', '.join(part.unplaced)}")
+    flanges = dict(part.flanges)
+    normals = dict(part.normals)
+    for zone, (name, strip) in zip(part.zones, part.bends):
+        vertices = np.vstack([flanges[zone.left], flanges[zone.right]])
+        gap = np.linalg.norm(strip[::ARC_STEPS, None] - vertices[None], axis=2).min(axis=1).max()
+        if gap > TOLERANCE:
+            problems.append(f"{name}: strefa odsunięta od flansz o {gap:.3g} mm")
+        cosine = float(normals[zone.left] @ normals[zone.right])
+        if abs(cosine - math.cos(math.radians(zone.angle))) > TOLERANCE:
+            problems.append(f"{name}: kąt między flanszami różny od ugięcia {zone.angle:g}°")
+    expected = expected_dimensions(part, flat_pattern(wp))
+    for name, measured in outside_dimensions(part).items():
+        if abs(measured - expected[name]) > TOLERANCE:
+            problems.append(f"{name}: wymiar zewnętrzny {measured:.3f} zamiast {expected[name]:.3f}")
+    return problems
+
+
+def known_checks():
+    """Wymiary zewnętrzne detali próbnych z wymiarami w nazwie (kątownik 100/50, ceownik 300/100/50)."""
+    folder = os.path.join(ROOT, "GEOMETRIA_GIĘCIA")
+    checks = []
+    for name, expected in (("prd.4_100k9050", {"MainPlane": 100.0, "SC00": 50.0}),
+                           ("prd.8_300_100_50_", {"MainPlane": 300.0, "SC00": 100.0, "SC01": 50.0})):
+        part = fold_workpiece(parse_workpiece(os.path.join(folder, name + ".dld")))
+        checks.append((f"{name}: wymiary zewnętrzne", outside_dimensions(part), expected))
+    return checks
+
+
+def main():
+    folder = argument(1, ROOT)
+    repeats = argument(2, 3, int)
+    known_answers(known_checks())
+
+    files = dld_files(folder)
+    checked = bad = 0
+    for path in files:
+        try:
+            wp = parse_workpiece(path)
+        except ET.ParseError:
+            continue
+        checked += 1
+        problems = check(wp)
+        if problems:
+            bad += 1
+            print(f"  {os.path.relpath(path, folder)}: {'; '.join(problems)}")
+    if not checked:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+    print(f"Sprawdzono detali: {checked}, z błędami: {bad}")
+    stop_on_errors(bad)
+
+    serial = timed(lambda: fold_files(files, workers=1), repeats)
+    parallel = timed(lambda: fold_files(files), repeats)
+    print(f"Najlepszy z {repeats} przebiegów, {len(files)} plików:")
+    print(f"  fold_files, 1 proces:          {serial * 1000:8.1f} ms")
+    print(f"  fold_files, wszystkie rdzenie ({os.cpu_count()}): {parallel * 1000:8.1f} ms  "
+          f"({serial / parallel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
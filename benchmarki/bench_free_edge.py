@@ -0,0 +1,115 @@
+"""
+Sprawdzenie i benchmark dopasowania krawędzi w measure_free_edge
+(GEOMETRIA_GIĘCIA/China/testy/g2o1_v.chinagpt2v2 -poprawkao1.py).
+
+Dawna wersja porównywała każdą krawędź hull z każdą krawędzią ShorteningContour
+i filtrowała wolne krawędzie przez "he not in used_edges"; nowa szuka
+odpowiedników w siatce krawędzi (build_edge_grid / has_same_edge).
+
+1. Wynik obu wersji dla każdego StaticComponent z plików .dld.
+2. Wynik i czas na syntetycznych obrysach "grzebieniowych" (wiele wcięć),
+   w których część krawędzi pokrywa się z konturem skrócenia.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_free_edge.py [folder_z_dld] [liczba_zębów]
+"""
+
+import importlib.util
+import os
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+
+# Skrypt z nazwą zawierającą spację i kropki – ładujemy go po ścieżce
+_spec = importlib.util.spec_from_file_location(
+    "poprawkao1", os.path.join(ROOT, "GEOMETRIA_GIĘCIA", "China", "testy", "g2o1_v.chinagpt2v2 -poprawkao1.py"))
+script = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(script)
+
+
+def legacy_measure_free_edge(hull_pts, shortcontours):
+    """Dawne measure_free_edge (porównanie każdy z każdym)."""
+    if not hull_pts:
+        return 0.0
+    hull_edges = script.edges_of_polygon(hull_pts, close_loop=True)
+    used_edges = []
+    for sc_poly in shortcontours:
+        sc_edges = script.edges_of_polygon(sc_poly, close_loop=True)
+        for he in hull_edges:
+            for se in sc_edges:
+                if script.same_edge(he, se):
+                    used_edges.append(he)
+    free_edges = [he for he in hull_edges if he not in used_edges]
+    if not free_edges:
+        return 0.0
+    lengths = [(script.dist(e[0], e[1]), e) for e in free_edges]
+    lengths.sort(key=lambda x: x[0], reverse=True)
+    return lengths[0][0]
+
+
+def sample_cases(folder):
+    cases = []
+    for path in dld_files(folder):
+        try:
+            root = ET.parse(path).getroot()
+        except ET.ParseError:
+            continue
+        for elem in root.iter("StaticComponent"):
+            hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
+            hull_pts = script.parse_outline_value(hull_elem.get("value", "")) if hull_elem is not None else []
+            shortenings = [script.parse_outline_value(s.get("value", ""))
+                           for s in elem.findall("./DeformableCompShortening/ShorteningContour")]
+            cases.append((hull_pts, shortenings))
+    return cases
+
+
+def comb_case(teeth):
+    """Obrys z `teeth` wcięciami wzdłuż dolnej krawędzi; kontur skrócenia pokrywa górną część."""
+    pts = [(0.0, 0.0)]
+    for i in range(teeth):
+        x = 10.0 * i
+        pts += [(x + 3.0, 0.0), (x + 3.0, 2.5), (x + 7.0, 2.5), (x + 7.0, 0.0)]
+    width = 10.0 * teeth
+    pts += [(width, 0.0), (width, 50.0), (0.0, 50.0)]
+    # Kontur skrócenia: górna krawędź i co drugi ząb (w odwrotnym kierunku)
+    shortening = [(0.0, 50.0), (width, 50.0)]
+    for i in range(0, teeth, 2):
+        x = 10.0 * i
+        shortening += [(x + 7.0, 2.5), (x + 3.0, 2.5)]
+    return pts, [shortening]
+
+
+def measure_all(func, cases):
+    for hull_pts, shortenings in cases:
+        func(hull_pts, shortenings)
+
+
+def main():
+    folder = argument(1, ROOT)
+    teeth = argument(2, 200, int)
+
+    cases = sample_cases(folder)
+    bad = sum(1 for hull, short in cases
+              if legacy_measure_free_edge(hull, short) != script.measure_free_edge(hull, short))
+    print(f"StaticComponent z plików: {len(cases)}, różnic: {bad}")
+    stop_on_errors(bad)
+
+    for n in (teeth // 4, teeth):
+        case = [comb_case(n)]
+        if legacy_measure_free_edge(*case[0]) != script.measure_free_edge(*case[0]):
+            raise SystemExit(f"RÓŻNICA dla obrysu z {n} zębami")
+        before = timed(measure_all, 3, legacy_measure_free_edge, case)
+        after = timed(measure_all, 3, script.measure_free_edge, case)
+        edges = len(case[0][0])
+        print(f"Obrys z {n} zębami ({edges} krawędzi):")
+        print(f"  każdy z każdym:  {before * 1000:9.2f} ms")
+        print(f"  siatka:          {after * 1000:9.2f} ms  ({before / after:.0f}x)")
+
+    if cases:
+        before = timed(measure_all, 3, legacy_measure_free_edge, cases)
+        after = timed(measure_all, 3, script.measure_free_edge, cases)
+        print(f"Pliki .dld: każdy z każdym {before * 1000:.2f} ms, siatka {after * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
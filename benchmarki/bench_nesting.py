@@ -0,0 +1,101 @@
+"""
+Sprawdzenie i benchmark rozkroju rozwinięć na arkuszach (dld.nesting).
+
+Wczytuje pliki .dld z folderu, buduje z ich rozwinięć zlecenie o zadanej
+liczbie sztuk (detale w powtarzających się ilościach, jak w wykazie),
+a następnie:
+1. sprawdza rozkrój: każdy detal w obrębie arkusza z marginesem, bez
+   nachodzenia na inne detale (z odstępem), wszystkie sztuki ułożone,
+2. mierzy czas: jedna kolejność (po polu) kontra nest – wszystkie
+   kolejności i formaty, w jednym procesie oraz w puli procesów.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_nesting.py [folder_z_dld] [liczba_sztuk] [powtórzenia]
+"""
+
+import os
+import random
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import Blank, parse_workpiece
+from dld.flat import flat_patterns
+from dld.nesting import DEFAULT_MARGIN, DEFAULT_SPACING, STANDARD_SHEETS, nest, orderings, pack
+
+# Dopuszczalne przekroczenie wymiarów [mm]
+TOLERANCE = 1e-6
+
+
+def check(result, count):
+    """Lista problemów rozkroju (pusta, gdy wszystko się zgadza)."""
+    problems = []
+    if len(result.placements) + len(result.unplaced) != count:
+        problems.append(f"ułożono {len(result.placements)} + {len(result.unplaced)} z {count}")
+    low = DEFAULT_MARGIN - TOLERANCE
+    for sheet in range(result.sheets):
+        placed = result.sheet_placements(sheet)
+        for p in placed:
+            if (p.x < low or p.y < low or p.x + p.width > result.sheet_width - low
+                    or p.y + p.height > result.sheet_height - low):
+                problems.append(f"{p.name} poza arkuszem {sheet + 1}")
+        placed.sort(key=lambda p: p.x)
+        for i, a in enumerate(placed):
+            for b in placed[i + 1:]:
+                if b.x >= a.x + a.width + DEFAULT_SPACING - TOLERANCE:
+                    break
+                if (a.y < b.y + b.height + DEFAULT_SPACING - TOLERANCE
+                        and b.y < a.y + a.height + DEFAULT_SPACING - TOLERANCE):
+                    problems.append(f"{a.name} nachodzi na {b.name} (arkusz {sheet + 1})")
+    return problems
+
+
+def main():
+    folder = argument(1, ROOT)
+    count = argument(2, 500, int)
+    repeats = argument(3, 3, int)
+
+    files = dld_files(folder)
+    sample = []
+    for path in files:
+        try:
+            sample.append(parse_workpiece(path))
+        except ET.ParseError:
+            continue
+    blanks = [Blank.from_pattern(p) for p in flat_patterns(sample) if not p.unplaced and len(p.outline)]
+    if not blanks:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    # zlecenie: kolejne detale w ilościach 1..16 szt., aż do liczby sztuk
+    rng = random.Random(0)
+    order = []
+    while len(order) < count:
+        order.extend([rng.choice(blanks)] * rng.randint(1, 16))
+    order = order[:count]
+    print(f"Plików: {len(files)}, rozwinięć: {len(blanks)}, zlecenie: {count} szt.")
+
+    single = pack([order[i] for i in orderings(order, 0)[0][1]], *STANDARD_SHEETS[-1])
+    best = nest(order)
+    bad = 0
+    for name, result in (("jedna kolejność", single), ("nest", best)):
+        problems = check(result, count)
+        bad += bool(problems)
+        for problem in problems[:10]:
+            print(f"  {name}: {problem}")
+        print(f"  {name:<16} arkusz {result.sheet_width:g}x{result.sheet_height:g}, arkuszy: {result.sheets}, "
+              f"wykorzystanie {result.utilisation:.1%}, nie mieszczą się: {len(result.unplaced)}"
+              f"{', kolejność: ' + result.ordering if result.ordering else ''}")
+    stop_on_errors(bad)
+
+    one = timed(lambda: pack([order[i] for i in orderings(order, 0)[0][1]], *STANDARD_SHEETS[-1]), repeats)
+    serial = timed(lambda: nest(order, workers=1), repeats)
+    parallel = timed(lambda: nest(order), repeats)
+    tasks = len(orderings(order)) * len(STANDARD_SHEETS)
+    print(f"Najlepszy z {repeats} przebiegów, {count} szt., {tasks} rozkrojów (kolejność x format):")
+    print(f"  jedna kolejność:         {one * 1000:8.1f} ms")
+    print(f"  nest, 1 proces:          {serial * 1000:8.1f} ms")
+    print(f"  nest, wszystkie rdzenie ({os.cpu_count()}): {parallel * 1000:8.1f} ms  ({serial / parallel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Sprawdzenie i benchmark skanera bajtowego (dld.scan) na plikach .dld.
+
+1. Dla każdego pliku porównuje scan_values z wartościami odczytanymi przez
+   ET (values_from_tree) oraz scan_inventory z modelem Workpiece.
+2. Mierzy czas przeglądu: skaner (mmap) kontra ET.parse całego pliku.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_scan.py [folder_z_dld] [powtórzenia]
+"""
+
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import parse_workpiece
+from dld.scan import INVENTORY_TAGS, scan_inventory, scan_values, values_from_tree
+
+# Szerszy zestaw niż inwentaryzacja – także wartości z outline
+CHECK_TAGS = INVENTORY_TAGS + (
+    "StaticComponentHull",
+    "ShorteningContour",
+    "PreferredInnerRadius",
+    "VDeformableComponentHulls",
+    "WorkpieceComponentName",
+)
+
+
+def check(files):
+    bad = 0
+    for path in files:
+        try:
+            expected = values_from_tree(ET.parse(path).getroot(), CHECK_TAGS)
+        except ET.ParseError:
+            try:
+                scan_values(path, CHECK_TAGS)
+            except ET.ParseError:
+                continue
+            print(f"Brak ET.ParseError ze skanera: {path}")
+            bad += 1
+            continue
+
+        if scan_values(path, CHECK_TAGS) != expected:
+            print(f"RÓŻNICA scan_values: {path}")
+            bad += 1
+
+        wp = parse_workpiece(path)
+        inventory = scan_inventory(path)
+        model = {
+            "name": wp.name,
+            "thickness": wp.thickness,
+            "material": wp.material,
+            "dimensions": wp.dimensions,
+            "angles": [dc.bend_angle for dc in wp.deformable_components],
+        }
+        if inventory != model:
+            print(f"RÓŻNICA scan_inventory: {path}\n  {inventory}\n  {model}")
+            bad += 1
+    return bad
+
+
+def read_all(func, files):
+    for path in files:
+        func(path)
+
+
+def et_inventory(path):
+    return values_from_tree(ET.parse(path).getroot(), INVENTORY_TAGS)
+
+
+def main():
+    folder = argument(1, ROOT)
+    repeats = argument(2, 5, int)
+
+    files = dld_files(folder)
+    if not files:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    bad = check(files)
+    print(f"Sprawdzono {len(files)} plików, różnic: {bad}")
+    stop_on_errors(bad)
+
+    files = [f for f in files if _parses(f)]
+    n = len(files)
+    before = timed(read_all, repeats, et_inventory, files)
+    after = timed(read_all, repeats, lambda p: scan_values(p, INVENTORY_TAGS), files)
+    print(f"Przegląd {n} plików (najlepszy z {repeats} przebiegów)")
+    print(f"  ET.parse:        {before * 1000 / n:8.3f} ms/plik")
+    print(f"  scan_values:     {after * 1000 / n:8.3f} ms/plik")
+    print(f"  przyspieszenie:  {before / after:8.2f}x")
+
+
+def _parses(path):
+    try:
+        ET.parse(path)
+    except ET.ParseError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Sprawdzenie i benchmark kontroli sekwencji gięć (dld.sequence).
+
+Wczytuje pliki .dld z folderu, a następnie:
+1. sprawdza spójność: wynik z cache równy liczonemu od nowa, a kolizje
+   z narzędziami domyślnymi zawierają się w kolizjach z narzędziami
+   szerszymi (tablica z powiększonymi przekrojami) – dokładne testy
+   i odsiew AABB nie gubią styków przy większych narzędziach,
+2. pokazuje odsiew: liczba par (powierzchnia blachy, część narzędzia)
+   kontra dokładnych testów wielokątów,
+3. powiela programy do zadanej liczby (jak zlecenie z powtarzającymi się
+   programami) i mierzy czas: każdy program liczony od nowa kontra
+   check_sequence z cache; dla plików z dysku – jeden proces kontra
+   check_files w puli procesów.
+
+Uruchomienie (z katalogu głównego projektu):
+    python benchmarki/bench_sequence.py [folder_z_dld] [liczba_programów] [powtórzenia]
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+from _common import ROOT, argument, dld_files, stop_on_errors, timed
+from dld import parse_workpiece
+from dld.sequence import (
+    DIE, STATUS_FAILED, SequenceCheckCache, check_files, compute_sequence_check, sequence_key, tool_set,
+)
+
+# O tyle [mm] poszerzone są narzędzia w teście zawierania kolizji
+WIDER = 20.0
+
+
+def wider_table(workpieces):
+    """Tablica narzędzi z przekrojami szerszymi o WIDER od domyślnych."""
+    table = {}
+    for wp in workpieces:
+        for spec in tool_set(wp, {}):
+            width = spec.width + (WIDER if spec.kind == DIE else WIDER / 2.0)
+            table[(spec.kind, spec.name)] = spec._replace(width=width)
+    return table
+
+
+def collision_set(result):
+    return {(c.step, c.piece, c.tool) for c in result.collisions + result.unverified_collisions}
+
+
+def main():
+    folder = argument(1, ROOT)
+    count = argument(2, 500, int)
+    repeats = argument(3, 3, int)
+
+    files = dld_files(folder)
+    sample = []
+    for path in files:
+        try:
+            sample.append((path, parse_workpiece(path)))
+        except ET.ParseError:
+            continue
+    programs = [(path, wp) for path, wp in sample if wp.has_bend_sequence]
+    if not programs:
+        print(f"Nie znaleziono plików .dld z sekwencją gięć w folderze: {folder}")
+        return
+
+    cache = SequenceCheckCache()
+    wide = wider_table([wp for _, wp in programs])
+    bad = feasible = pairs = exact = 0
+    for path, wp in programs:
+        result = cache.get(wp, {})
+        problems = []
+        if result != compute_sequence_check(sequence_key(wp, {}), wp.name):
+            problems.append("wynik z cache różny od liczonego od nowa")
+        lost = collision_set(result) - collision_set(cache.get(wp, wide))
+        if lost:
+            problems.append(f"kolizje znikają przy szerszych narzędziach: {sorted(lost)}")
+        if problems:
+            bad += 1
+            print(f"  {os.path.relpath(path, folder)}: {'; '.join(problems)}")
+        feasible += result.status != STATUS_FAILED
+        pairs += result.pairs
+        exact += result.exact
+    print(f"Programów z sekwencją: {len(programs)}, bez pewnych kolizji i problemów: {feasible}, niespójnych: {bad}")
+    print(f"Par powierzchnia-narzędzie: {pairs}, dokładnych testów po odsiewie AABB: {exact} "
+          f"({exact / max(pairs, 1):.1%})")
+    stop_on_errors(bad)
+
+    order = [wp for _, wp in programs] * (count // len(programs) + 1)
+    order = order[:count]
+    paths = [path for path, _ in programs]
+
+    def cached():
+        order_cache = SequenceCheckCache()
+        for wp in order:
+            order_cache.get(wp, {})
+
+    def from_disk():
+        disk_cache = SequenceCheckCache()
+        for path in paths:
+            disk_cache.get(parse_workpiece(path))
+
+    every = timed(lambda: [compute_sequence_check(sequence_key(wp, {}), wp.name) for wp in order], repeats)
+    once = timed(cached, repeats)
+    serial = timed(from_disk, repeats)
+    parallel = timed(lambda: check_files(paths), repeats)
+    print(f"Najlepszy z {repeats} przebiegów, {count} programów ({len(programs)} różnych):")
+    print(f"  każdy od nowa:           {every * 1000:8.1f} ms")
+    print(f"  z cache:                 {once * 1000:8.1f} ms  ({every / once:.1f}x)")
+    print(f"Pliki z dysku ({len(paths)}):")
+    print(f"  1 proces:                {serial * 1000:8.1f} ms")
+    print(f"  check_files, wszystkie rdzenie ({os.cpu_count()}): {parallel * 1000:8.1f} ms  "
+          f"({serial / parallel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
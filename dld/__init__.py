@@ -0,0 +1,41 @@
+"""
+Wspólna biblioteka do odczytu programów Delem (.dld).
+
+Skrypty z repozytorium dołączają katalog główny projektu do sys.path
+i importują stąd parser oraz model detalu:
+
+    from dld import load_workpiece
+    wp = load_workpiece("prd.4_100k9050.dld")
+
+load_workpiece korzysta z trwałego cache (dld.cache); parse_workpiece zawsze
+parsuje plik.
+"""
+
+from .backends import get_backend
+from .bbox import BoxSizes, bounding_boxes, box_sizes, outline_sizes, pack_points
+from .bendtable import BendGeometry, BendGeometryCache, bend_geometry
+from .blank import BlankReport, KFactorTable, bend_radius, blank_lengths, load_k_table
+from .cache import WorkpieceCache, load_workpiece
+from .calibration import (
+    CalibrationSample, KFactorFit, check_reproduction, collect_samples, fit_k_factors, load_blank_lengths,
+    write_k_table,
+)
+from .chain import ChainBend, FlangeChain, FlangeDimensions, build_chain
+from .cutting import CutPattern, CutPlan, StripPart, cut_plans, solve_cutting, strip_parts
+from .dimensions import DimensionArrays, bend_offsets, convert_dimensions, normalize_angles
+from .dispatch import TagDispatcher, local_name
+from .flat import FlatPattern, FlatPatternCache, flat_pattern, flat_patterns, write_dxf, write_svg
+from .fold import FoldedPart, fold_files, fold_workpiece, outside_dimensions
+from .model import BendStep, DeformableComponent, StaticComponent, Workpiece
+from .nesting import Blank, NestingResult, nest, nest_groups, write_nesting_svg
+from .outline import (
+    arc_lengths, chord_lengths, decode_outline, decode_outlines, outline_dimension,
+    outline_points, outline_segment_lengths, outline_segments, outlines_segment_lengths,
+    outlines_segments,
+)
+from .parser import (
+    BEND_SEQUENCE, BLANK_LENGTH, GEOMETRY, WORKPIECE,
+    format_number, parse_workpiece, workpiece_from_root,
+)
+from .sequence import SequenceCheck, check_files, check_sequence, load_tool_table
+from .units import CONVERTERS, convert, element_value, read_table, typed_values
@@ -0,0 +1,60 @@
+"""
+Odczyt programów .dld prosto z archiwów zip / tar (bez rozpakowywania).
+
+    for name, f in iter_archive("programy.zip"):
+        wp = parse_workpiece(f)          # f – strumień binarny członka archiwum
+
+Członkowie archiwum są czytani strumieniowo (tar w trybie "r|*", więc także
+.tar.gz / .tar.bz2 / .tar.xz bez dostępu swobodnego); na dysk nie trafia
+żaden plik tymczasowy. Wyniki kluczujemy nazwą członka (ścieżką w archiwum).
+
+Archiwa .rar nie są obsługiwane przez bibliotekę standardową – trzeba je
+najpierw przepakować do zip/tar.
+"""
+
+import os
+import tarfile
+import zipfile
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def is_archive(path):
+    """Czy ścieżka wskazuje archiwum zip/tar (wg rozszerzenia i zawartości)."""
+    if not os.path.isfile(path) or not path.lower().endswith(ARCHIVE_EXTENSIONS):
+        return False
+    return zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+
+
+def iter_archive(path, suffix=".dld"):
+    """
+    Zwraca kolejno (nazwa członka, strumień binarny) dla plików archiwum
+    o rozszerzeniu suffix. Strumień jest ważny do pobrania następnego elementu.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(suffix):
+                    continue
+                with zf.open(info) as member:
+                    yield info.filename, member
+        return
+
+    with tarfile.open(path, "r|*") as tf:
+        for info in tf:
+            if not info.isfile() or not info.name.lower().endswith(suffix):
+                continue
+            member = tf.extractfile(info)
+            if member is None:
+                continue
+            with member:
+                yield info.name, member
+
+
+def member_output_dir(output_dir, member_name):
+    """
+    Katalog wyników dla członka archiwum: output_dir + katalogi z nazwy członka,
+    tak aby pliki o tej samej nazwie z różnych podkatalogów się nie nadpisywały.
+    """
+    parts = [p for p in member_name.replace("\\", "/").split("/")[:-1] if p not in ("", ".", "..")]
+    return os.path.join(output_dir, *parts)
@@ -0,0 +1,97 @@
+"""
+Backendy XML dla parsera dld.
+
+  - "etree" – xml.etree.ElementTree (biblioteka standardowa, zawsze dostępny)
+  - "lxml"  – lxml.etree; zapytania parsera są kompilowane raz (etree.XPath)
+              i używane ponownie dla kolejnych plików
+
+Domyślnie używany jest lxml, jeśli jest zainstalowany (zmienna środowiskowa
+DLD_BACKEND=etree wymusza bibliotekę standardową). Oba backendy dają ten sam
+Workpiece, a błędny XML w obu przypadkach zgłaszany jest jako ET.ParseError.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml jest opcjonalny
+    lxml_etree = None
+
+
+class EtreeBackend:
+    """Zapytania ElementPath biblioteki standardowej."""
+
+    name = "etree"
+
+    def parse(self, source):
+        return ET.parse(source).getroot()
+
+    def find(self, parent, path):
+        return parent.find(path)
+
+    def findall(self, parent, path):
+        return parent.findall(path)
+
+    def iter(self, root, tag):
+        return root.iter(tag)
+
+
+class LxmlBackend:
+    """
+    Zapytania jako skompilowane etree.XPath. Ścieżki parsera (np.
+    "StaticComponentPart/StaticComponentHull", ".//BendSequence") są poprawnym
+    XPath; kompilowane są przy pierwszym użyciu i trzymane w słowniku.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        if lxml_etree is None:
+            raise ImportError("Backend 'lxml' wymaga pakietu lxml (pip install lxml)")
+        self._compiled = {}
+
+    def _xpath(self, path):
+        compiled = self._compiled.get(path)
+        if compiled is None:
+            compiled = lxml_etree.XPath(path)
+            self._compiled[path] = compiled
+        return compiled
+
+    def parse(self, source):
+        try:
+            return lxml_etree.parse(source).getroot()
+        except lxml_etree.XMLSyntaxError as e:
+            error = ET.ParseError(str(e))
+            error.position = e.position
+            raise error from e
+
+    def find(self, parent, path):
+        result = self._xpath(path)(parent)
+        return result[0] if result else None
+
+    def findall(self, parent, path):
+        return self._xpath(path)(parent)
+
+    def iter(self, root, tag):
+        # root.iter(tag) obejmuje też sam root
+        return self._xpath("descendant-or-self::" + tag)(root)
+
+
+ETREE = EtreeBackend()
+_backends = {"etree": ETREE}
+
+
+def get_backend(name=None):
+    """
+    Zwraca backend o podanej nazwie ("etree", "lxml") lub domyślny (None).
+    Domyślny: DLD_BACKEND, a gdy nie ustawiono – lxml, jeśli jest zainstalowany.
+    """
+    if name is None:
+        name = os.environ.get("DLD_BACKEND") or ("lxml" if lxml_etree is not None else "etree")
+    backend = _backends.get(name)
+    if backend is None:
+        if name != "lxml":
+            raise ValueError(f"Nieznany backend XML: {name}")
+        backend = _backends[name] = LxmlBackend()
+    return backend
@@ -0,0 +1,78 @@
+"""
+Bounding boxy wielu obrysów naraz (NumPy).
+
+Skrypty g2o1 / g3iwiecej liczyły bounding box każdego obrysu osobno:
+listy xs / ys i cztery wywołania min/max. Tutaj obrysy całego pliku (albo
+całego folderu) trafiają do jednej tablicy poszarpanej:
+
+    points  – ndarray (P, 2): punkty wszystkich obrysów jeden po drugim
+    offsets – ndarray (K + 1,): obrys k to points[offsets[k]:offsets[k + 1]]
+
+a bounding boxy, szerokości i wysokości wszystkich K obrysów liczy jedno
+np.minimum.reduceat / np.maximum.reduceat na kolumnę:
+
+    sizes = outline_sizes([sc.hull for sc in wp.static_components])
+    sizes.min_dim[k]   -> min(szerokość, wysokość) obrysu k
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .outline import decode_outlines
+
+# boxes – (K, 4): xmin, xmax, ymin, ymax; pozostałe pola – (K,)
+BoxSizes = namedtuple("BoxSizes", "boxes width height min_dim max_dim")
+
+
+def pack_points(values):
+    """
+    Punkty (x1, y1), (x2, y2) segmentów każdej wartości Outline / Outlines
+    (wszystkie obrysy wartości razem) jako tablica poszarpana (points, offsets).
+    Wartość pusta lub None daje obrys bez punktów.
+    """
+    chunks = []
+    offsets = np.zeros(len(values) + 1, dtype=np.intp)
+    for k, value in enumerate(values):
+        count = 0
+        if value:
+            for coords, _ in decode_outlines(value):
+                chunks.append(coords.reshape(-1, 2))
+                count += 2 * len(coords)
+        offsets[k + 1] = offsets[k] + count
+    if not chunks:
+        return np.empty((0, 2), dtype=np.float64), offsets
+    return np.concatenate(chunks), offsets
+
+
+def bounding_boxes(points, offsets):
+    """
+    Bounding boxy (K, 4) – xmin, xmax, ymin, ymax – obrysów tablicy poszarpanej.
+    Obrys bez punktów daje (0, 0, 0, 0), jak dotychczasowe bounding_box.
+    """
+    counts = np.diff(offsets)
+    boxes = np.zeros((len(counts), 4), dtype=np.float64)
+    filled = counts > 0
+    if not filled.any():
+        return boxes
+    # Puste obrysy pomijamy – reduceat dla pustego przedziału zwróciłby punkt sąsiada
+    starts = offsets[:-1][filled]
+    xs = points[:, 0]
+    ys = points[:, 1]
+    boxes[filled, 0] = np.minimum.reduceat(xs, starts)
+    boxes[filled, 1] = np.maximum.reduceat(xs, starts)
+    boxes[filled, 2] = np.minimum.reduceat(ys, starts)
+    boxes[filled, 3] = np.maximum.reduceat(ys, starts)
+    return boxes
+
+
+def box_sizes(boxes):
+    """BoxSizes dla tablicy bounding boxów (K, 4)."""
+    width = np.abs(boxes[:, 1] - boxes[:, 0])
+    height = np.abs(boxes[:, 3] - boxes[:, 2])
+    return BoxSizes(boxes, width, height, np.minimum(width, height), np.maximum(width, height))
+
+
+def outline_sizes(values):
+    """BoxSizes dla listy wartości Outline / Outlines (po jednej pozycji na wartość)."""
+    return box_sizes(bounding_boxes(*pack_points(values)))
@@ -0,0 +1,80 @@
+"""
+Tablica geometrii gięcia z pamięcią podręczną (memoizacja).
+
+Detale powtarzają kilka kątów (90, 120, 135, ±45), grubości (2, 3, 4 mm)
+i promieni, a skrypty dla każdej flanszy od nowa liczyły tan(radians(...)),
+łuk neutralny i offset. Tutaj wartości dla klucza (kąt, promień wewn.,
+grubość, k) liczone są raz i trzymane w ograniczonym cache LRU:
+
+    geom = bend_geometry(90.0, 5.6326, 4.0)
+    geom.offset_factor   -> tan((180 - kąt) / 2)
+    geom.neutral_arc     -> kąt[rad] * (r + k * g)   (łuk po neutralnej)
+    geom.setback         -> (r + g) * offset_factor  (przyrost wymiaru out)
+
+    default_table().stats -> {"hits": ..., "misses": ...}
+
+Tablice NumPy (dld.dimensions.convert_dimensions) liczą te same wzory
+wektorowo – dla całej tablicy to szybsze niż wyszukiwanie klucz po kluczu.
+Znak kąta jest zachowany, jak w zastąpionych funkcjach skryptów – gięcia
+ujemne (np. angle_norm) liczone od wartości bezwzględnej wymagają abs(kąt)
+po stronie wywołującego.
+"""
+
+import functools
+import math
+from collections import namedtuple
+
+from .dimensions import DEFAULT_K_FACTOR
+
+BendGeometry = namedtuple("BendGeometry", "offset_factor neutral_arc setback")
+
+# Tyle różnych kombinacji (kąt, promień, grubość, k) mieści domyślna tablica
+DEFAULT_MAXSIZE = 1024
+
+
+def compute_bend_geometry(angle, radius, thickness, k_factor=DEFAULT_K_FACTOR):
+    """BendGeometry liczona bez cache (kąt w stopniach, ze znakiem)."""
+    offset_factor = math.tan(math.radians((180.0 - angle) / 2.0))
+    neutral_arc = math.radians(angle) * (radius + k_factor * thickness)
+    return BendGeometry(offset_factor, neutral_arc, (radius + thickness) * offset_factor)
+
+
+class BendGeometryCache:
+    """
+    Cache LRU wartości BendGeometry (functools.lru_cache – wyszukiwanie w C,
+    tańsze niż ponowne liczenie tan / radians).
+      - get(kąt, promień, grubość, k) – wartość z tablicy lub liczona i zapamiętana
+      - stats                         – liczniki: hits, misses (= liczba obliczeń)
+    Po przekroczeniu maxsize usuwany jest najdawniej używany klucz.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError(f"maxsize musi być dodatnie: {maxsize}")
+        self.maxsize = maxsize
+        self.get = functools.lru_cache(maxsize=maxsize)(compute_bend_geometry)
+
+    @property
+    def stats(self):
+        info = self.get.cache_info()
+        return {"hits": info.hits, "misses": info.misses}
+
+    def __len__(self):
+        return self.get.cache_info().currsize
+
+    def clear(self):
+        """Czyści tablicę i liczniki."""
+        self.get.cache_clear()
+
+
+_default_table = BendGeometryCache()
+
+
+def default_table():
+    """Wspólna tablica procesu."""
+    return _default_table
+
+
+def bend_geometry(angle, radius, thickness, k_factor=DEFAULT_K_FACTOR):
+    """BendGeometry z tablicy wspólnej procesu."""
+    return _default_table.get(angle, radius, thickness, k_factor)
@@ -0,0 +1,225 @@
+"""
+Rozwinięcie (długość prostki) wielu detali naraz z tablic współczynnika K.
+
+Skrypty miały K wpisane na sztywno (oblicz_prostke – 0.5, china.py – 0.33).
+Tutaj K pochodzi z tablicy kluczowanej materiałem (MaterialName), grubością
+i narzędziem (matryca z ToolConfiguration), a rozwinięcie liczone jest dla
+tysięcy detali jednym przebiegiem NumPy:
+
+    table = load_k_table("k_factors.csv")
+    report = blank_lengths(workpieces, table)
+    report.computed[i], report.from_file[i], report.delta[i]
+
+Rozwinięcie = suma odcinków prostych + suma naddatków gięć. Odcinek prosty
+to wymiar StaticComponentHull w poprzek krawędzi gięcia – krawędź wyznacza
+dłuższy bok ShorteningContour komponentu (mniejszy wymiar bounding boxa
+nie wystarcza: półka główna bywa dłuższa w poprzek gięć niż wzdłuż nich):
+
+    BA = (180 - |kąt|)[rad] * (r + K * g)
+
+kąt – kąt gięcia z pliku (AngleAfter, kąty > 180 jak ujemne), r – promień
+wewnętrzny strefy (ActualInnerRadius, a gdy go brak PreferredInnerRadius).
+Przy K = 0.5 BA to łuk VDeformableComponentHulls zapisany przez Delem,
+a rozwinięcie zgadza się z BendSequence/BlankLength (różnice < 0.0001 mm).
+
+Tablica K (CSV rozdzielany ";" lub "," albo .xlsx) ma kolumny KFACTOR_COLUMNS;
+puste pole Grubość / Narzędzie pasuje do każdej wartości. Bez tablicy
+(i bez zmiennej środowiskowej DLD_K_TABLE) obowiązuje DEFAULT_K_FACTOR.
+Opcjonalna kolumna RADIUS_COLUMN mówi, z jakim promieniem K zostało
+dopasowane (RADIUS_ACTUAL – domyślnie, RADIUS_PREFERRED – promień narzędzia,
+tablice z dld.calibration); blank_lengths liczy gięcie tym samym promieniem
+(bend_radius), więc K działa w modelu, w którym je wyznaczono.
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from .bbox import outline_sizes
+from .dimensions import DEFAULT_K_FACTOR, normalize_angles
+from .units import read_table
+
+KFACTOR_COLUMNS = ("Materiał", "Grubość", "Narzędzie", "K")
+
+# Kolumna podstawy promienia K i jej wartości (nazwy znaczników .dld)
+RADIUS_COLUMN = "Promień"
+RADIUS_ACTUAL = "ActualInnerRadius"
+RADIUS_PREFERRED = "PreferredInnerRadius"
+
+# names – nazwy detali; pozostałe pola – ndarray (N,), NaN gdy brak (lub 0) BlankLength w pliku
+BlankReport = namedtuple("BlankReport", "names computed from_file delta k_factors")
+
+
+def _material_key(material):
+    return (material or "").strip().casefold()
+
+
+def bend_radius(dc, basis=RADIUS_ACTUAL):
+    """
+    Promień wewnętrzny gięcia DeformableComponent w podstawie basis; brakujący
+    promień zastępuje drugi z pary (None, gdy brak obu).
+    """
+    first, second = dc.actual_inner_radius, dc.preferred_inner_radius
+    if basis == RADIUS_PREFERRED:
+        first, second = second, first
+    return first if first is not None else second
+
+
+def _thickness_key(thickness):
+    if thickness is None or thickness == "":
+        return None
+    return round(float(str(thickness).replace(",", ".")), 3)
+
+
+class KFactorTable:
+    """
+    Współczynniki K kluczowane (materiał, grubość, narzędzie).
+      - set(materiał, grubość, narzędzie, k, promień) – grubość None / narzędzie "" = dowolne,
+        promień – podstawa RADIUS_ACTUAL / RADIUS_PREFERRED, z którą K dopasowano
+      - lookup(materiał, grubość, narzędzie) – K najdokładniej pasującego wpisu:
+        (m, g, n) -> (m, g, *) -> (m, *, n) -> (m, *, *) -> default
+      - entry(...) – jak lookup, ale (K, podstawa promienia)
+    Nazwy materiałów porównywane są bez wielkości liter ("STAL CZARNA" = "Stal czarna").
+    """
+
+    def __init__(self, default=DEFAULT_K_FACTOR):
+        self.default = default
+        self._entries = {}
+
+    def set(self, material, thickness, tool, k_factor, radius=RADIUS_ACTUAL):
+        if radius not in (RADIUS_ACTUAL, RADIUS_PREFERRED):
+            raise ValueError(f"Nieznana podstawa promienia K: {radius!r}")
+        key = (_material_key(material), _thickness_key(thickness), (tool or "").strip())
+        self._entries[key] = (float(k_factor), radius)
+
+    def _find(self, material, thickness, tool):
+        m = _material_key(material)
+        g = _thickness_key(thickness)
+        t = (tool or "").strip()
+        for key in ((m, g, t), (m, g, ""), (m, None, t), (m, None, "")):
+            found = self._entries.get(key)
+            if found is not None:
+                return found
+        return None
+
+    def entry(self, material, thickness, tool=""):
+        found = self._find(material, thickness, tool)
+        return (self.default, RADIUS_ACTUAL) if found is None else found
+
+    def lookup(self, material, thickness, tool="", default=None):
+        found = self._find(material, thickness, tool)
+        if found is not None:
+            return found[0]
+        return self.default if default is None else default
+
+    def __len__(self):
+        return len(self._entries)
+
+    def rows(self):
+        """Wpisy tablicy jako krotki (materiał, grubość, narzędzie, K, promień) – grubość None = dowolna."""
+        return [key + value for key, value in self._entries.items()]
+
+
+def load_k_table(path, default=DEFAULT_K_FACTOR):
+    """
+    Wczytuje KFactorTable z pliku .csv (";" lub ",") albo .xlsx z kolumnami
+    KFACTOR_COLUMNS (i opcjonalnie RADIUS_COLUMN – puste pole = RADIUS_ACTUAL).
+    """
+    table = KFactorTable(default)
+    for row in read_table(path, KFACTOR_COLUMNS, "Tablica K"):
+        k_value = str(row["K"]).strip()
+        if not k_value:
+            continue
+        radius = str(row.get(RADIUS_COLUMN) or "").strip() or RADIUS_ACTUAL
+        table.set(row["Materiał"], row["Grubość"], row["Narzędzie"], k_value.replace(",", "."), radius)
+    return table
+
+
+_default_table = None
+
+
+def default_k_table():
+    """Tablica K procesu: plik ze zmiennej DLD_K_TABLE albo pusta tablica (DEFAULT_K_FACTOR)."""
+    global _default_table
+    if _default_table is None:
+        path = os.environ.get("DLD_K_TABLE")
+        _default_table = load_k_table(path) if path else KFactorTable()
+    return _default_table
+
+
+def straight_lengths(hulls, shortenings):
+    """
+    Odcinki proste (K,) komponentów statycznych: wymiar StaticComponentHull
+    w poprzek krawędzi gięcia wyznaczonej przez ShorteningContour (pierwszy
+    z komponentu, None gdy brak – wtedy mniejszy wymiar obrysu).
+    """
+    sizes = outline_sizes(hulls)
+    edge = outline_sizes(shortenings)
+    # krawędź gięcia pionowa (skrócenie węższe w x) -> odcinek prosty to szerokość obrysu
+    across = np.where(edge.width < edge.height, sizes.width, sizes.height)
+    return np.where(edge.max_dim > 0, across, sizes.min_dim)
+
+
+def bend_allowances(angles, radii, thickness, k_factors):
+    """Naddatki gięć BA = (180 - |kąt|)[rad] * (r + K * g) dla tablic (B,)."""
+    deflection = 180.0 - np.abs(normalize_angles(angles))
+    return np.radians(deflection) * (np.asarray(radii, dtype=np.float64)
+                                     + np.asarray(k_factors, dtype=np.float64)
+                                     * np.asarray(thickness, dtype=np.float64))
+
+
+def developed_lengths(flat, bend_part, angles, radii, thickness, k_factors):
+    """
+    Rozwinięcia N detali: flat (N,) – suma odcinków prostych detalu;
+    gięcia wszystkich detali jako tablice (B,), bend_part – numer detalu gięcia.
+    """
+    flat = np.asarray(flat, dtype=np.float64)
+    allowance = bend_allowances(angles, radii, thickness, k_factors)
+    return flat + np.bincount(np.asarray(bend_part, dtype=np.intp), weights=allowance,
+                              minlength=len(flat))
+
+
+def blank_lengths(workpieces, table=None):
+    """
+    BlankReport dla listy Workpiece (odczyt z BendSequence – narzędzia i BlankLength).
+    Obrysy i skrócenia wszystkich detali idą do dwóch wywołań outline_sizes,
+    K – po jednym wyszukaniu w tablicy na detal; promień gięć w podstawie
+    wpisu tablicy (bend_radius).
+    """
+    if table is None:
+        table = default_k_table()
+    n = len(workpieces)
+
+    hulls = []
+    shortenings = []
+    hull_part = []
+    bend_part = []
+    angles = []
+    radii = []
+    k_part = np.empty(n)
+    thickness = np.empty(n)
+    from_file = np.full(n, np.nan)
+    for i, wp in enumerate(workpieces):
+        k_part[i], basis = table.entry(wp.material, wp.thickness, wp.die)
+        thickness[i] = wp.thickness
+        if wp.blank_length:
+            # Delem zapisuje 0, gdy nie policzył rozwinięcia
+            from_file[i] = wp.blank_length
+        for sc in wp.static_components:
+            if sc.hull is not None:
+                hulls.append(sc.hull)
+                shortenings.append(sc.shortenings[0][1] if sc.shortenings else None)
+                hull_part.append(i)
+        for dc in wp.deformable_components:
+            bend_part.append(i)
+            angles.append(dc.bend_angle)
+            radii.append(bend_radius(dc, basis) or 0.0)
+
+    flat = np.zeros(n)
+    if hulls:
+        flat = np.bincount(np.asarray(hull_part, dtype=np.intp),
+                           weights=straight_lengths(hulls, shortenings), minlength=n)
+    bend_part = np.asarray(bend_part, dtype=np.intp)
+    computed = developed_lengths(flat, bend_part, angles, radii, thickness[bend_part], k_part[bend_part])
+    return BlankReport([wp.name for wp in workpieces], computed, from_file, computed - from_file, k_part)
@@ -0,0 +1,168 @@
+"""
+Trwały cache sparsowanych detali (Workpiece) w bazie SQLite.
+
+Wpis jest kluczowany ścieżką pliku i ważny, dopóki zgadzają się mtime i rozmiar
+pliku (opcjonalnie także <signature> z pliku). Ponowne przejście po
+niezmienionym folderze nie parsuje XML ani razu – obiekty są odtwarzane z bazy.
+
+Odczyt częściowy (sections=..., patrz dld.parser) też trafia do cache; wpis
+z pełnym odczytem obsługuje każde żądanie, a częściowy – tylko żądania
+o podzbiór jego sekcji.
+
+Domyślna lokalizacja bazy: ~/.dld_cache.sqlite3 (zmienna środowiskowa DLD_CACHE
+pozwala wskazać inną ścieżkę).
+"""
+
+import atexit
+import os
+import pickle
+import re
+import sqlite3
+
+from .parser import parse_workpiece
+
+# Podbijamy przy każdej zmianie modelu (dld.model) – stare wpisy są wtedy kasowane
+CACHE_VERSION = 5
+
+# Co ile zapisów robimy commit (pojedynczy commit na plik jest za wolny przy tysiącach plików)
+COMMIT_EVERY = 100
+
+_SIGNATURE_RE = re.compile(rb"<signature>\s*([^<]*?)\s*</signature>")
+
+
+def read_signature(data):
+    """Zwraca zawartość <signature> z surowych bajtów pliku (bez parsowania XML) lub ""."""
+    match = _SIGNATURE_RE.search(data)
+    if match is None:
+        return ""
+    return match.group(1).decode("ascii", "replace")
+
+
+def default_cache_path():
+    return os.environ.get("DLD_CACHE") or os.path.join(os.path.expanduser("~"), ".dld_cache.sqlite3")
+
+
+class WorkpieceCache:
+    """
+    Cache detali w jednym pliku SQLite.
+      - load(path)  – zwraca Workpiece z cache lub parsuje plik i zapisuje wynik
+      - stats       – liczniki: hits, misses (= liczba parsowań XML)
+    verify_signature=True dodatkowo czyta plik przy trafieniu i porównuje <signature>
+    (chroni przed plikami podmienionymi z zachowaniem mtime i rozmiaru).
+    """
+
+    def __init__(self, db_path=None, verify_signature=False):
+        self.db_path = db_path or default_cache_path()
+        self.verify_signature = verify_signature
+        self.stats = {"hits": 0, "misses": 0}
+        self._pending = 0
+        self._conn = sqlite3.connect(self.db_path)
+        self._init_schema()
+
+    def _init_schema(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS workpieces")
+            self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS workpieces ("
+            " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER,"
+            " signature TEXT, sections TEXT, data BLOB)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    @staticmethod
+    def _covers(cached_sections, sections):
+        """Czy wpis z sekcjami cached_sections ("" = cały plik) wystarcza dla żądania."""
+        if not cached_sections:
+            return True
+        return bool(sections) and set(sections) <= set(cached_sections.split(","))
+
+    def load(self, file_path, sections=None):
+        """
+        Zwraca Workpiece dla pliku .dld (sections – jak w parse_workpiece).
+        Rzuca ET.ParseError dla błędnego XML (błędne pliki nie są zapisywane w cache).
+        """
+        key = self._key(file_path)
+        st = os.stat(file_path)
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, signature, sections, data FROM workpieces WHERE path = ?", (key,)
+        ).fetchone()
+
+        if (row is not None and row[0] == st.st_mtime_ns and row[1] == st.st_size
+                and self._covers(row[3], sections)):
+            if not self.verify_signature:
+                self.stats["hits"] += 1
+                return pickle.loads(row[4])
+            with open(file_path, "rb") as f:
+                data = f.read()
+            if read_signature(data) == row[2]:
+                self.stats["hits"] += 1
+                return pickle.loads(row[4])
+
+        self.stats["misses"] += 1
+        wp = parse_workpiece(file_path, sections)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO workpieces (path, mtime_ns, size, signature, sections, data)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, st.st_mtime_ns, st.st_size, wp.signature, ",".join(wp.sections or ()),
+             pickle.dumps(wp, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.commit()
+        return wp
+
+    def invalidate(self, file_path):
+        """Usuwa wpis dla danego pliku."""
+        self._conn.execute("DELETE FROM workpieces WHERE path = ?", (self._key(file_path),))
+        self._pending += 1
+
+    def clear(self):
+        """Usuwa wszystkie wpisy."""
+        self._conn.execute("DELETE FROM workpieces")
+        self.commit()
+
+    def commit(self):
+        if self._pending:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self):
+        if self._conn is not None:
+            self.commit()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Wspólny cache procesu (tworzony przy pierwszym użyciu, zamykany przy wyjściu)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = WorkpieceCache()
+        atexit.register(_default_cache.close)
+    return _default_cache
+
+
+def load_workpiece(file_path, cache=None, sections=None):
+    """
+    Zwraca Workpiece dla pliku .dld, korzystając z cache (domyślnie wspólnego).
+    To jest zalecany punkt wejścia dla skryptów przetwarzających foldery;
+    skrypty geometryczne podają sections=GEOMETRY.
+    """
+    if cache is None:
+        cache = default_cache()
+    return cache.load(file_path, sections)
@@ -0,0 +1,262 @@
+"""
+Kalibracja współczynników K z plików .dld.
+
+Każdy plik produkcyjny ma geometrię detalu i rozwinięcie BlankLength. Z
+rozwinięcia dld.blank:
+
+    L = Σ odcinków + Σ (180 - |kąt|)[rad] * r  +  K * g * Σ (180 - |kąt|)[rad]
+
+więc dla detalu y = K * x, gdzie x = g * Σ kątów ugięcia [rad], a y to
+L minus odcinki i łuki po promieniu wewnętrznym r. K grupy (materiał,
+grubość, matryca) to rozwiązanie najmniejszych kwadratów K = Σ xy / Σ x².
+Oprócz grup pełnych liczone są grupy (materiał, grubość) i (materiał) –
+wiersze zapasowe dla KFactorTable.lookup.
+
+Promień. BlankLength nie jest pomiarem – sterownik liczy je własnym
+modelem K z promieniem ActualInnerRadius, który też sam wyznacza. Dopasowanie
+do tej pary zwraca z powrotem K sterownika (≈ 0,5 w każdej grupie), więc
+r to promień narzędzia (CALIBRATION_RADIUS = PreferredInnerRadius, przez
+dld.blank.bend_radius). dld.blank.blank_lengths domyślnie liczy z
+ActualInnerRadius, dlatego tablica zapisuje podstawę promienia w kolumnie
+RADIUS_COLUMN, a blank_lengths liczy wpisy z tej tablicy tym samym
+promieniem co kalibracja. check_reproduction sprawdza, że tablica po
+zapisie i wczytaniu odtwarza w blank_lengths rozwinięcia próbek.
+
+Zakres. K spoza K_RANGE (0, 1) nie ma sensu fizycznego – to znak, że model
+nie pasuje do danych grupy (np. różnica promienia sterownika i narzędzia
+trafia w K). Takie dopasowania fit_k_factors zwraca do wglądu, ale
+fits_table i write_k_table ich nie przyjmują (in_range).
+
+Źródło danych. Z BlankLength wychodzi K, które odtwarza rozwinięcia
+sterownika, a nie kalibracja na blasze. Kalibracja procesu wymaga
+zmierzonych długości wykrojów (load_blank_lengths) – próbki dostają wtedy
+L z pomiaru, a kolumna "Źródło" tablicy mówi, skąd pochodzi każde K.
+
+    measured = load_blank_lengths("pomiary.csv")    # opcjonalnie
+    samples = collect_samples(paths, workers=8, measured=measured)
+    fits = fit_k_factors(samples)
+    write_k_table(fits, "tablica_k.csv")             # -> load_k_table / DLD_K_TABLE
+    errors = check_reproduction(samples, load_k_table("tablica_k.csv"))
+"""
+
+import csv
+import os
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from .blank import (
+    KFACTOR_COLUMNS, RADIUS_COLUMN, RADIUS_PREFERRED, KFactorTable, bend_radius, blank_lengths, straight_lengths,
+)
+from .dimensions import normalize_angles
+from .parser import parse_workpiece
+from .units import read_table
+
+# path – plik .dld; flat – suma odcinków prostych; angles / radii – krotki po gięciu
+# detalu (radii w podstawie CALIBRATION_RADIUS); source – SOURCE_DELEM albo SOURCE_MEASURED
+CalibrationSample = namedtuple(
+    "CalibrationSample", "path name material thickness tool flat angles radii blank_length source")
+
+# thickness None / tool "" – grupa zapasowa (dowolna grubość / matryca);
+# rms – średni kwadratowy błąd rozwinięcia grupy [mm] przy dopasowanym K;
+# source – źródła rozwinięć próbek grupy
+KFactorFit = namedtuple("KFactorFit", "material thickness tool k_factor samples rms source")
+
+FIT_COLUMNS = KFACTOR_COLUMNS + (RADIUS_COLUMN, "Próbek", "RMS [mm]", "Źródło")
+
+# Promień gięć, z którym dopasowywane jest K (zapisywany w tablicy)
+CALIBRATION_RADIUS = RADIUS_PREFERRED
+
+# Przedział K przyjmowany do tablicy (granice wyłączone)
+K_RANGE = (0.0, 1.0)
+
+# Skąd pochodzi długość rozwinięcia próbki
+SOURCE_DELEM = "BlankLength (Delem, nie pomiar)"
+SOURCE_MEASURED = "pomiar"
+
+# Kolumny pliku zmierzonych wykrojów (load_blank_lengths)
+MEASURED_COLUMNS = ("Plik", "Długość [mm]")
+
+# Tyle plików dostaje naraz jeden proces (mniej komunikacji między procesami)
+CHUNK_SIZE = 16
+
+
+def extract_sample(path, measured=None):
+    """
+    CalibrationSample z pliku .dld albo None, gdy plik nie nadaje się do
+    kalibracji: błędny XML, brak gięć, brak (lub 0) rozwinięcia. measured – zmierzona długość wykroju [mm];
+    None – BlankLength sterownika (SOURCE_DELEM).
+    """
+    try:
+        wp = parse_workpiece(path)
+    except ET.ParseError:
+        return None
+    blank_length = wp.blank_length if measured is None else measured
+    if not blank_length or not wp.deformable_components:
+        return None
+
+    statics = [sc for sc in wp.static_components if sc.hull is not None]
+    flat = 0.0
+    if statics:
+        flat = float(straight_lengths([sc.hull for sc in statics],
+                                      [sc.shortenings[0][1] if sc.shortenings else None
+                                       for sc in statics]).sum())
+    angles = tuple(dc.bend_angle for dc in wp.deformable_components)
+    # ActualInnerRadius policzył sterownik razem z BlankLength – dopasowanie
+    # do niego odtwarza tylko jego własne K (opis modułu)
+    radii = tuple(bend_radius(dc, CALIBRATION_RADIUS) or 0.0 for dc in wp.deformable_components)
+    return CalibrationSample(path, wp.name, wp.material, wp.thickness, wp.die, flat, angles, radii,
+                             blank_length, SOURCE_DELEM if measured is None else SOURCE_MEASURED)
+
+
+def load_blank_lengths(path):
+    """
+    Zmierzone długości wykrojów z pliku .csv (";" lub ",") albo .xlsx
+    z kolumnami MEASURED_COLUMNS: {nazwa pliku bez .dld: długość [mm]}.
+    Wiersze bez długości są pomijane.
+    """
+    lengths = {}
+    for row in read_table(path, MEASURED_COLUMNS, "Pomiary wykrojów"):
+        value = str(row["Długość [mm]"]).strip()
+        if not value:
+            continue
+        name = os.path.splitext(os.path.basename(str(row["Plik"]).strip()))[0]
+        lengths[name] = float(value.replace(",", "."))
+    return lengths
+
+
+def collect_samples(paths, workers=None, measured=None):
+    """
+    Próbki z listy plików; pliki bez danych do kalibracji są pomijane.
+    workers – liczba procesów (None – liczba rdzeni, 1 – bez procesów).
+    measured – słownik z load_blank_lengths: próbki tylko z plików
+    o zmierzonym wykroju (bez mieszania pomiarów z BlankLength sterownika).
+    """
+    if measured is None:
+        lengths = repeat(None)
+    else:
+        names = [os.path.splitext(os.path.basename(p))[0] for p in paths]
+        paths = [p for p, n in zip(paths, names) if n in measured]
+        lengths = [measured[n] for n in names if n in measured]
+    if workers == 1 or len(paths) <= CHUNK_SIZE:
+        samples = map(extract_sample, paths, lengths)
+        return [s for s in samples if s is not None]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [s for s in pool.map(extract_sample, paths, lengths, chunksize=CHUNK_SIZE) if s is not None]
+
+
+def _regression(samples):
+    """Tablice x, y (N,) regresji y = K * x dla próbek."""
+    counts = [len(s.angles) for s in samples]
+    part = np.repeat(np.arange(len(samples)), counts)
+    deflection = np.radians(180.0 - np.abs(normalize_angles([a for s in samples for a in s.angles])))
+    radii = np.array([r for s in samples for r in s.radii], dtype=np.float64)
+    thickness = np.array([s.thickness for s in samples], dtype=np.float64)
+
+    total_deflection = np.bincount(part, weights=deflection, minlength=len(samples))
+    inner_arcs = np.bincount(part, weights=deflection * radii, minlength=len(samples))
+    flat = np.array([s.flat for s in samples], dtype=np.float64)
+    blank = np.array([s.blank_length for s in samples], dtype=np.float64)
+    return thickness * total_deflection, blank - flat - inner_arcs
+
+
+def fit_k_factors(samples, min_samples=1):
+    """
+    KFactorFit dla grup (materiał, grubość, matryca), (materiał, grubość)
+    i (materiał). Grupy z mniej niż min_samples próbkami są pomijane.
+    """
+    if not samples:
+        return []
+    x, y = _regression(samples)
+    usable = x > 0
+    sample_sources = [s.source for s, ok in zip(samples, usable) if ok]
+    material = [(s.material or "").strip() for s in samples]
+    keys = {
+        "full": [(m.casefold(), s.thickness, (s.tool or "").strip()) for m, s in zip(material, samples)],
+        "thickness": [(m.casefold(), s.thickness, "") for m, s in zip(material, samples)],
+        "material": [(m.casefold(), None, "") for m in material],
+    }
+    # nazwa materiału do tablicy – w pisowni pierwszego pliku grupy
+    spelling = {}
+    for m in material:
+        spelling.setdefault(m.casefold(), m)
+
+    fits = []
+    for level in ("full", "thickness", "material"):
+        level_keys = [k for k, ok in zip(keys[level], usable) if ok]
+        if not level_keys:
+            continue
+        groups = {}
+        index = np.array([groups.setdefault(k, len(groups)) for k in level_keys], dtype=np.intp)
+        gx = x[usable]
+        gy = y[usable]
+        sxy = np.bincount(index, weights=gx * gy)
+        sxx = np.bincount(index, weights=gx * gx)
+        k_factors = sxy / sxx
+        residual = gy - k_factors[index] * gx
+        count = np.bincount(index)
+        rms = np.sqrt(np.bincount(index, weights=residual * residual) / count)
+        sources = [set() for _ in groups]
+        for g, source in zip(index, sample_sources):
+            sources[g].add(source)
+        for (m, thickness, tool), g in groups.items():
+            if count[g] < min_samples:
+                continue
+            fits.append(KFactorFit(spelling[m], thickness, tool, float(k_factors[g]),
+                                   int(count[g]), float(rms[g]), ", ".join(sorted(sources[g]))))
+    return fits
+
+
+def in_range(fit):
+    """Czy K dopasowania leży w K_RANGE (tylko takie trafiają do tablicy)."""
+    low, high = K_RANGE
+    return low < fit.k_factor < high
+
+
+def fits_table(fits, default=None):
+    """KFactorTable z wyników dopasowania w K_RANGE (bez zapisu do pliku)."""
+    table = KFactorTable() if default is None else KFactorTable(default)
+    for fit in fits:
+        if in_range(fit):
+            table.set(fit.material, fit.thickness, fit.tool, fit.k_factor, CALIBRATION_RADIUS)
+    return table
+
+
+def write_k_table(fits, path):
+    """
+    Zapisuje wyniki w K_RANGE do .csv (";") albo .xlsx – format czytany przez
+    load_k_table, z podstawą promienia CALIBRATION_RADIUS. Zwraca listę
+    odrzuconych dopasowań (K poza K_RANGE).
+    """
+    rows = [(f.material, "" if f.thickness is None else f"{f.thickness:g}", f.tool,
+             round(f.k_factor, 4), CALIBRATION_RADIUS, f.samples, round(f.rms, 4), f.source)
+            for f in fits if in_range(f)]
+    rejected = [f for f in fits if not in_range(f)]
+    if path.lower().endswith((".xlsx", ".xls")):
+        import pandas as pd  # tylko dla tablic w Excelu
+        pd.DataFrame(rows, columns=FIT_COLUMNS).to_excel(path, index=False)
+        return rejected
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(FIT_COLUMNS)
+        writer.writerows(rows)
+    return rejected
+
+
+def check_reproduction(samples, table):
+    """
+    Różnice [mm] (N,) rozwinięć próbek policzonych przez dld.blank.blank_lengths
+    z tablicą table od rozwinięć, do których ją dopasowano (BlankLength albo
+    pomiar). Dla tablicy z write_k_table / fits_table różnice to reszty
+    dopasowania – większe oznaczają, że tablica działa w innym modelu niż
+    kalibracja (albo grupa dostała wiersz zapasowy po odrzuceniu K).
+    """
+    workpieces = [parse_workpiece(s.path) for s in samples]
+    computed = blank_lengths(workpieces, table).computed
+    return computed - np.array([s.blank_length for s in samples], dtype=np.float64)
@@ -0,0 +1,177 @@
+"""
+Łańcuch flansz i gięć detalu (topologia z Left/RightStaticComponent).
+
+Każda strefa gięcia <VDeformableComponent> podaje flansze, które łączy
+(LeftStaticComponent, RightStaticComponent). build_chain składa z tego graf
+raz na detal i przechodzi go od końca łańcucha, więc dla każdej flanszy
+znane są jej własne gięcia – wymiary out / in / neutralny liczy się z nich,
+a nie z pierwszego gięcia detalu:
+
+    chain = build_chain(wp)
+    chain.flanges                      -> ["MainPlane", "SC00", "SC01", ...]
+    dims = chain.dimensions({"MainPlane": 111.0, ...}, wp.thickness)
+    dims["SC00"].out                   -> x(zewn.) + offsety obu sąsiednich gięć
+
+Wzory (dla każdego sąsiedniego gięcia flanszy):
+    out     += (r + g) * tan((180 - |kąt|) / 2)
+    in      += łuk / 2          (łuk – mniejszy wymiar bounding boxa Hulls)
+    neutral += kąt[rad] * (r + k * g) / 2
+"""
+
+from collections import namedtuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .bbox import outline_sizes
+from .bendtable import bend_geometry
+from .dimensions import DEFAULT_K_FACTOR
+
+FlangeDimensions = namedtuple("FlangeDimensions", "length out inner neutral")
+
+
+def normalize_angle(angle_deg):
+    """Kąt > 180 jako ujemny z zakresu [-180, 180] (225 -> -135)."""
+    if angle_deg > 180:
+        return angle_deg - 360
+    return angle_deg
+
+
+@dataclass
+class ChainBend:
+    """
+    Strefa gięcia w łańcuchu:
+      - left / right – nazwy łączonych flansz
+      - angle        – kąt gięcia (DeformableComponent.bend_angle)
+      - radius       – PreferredInnerRadius strefy (None = promień detalu)
+      - arc          – mniejszy wymiar bounding boxa VDeformableComponentHulls
+    """
+    name: str
+    left: str
+    right: str
+    angle: float = 0.0
+    radius: Optional[float] = None
+    arc: float = 0.0
+
+    @property
+    def angle_norm(self):
+        return normalize_angle(self.angle)
+
+    def other(self, flange):
+        """Flansza po drugiej stronie gięcia."""
+        return self.right if flange == self.left else self.left
+
+
+@dataclass
+class FlangeChain:
+    """
+    flanges  – flansze w kolejności przejścia (od końca łańcucha)
+    bends    – gięcia w kolejności przejścia (bends[i] łączy kolejne flansze prostego łańcucha)
+    adjacent – flansza -> nazwy jej gięć
+    closed   – profil zamknięty (graf z cyklem)
+    branched – flansza z więcej niż dwoma gięciami (np. skrzynka)
+    """
+    flanges: List[str] = field(default_factory=list)
+    bends: List[ChainBend] = field(default_factory=list)
+    adjacent: Dict[str, List[str]] = field(default_factory=dict)
+    closed: bool = False
+    branched: bool = False
+    _by_name: Dict[str, ChainBend] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._by_name = {b.name: b for b in self.bends}
+
+    def bend(self, name):
+        """Gięcie o podanej nazwie (lub None)."""
+        return self._by_name.get(name)
+
+    def bends_of(self, flange):
+        """Gięcia sąsiadujące z flanszą (w kolejności z pliku)."""
+        return [self._by_name[name] for name in self.adjacent.get(flange, ())]
+
+    def dimensions(self, lengths, thickness, radius=None, k_factor=DEFAULT_K_FACTOR):
+        """
+        Wymiary każdej flanszy z lengths {flansza: x(zewn.)} – FlangeDimensions
+        z jej własnych gięć. Flansze bez długości są pomijane.
+        radius – promień dla gięć bez własnego PreferredInnerRadius.
+        """
+        # Geometria każdego gięcia z tablicy (dld.bendtable), potem tylko sumy po sąsiadach flansz;
+        # przyrosty nie zależą od kierunku gięcia – kąt bez znaku
+        offsets = {}
+        for b in self.bends:
+            r = b.radius if b.radius is not None else (radius or 0.0)
+            geom = bend_geometry(abs(b.angle_norm), r, thickness, k_factor)
+            offsets[b.name] = (geom.setback, b.arc / 2.0, geom.neutral_arc / 2.0)
+        result = {}
+        for flange in self.flanges:
+            length = lengths.get(flange)
+            if length is None:
+                continue
+            d_out = d_in = d_neutral = 0.0
+            for name in self.adjacent.get(flange, ()):
+                d_out += offsets[name][0]
+                d_in += offsets[name][1]
+                d_neutral += offsets[name][2]
+            result[flange] = FlangeDimensions(length, length + d_out, length + d_in, length + d_neutral)
+        return result
+
+
+def build_chain(wp):
+    """
+    Buduje FlangeChain detalu: graf flansz (StaticComponent) połączonych
+    gięciami (VDeformableComponent z Left/RightStaticComponent), przechodzony
+    raz – O(liczba komponentów). Start: MainPlane, jeśli jest końcem łańcucha,
+    inaczej pierwsza flansza z jednym gięciem (dla profilu zamkniętego – MainPlane).
+    Gięcia bez obu flansz w detalu nie wchodzą do łańcucha.
+    """
+    names = [sc.name for sc in wp.static_components]
+    known = set(names)
+    adjacent = {name: [] for name in names}
+
+    zones = [dc for dc in wp.deformable_components
+             if dc.left_static in known and dc.right_static in known]
+    arcs = outline_sizes([dc.hulls for dc in zones]).min_dim.tolist()
+    bends = {}
+    for dc, arc in zip(zones, arcs):
+        bends[dc.name] = ChainBend(dc.name, dc.left_static, dc.right_static,
+                                   dc.bend_angle, dc.preferred_inner_radius, arc)
+        adjacent[dc.left_static].append(dc.name)
+        adjacent[dc.right_static].append(dc.name)
+
+    main = wp.main_plane if wp.main_plane in known else "MainPlane"
+    ends = [name for name in names if len(adjacent[name]) == 1]
+    if main in ends:
+        start = main
+    elif ends:
+        start = ends[0]
+    else:
+        start = main if main in known else (names[0] if names else None)
+
+    # Przejście w głąb (stos), każda flansza i gięcie odwiedzane raz
+    order = []
+    chain_bends = []
+    visited = set()
+    used = set()
+    roots = [start] + names if start is not None else names
+    for root in roots:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [root]
+        while stack:
+            flange = stack.pop()
+            order.append(flange)
+            for name in reversed(adjacent[flange]):
+                if name in used:
+                    continue
+                nxt = bends[name].other(flange)
+                if nxt in visited:
+                    continue
+                used.add(name)
+                visited.add(nxt)
+                chain_bends.append(bends[name])
+                stack.append(nxt)
+
+    closed = len(used) < len(bends)
+    chain_bends += [b for name, b in bends.items() if name not in used]
+    branched = any(len(v) > 2 for v in adjacent.values())
+    return FlangeChain(order, chain_bends, adjacent, closed, branched)
@@ -0,0 +1,358 @@
+"""
+Plan cięcia pasów (1D cutting stock) dla detali ciętych z pasa blachy.
+
+Detal gięty z pasa o szerokości równej długości linii gięcia potrzebuje
+tylko odcinka pasa o długości rozwinięcia (dld.blank). Detale grupowane są
+po (grubość, szerokość pasa), a odcinki każdej grupy rozkładane na pasy
+o standardowej długości tak, by zużyć jak najmniej pasów:
+
+  1. rozwiązanie startowe – lepsze z first-fit decreasing (FFD) i procedury
+     sekwencyjnej: wzór pasa o największym wypełnieniu z pozostałego
+     zapotrzebowania (programowanie dynamiczne subset-sum w NumPy na siatce
+     RESOLUTION mm), powtarzany, ile pozwala zapotrzebowanie,
+  2. poprawa w budżecie czasu: odcinki kilku pasów (najgorzej wypełniony
+     i dobrane losowo) układane są od nowa tym samym programowaniem
+     dynamicznym – zmiana przyjmowana, gdy ubywa pasów albo odpad skupia
+     się w mniejszej liczbie pasów. Koniec po budżecie czasu, po
+     osiągnięciu dolnego ograniczenia ⌈Σ długości / pas⌉ albo po MAX_STALL
+     próbach z rzędu bez zmiany.
+
+Budżet czasu dotyczy całego wywołania cut_plans: każda grupa i długość
+pasa dostaje równą część pozostałego czasu, a czas niewykorzystany (plan
+na dolnym ograniczeniu, brak postępu) przechodzi na następne. Odcinki
+dłuższe niż każdy pas nie przerywają planu – trafiają do CutPlan.unplaced.
+
+    parts = strip_parts(workpieces)                 # StripPart z rozwinięć
+    plans = cut_plans(parts, quantities, stock_lengths=(3000,), kerf=0.0)
+    for (thickness, width), plan in plans.items():
+        plan.strips, plan.utilisation, plan.patterns, plan.unplaced
+
+Długości odcinków zaokrąglane są w górę, a długość pasa w dół do siatki
+RESOLUTION – plan nigdy nie przekracza pasa.
+"""
+
+import math
+import random
+import time
+from collections import Counter, namedtuple
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from .blank import blank_lengths
+from .flat import flat_patterns
+
+# Standardowe długości pasów [mm] (długie boki arkuszy 1000x2000 ... 1500x3000)
+STANDARD_LENGTHS = (2000, 2500, 3000)
+
+# Siatka programowania dynamicznego [mm]
+RESOLUTION = 0.1
+
+# Budżet czasu na poprawę planów całego wywołania cut_plans (solve_cutting – jednego planu) [s]
+DEFAULT_TIME_BUDGET = 0.5
+
+# Poprawa planu kończy się po tylu próbach z rzędu bez zmiany
+MAX_STALL = 200
+
+# Tyle pasów naraz układa od nowa poprawa planu (improve)
+MAX_REPACK = 6
+
+# Szerokość pasa w kluczu grupy zaokrąglana do [miejsc po przecinku]
+WIDTH_DECIMALS = 1
+
+# name – nazwa detalu; width – szerokość pasa (długość linii gięcia); length – rozwinięcie [mm]
+StripPart = namedtuple("StripPart", "name thickness width length")
+
+# cuts – ((nazwa, długość), ...) odcinki jednego pasa; count – ile pasów tak ciąć; waste – odpad pasa [mm]
+CutPattern = namedtuple("CutPattern", "cuts count waste")
+
+
+@dataclass(frozen=True)
+class CutPlan:
+    """
+    Plan cięcia jednej grupy (grubość, szerokość pasa) na pasy stock_length.
+      - patterns    – CutPattern, od najczęściej powtarzanego
+      - demand      – suma długości odcinków [mm]
+      - lower_bound – dolne ograniczenie liczby pasów
+      - method      – rozwiązanie startowe "FFD" albo "DP" (procedura sekwencyjna),
+                      z dopiskiem "+DP", gdy poprawa planu zmniejszyła liczbę pasów
+      - unplaced    – ((nazwa, długość), ...) sztuki dłuższe niż każdy pas (poza planem)
+    """
+    thickness: float
+    width: float
+    stock_length: float
+    patterns: Tuple[CutPattern, ...] = ()
+    demand: float = 0.0
+    lower_bound: int = 0
+    method: str = ""
+    unplaced: Tuple[Tuple[str, float], ...] = ()
+
+    @property
+    def strips(self):
+        """Liczba pasów."""
+        return sum(p.count for p in self.patterns)
+
+    @property
+    def utilisation(self):
+        """Σ długości odcinków / Σ długości pasów (0..1)."""
+        return self.demand / (self.strips * self.stock_length) if self.strips else 0.0
+
+    @property
+    def waste(self):
+        """Odpad wszystkich pasów [mm] (z rzazami)."""
+        return self.strips * self.stock_length - self.demand
+
+    @property
+    def optimal(self):
+        """True, gdy liczba pasów równa dolnemu ograniczeniu."""
+        return self.strips == self.lower_bound
+
+
+def strip_parts(workpieces, table=None, cache=None):
+    """
+    StripPart dla listy Workpiece: długość – rozwinięcie blank_lengths
+    (K z tablicy), szerokość – wymiar rozwinięcia (dld.flat) wzdłuż
+    pierwszej linii gięcia; detal bez gięć – dłuższy wymiar rozwinięcia.
+    """
+    report = blank_lengths(workpieces, table)
+    parts = []
+    for wp, pattern, length in zip(workpieces, flat_patterns(workpieces, cache), report.computed):
+        width = 0.0
+        if pattern.bend_lines and len(pattern.outline):
+            start, end = pattern.bend_lines[0][1]
+            direction = (end - start) / np.hypot(*(end - start))
+            along = pattern.outline @ direction
+            width = float(along.max() - along.min())
+        elif len(pattern.outline):
+            xmin, ymin, xmax, ymax = pattern.bounds
+            width = max(xmax - xmin, ymax - ymin)
+        parts.append(StripPart(wp.name, wp.thickness, width, float(length)))
+    return parts
+
+
+def _units(length, up):
+    value = length / RESOLUTION
+    # 1e-6 – szum zmiennoprzecinkowy nie przesuwa wartości o oczko siatki
+    return int(math.ceil(value - 1e-6)) if up else int(math.floor(value + 1e-6))
+
+
+def first_fit_decreasing(sizes, capacity):
+    """Pasy (listy indeksów odcinków) z first-fit decreasing; sizes, capacity w oczkach siatki."""
+    bars = []
+    free = []
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+        for b, room in enumerate(free):
+            if sizes[i] <= room:
+                bars[b].append(i)
+                free[b] -= sizes[i]
+                break
+        else:
+            bars.append([i])
+            free.append(capacity - sizes[i])
+    return bars
+
+
+def _best_fill(sizes, demand, capacity, order):
+    """
+    Liczby sztuk typów (wektor) najlepiej wypełniające pas: subset-sum na
+    siatce z podziałem binarnym sztuk (1, 2, 4, ...) w kolejności order.
+    """
+    chunks = []
+    for t in order:
+        count = min(int(demand[t]), capacity // sizes[t])
+        k = 1
+        while count > 0:
+            take = min(k, count)
+            chunks.append((t, take, take * sizes[t]))
+            count -= take
+            k *= 2
+    reachable = np.zeros(capacity + 1, dtype=bool)
+    reachable[0] = True
+    first = []
+    for _, _, size in chunks:
+        new = np.zeros_like(reachable)
+        new[size:] = reachable[:-size]
+        new &= ~reachable
+        reachable |= new
+        first.append(new)
+    position = int(np.flatnonzero(reachable)[-1])
+    counts = np.zeros(len(sizes), dtype=np.int64)
+    for (t, take, size), new in zip(reversed(chunks), reversed(first)):
+        if position and new[position]:
+            counts[t] += take
+            position -= size
+    return counts
+
+
+def sequential_patterns(sizes, demand, capacity, rng=None):
+    """
+    Procedura sekwencyjna: lista (liczby sztuk typów, liczba pasów).
+    rng – losowa kolejność typów (inne rozstrzyganie remisów), None – od najdłuższych.
+    """
+    demand = np.array(demand, dtype=np.int64)
+    order = sorted(range(len(sizes)), key=lambda t: -sizes[t])
+    patterns = []
+    while demand.any():
+        if rng is not None:
+            rng.shuffle(order)
+        counts = _best_fill(sizes, demand, capacity, order)
+        used = counts > 0
+        repeat = int((demand[used] // counts[used]).min())
+        patterns.append((counts, repeat))
+        demand -= counts * repeat
+    return patterns
+
+
+def improve(bars, sizes, capacity, lower_bound, deadline, rng):
+    """
+    Poprawa planu do terminu deadline (time.perf_counter), do dolnego
+    ograniczenia albo do MAX_STALL prób z rzędu bez zmiany: odcinki kilku pasów z największym odpadem (i losowo
+    dobranych innych) układane są od nowa pas po pasie największym
+    wypełnieniem (_best_fill). Zmiana przyjmowana, gdy ubywa pasów albo
+    odpad skupia się w mniejszej liczbie pasów (rośnie Σ wypełnień²).
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    order = list(range(len(sizes)))
+    # pasy jako lista wierszy z wypełnieniami – zamiana pasów bez kopiowania całej macierzy
+    rows = list(bars)
+    fills = [int(row @ sizes) for row in rows]
+    stall = 0
+    while len(rows) > lower_bound and stall < MAX_STALL and time.perf_counter() < deadline:
+        stall += 1
+        fill = np.array(fills)
+        ranked = list(np.argsort(fill))
+        chosen = [ranked[0]]
+        # na zmianę pasy z dużym odpadem i dowolne pasy planu
+        candidates = ranked[1:2 * MAX_REPACK] if rng.random() < 0.5 else ranked[1:]
+        rng.shuffle(candidates)
+        for b in candidates:
+            if len(chosen) >= MAX_REPACK or (capacity * len(chosen) - fill[chosen].sum() >= capacity
+                                             and len(chosen) > 1):
+                break
+            chosen.append(b)
+        demand = np.sum([rows[b] for b in chosen], axis=0)
+        rng.shuffle(order)
+        repacked = []
+        while demand.any():
+            counts = _best_fill(sizes, demand, capacity, order)
+            demand -= counts
+            repacked.append(counts)
+        new_fill = np.array(repacked) @ sizes
+        if len(repacked) < len(chosen) or (len(repacked) == len(chosen)
+                                           and (new_fill ** 2).sum() > (fill[chosen] ** 2).sum()):
+            removed = set(chosen)
+            rows = [row for b, row in enumerate(rows) if b not in removed] + repacked
+            fills = [f for b, f in enumerate(fills) if b not in removed] + new_fill.tolist()
+            stall = 0
+    return np.array(rows).reshape(-1, len(sizes))
+
+
+def solve_cutting(items, stock_length, kerf=0.0, time_budget=DEFAULT_TIME_BUDGET, seed=0, deadline=None):
+    """
+    CutPlan (bez klucza grupy) dla items – lista (nazwa, długość, ilość)
+    na pasach stock_length; kerf – szerokość rzazu doliczana do każdego
+    odcinka (ostatni odcinek pasa też – zapas na cięcie czołowe).
+    deadline – termin poprawy (time.perf_counter) zamiast time_budget.
+    """
+    items = [(name, float(length), int(quantity)) for name, length, quantity in items
+             if quantity > 0 and length > 0]
+    capacity = _units(stock_length, up=False)
+    sizes = [_units(length + kerf, up=True) for _, length, _ in items]
+    too_long = [name for (name, _, _), size in zip(items, sizes) if size > capacity]
+    if too_long:
+        raise ValueError(f"Odcinki dłuższe niż pas {stock_length:g} mm: {', '.join(too_long)}")
+    demand = [quantity for _, _, quantity in items]
+    total = sum(length * quantity for _, length, quantity in items)
+    if not items:
+        return CutPlan(0.0, 0.0, float(stock_length))
+    # ⌈Σ / pas⌉; odcinki dłuższe niż pół pasa nie dzielą pasa między siebie;
+    # jeden typ – dokładnie ⌈ilość / sztuk na pas⌉
+    lower_bound = max(math.ceil(sum(s * q for s, q in zip(sizes, demand)) / capacity),
+                      sum(q for s, q in zip(sizes, demand) if 2 * s > capacity))
+    if len(items) == 1:
+        lower_bound = math.ceil(demand[0] / (capacity // sizes[0]))
+
+    # rozwiązanie startowe: lepsze z FFD i procedury sekwencyjnej; wiersz = pas, kolumny = typy
+    pieces = [t for t, quantity in enumerate(demand) for _ in range(quantity)]
+    bars = np.array([np.bincount([pieces[i] for i in bar], minlength=len(items))
+                     for bar in first_fit_decreasing([sizes[t] for t in pieces], capacity)],
+                    dtype=np.int64).reshape(-1, len(items))
+    method = "FFD"
+    patterns = sequential_patterns(sizes, demand, capacity)
+    if sum(repeat for _, repeat in patterns) < len(bars):
+        bars = np.repeat(np.array([counts for counts, _ in patterns]),
+                         [repeat for _, repeat in patterns], axis=0)
+        method = "DP"
+    start = len(bars)
+    if deadline is None:
+        deadline = time.perf_counter() + time_budget
+    bars = improve(bars, sizes, capacity, lower_bound, deadline, random.Random(seed))
+    if len(bars) < start:
+        method += "+DP"
+
+    merged = Counter()
+    for counts in bars:
+        cuts = tuple(sorted(((items[t][0], items[t][1]) for t in np.flatnonzero(counts)
+                             for _ in range(counts[t])), key=lambda cut: (-cut[1], cut[0])))
+        merged[cuts] += 1
+    patterns = tuple(sorted(
+        (CutPattern(cuts, count, stock_length - sum(length + kerf for _, length in cuts))
+         for cuts, count in merged.items()),
+        key=lambda p: (-p.count, p.waste)))
+    return CutPlan(0.0, 0.0, float(stock_length), patterns, total, lower_bound, method)
+
+
+def cut_plans(parts, quantities=None, stock_lengths=STANDARD_LENGTHS, kerf=0.0,
+              time_budget=DEFAULT_TIME_BUDGET, seed=0):
+    """
+    CutPlan dla grup (grubość, szerokość pasa) z listy StripPart.
+    quantities – ilości sztuk (lista równoległa do parts, None – po 1 szt.).
+    Dla każdej grupy wybierana jest długość pasa z stock_lengths
+    o najmniejszej łącznej długości zużytych pasów; time_budget – łączny
+    czas poprawy wszystkich planów. Odcinki dłuższe niż każdy pas trafiają
+    do CutPlan.unplaced grupy (grupa z samymi takimi odcinkami – plan bez pasów).
+    """
+    if quantities is None:
+        quantities = [1] * len(parts)
+    groups = {}
+    for part, quantity in zip(parts, quantities):
+        if quantity <= 0:
+            continue
+        key = (part.thickness, round(part.width, WIDTH_DECIMALS))
+        groups.setdefault(key, Counter())[(part.name, part.length)] += quantity
+
+    # porównania w oczkach siatki, jak w solve_cutting (odcinek w górę, pas w dół)
+    capacity = max(_units(stock_length, up=False) for stock_length in stock_lengths)
+    runs = []
+    for (thickness, width), demand in groups.items():
+        items = []
+        unplaced = []
+        for (name, length), quantity in demand.items():
+            if _units(length + kerf, up=True) > capacity:
+                unplaced.extend([(name, length)] * quantity)
+            else:
+                items.append((name, length, quantity))
+        longest = max((length for _, length, _ in items), default=0.0) + kerf
+        stocks = [stock_length for stock_length in stock_lengths
+                  if items and _units(longest, up=True) <= _units(stock_length, up=False)]
+        runs.append(((thickness, width), items, tuple(unplaced), stocks))
+
+    end = time.perf_counter() + time_budget
+    remaining = sum(len(stocks) for _, _, _, stocks in runs)
+    plans = {}
+    for (thickness, width), items, unplaced, stocks in runs:
+        best = None
+        for stock_length in stocks:
+            # równa część pozostałego budżetu – niewykorzystany czas przechodzi dalej
+            now = time.perf_counter()
+            plan = solve_cutting(items, stock_length, kerf, seed=seed,
+                                 deadline=now + max(end - now, 0.0) / remaining)
+            remaining -= 1
+            if best is None or plan.strips * plan.stock_length < best.strips * best.stock_length:
+                best = plan
+        if best is None:
+            best = CutPlan(0.0, 0.0, float(max(stock_lengths)))
+        plans[(thickness, width)] = CutPlan(thickness, width, best.stock_length, best.patterns,
+                                            best.demand, best.lower_bound, best.method, unplaced)
+    return plans
@@ -0,0 +1,107 @@
+"""
+Wymiary out / in / neutralne flansz dla całych tablic naraz (NumPy).
+
+Skrypty liczyły wymiary flansza po flanszy (calculate_out_dimension /
+calculate_in_dimension w MODUŁ4 i g2o1_v.china3, tan((180 - kąt) / 2)
+w g2o1_v.chinagpt2v2). Tutaj całe zamówienie / wykaz części to kilka tablic
+i jedno przejście NumPy:
+
+    dims = convert_dimensions(lengths, angles, radii, thickness)
+    dims.out[i], dims.inner[i], dims.neutral[i]   -> wymiary flanszy i
+
+angles / radii / arcs mogą mieć kształt (N,) – jedno gięcie na flanszę –
+albo (N, B): do B gięć sąsiadujących z flanszą (flansza środkowa ma dwa),
+NaN w angles oznacza brak gięcia. Przyrosty gięć flanszy się sumują:
+
+    out     = x + Σ (r + g) * tan((180 - kąt) / 2)
+    in      = x + Σ łuk / 2        (łuk z Hulls; bez arcs – łuk neutralny)
+    neutral = x + Σ kąt[rad] * (r + k * g) / 2
+
+x to wymiar "zewn." z bounding boxa flanszy. Kąty podaje się w konwencji
+pliku – kąty > 180 trzeba wcześniej znormalizować (normalize_angles), jeśli
+mają liczyć się jak ujemne. Znak kąta jest zachowany, jak w zastąpionych
+funkcjach skryptów; przyrosty od wartości bezwzględnej wymagają
+np.abs(angles) po stronie wywołującego.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Współczynnik położenia warstwy neutralnej (jak arc_neutral w skryptach g2o1)
+DEFAULT_K_FACTOR = 0.5
+
+# Tryby WorkpieceDimensions: w jakim wymiarze podano lengths
+OUTSIDE = "Outside"
+INSIDE = "Inside"
+
+# length – x(zewn.) flanszy; wszystkie pola – ndarray (N,)
+DimensionArrays = namedtuple("DimensionArrays", "length out inner neutral")
+
+
+def normalize_angles(angles):
+    """Kąty > 180 jako ujemne z zakresu [-180, 180] (225 -> -135), dla tablic."""
+    angles = np.asarray(angles, dtype=np.float64)
+    return np.where(angles > 180, angles - 360, angles)
+
+
+def bend_offsets(angles, radii, thickness, arcs=None, k_factor=DEFAULT_K_FACTOR):
+    """
+    Przyrosty (out, in, neutral) wymiaru flanszy od jej gięć – tablice (N,).
+    Dla tablic (N, B) przyrosty gięć flanszy są sumowane; gięcia z kątem NaN
+    nic nie dodają.
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    radii = np.asarray(radii, dtype=np.float64)
+    thickness = np.asarray(thickness, dtype=np.float64)
+    if angles.ndim == 2 and thickness.ndim == 1:
+        # grubość jest cechą detalu (flanszy), nie gięcia
+        thickness = thickness[:, None]
+
+    d_out = (radii + thickness) * np.tan(np.radians((180.0 - angles) / 2.0))
+    d_neutral = np.radians(angles) * (radii + k_factor * thickness) / 2.0
+    if arcs is None:
+        d_in = d_neutral
+    else:
+        d_in = np.broadcast_to(np.asarray(arcs, dtype=np.float64) / 2.0, d_neutral.shape)
+
+    missing = np.isnan(angles)
+    if missing.any():
+        d_out = np.where(missing, 0.0, d_out)
+        d_in = np.where(missing, 0.0, d_in)
+        d_neutral = np.where(missing, 0.0, d_neutral)
+    if angles.ndim == 2:
+        return d_out.sum(axis=1), d_in.sum(axis=1), d_neutral.sum(axis=1)
+    return d_out, d_in, d_neutral
+
+
+def convert_dimensions(lengths, angles, radii, thickness, mode=None, arcs=None,
+                       k_factor=DEFAULT_K_FACTOR):
+    """
+    Wymiary x(zewn.) / out / in / neutralne flansz – DimensionArrays.
+
+    lengths – (N,) wymiary flansz w trybie mode:
+        None      – x(zewn.) z bounding boxa (jak w skryptach g2o1),
+        "Outside" – wymiary zewnętrzne (out),
+        "Inside"  – wymiary wewnętrzne (in),
+      np. WorkpieceDimensions detalu; tryb może być tablicą (N,) takich wartości.
+    angles, radii, arcs – (N,) albo (N, B), jak w bend_offsets.
+    thickness – skalar albo (N,).
+    """
+    lengths = np.asarray(lengths, dtype=np.float64)
+    d_out, d_in, d_neutral = bend_offsets(angles, radii, thickness, arcs, k_factor)
+
+    if mode is None:
+        base = lengths
+    elif isinstance(mode, str):
+        if mode not in (OUTSIDE, INSIDE):
+            raise ValueError(f"Nieznany tryb wymiarów: {mode!r} (oczekiwano 'Outside' lub 'Inside')")
+        base = lengths - (d_out if mode == OUTSIDE else d_in)
+    else:
+        mode = np.asarray(mode)
+        unknown = ~np.isin(mode, (OUTSIDE, INSIDE))
+        if unknown.any():
+            raise ValueError(f"Nieznany tryb wymiarów: {mode[unknown][0]!r} (oczekiwano 'Outside' lub 'Inside')")
+        base = lengths - np.where(mode == OUTSIDE, d_out, d_in)
+
+    return DimensionArrays(base, base + d_out, base + d_in, base + d_neutral)
@@ -0,0 +1,80 @@
+"""
+Rejestr obsługi elementów XML według nazwy tagu.
+
+Zamiast porównywać tag.lower().endswith(...) z każdą nazwą dla każdego
+elementu drzewa, skrypt rejestruje raz funkcje obsługi:
+
+    PARSER = TagDispatcher()
+
+    @PARSER.on("WorkpieceThickness")
+    def _thickness(elem, state):
+        state["thickness"] = float(elem.get("value", "0"))
+
+    PARSER.dispatch(root, state)
+
+Nazwy są porównywane bez przestrzeni nazw ("{ns}Tag" -> "tag") i bez
+rozróżniania wielkości liter. Surowy tag jest tłumaczony na funkcję obsługi
+tylko przy pierwszym wystąpieniu – potem każdy element to jedno wyszukanie
+w słowniku.
+"""
+
+_UNRESOLVED = object()
+
+
+def local_name(tag):
+    """Nazwa tagu bez przestrzeni nazw, małymi literami ("" dla komentarzy/PI)."""
+    if not isinstance(tag, str):
+        return ""
+    if tag[:1] == "{":
+        tag = tag[tag.find("}") + 1:]
+    elif ":" in tag:
+        tag = tag.split(":", 1)[1]
+    return tag.lower()
+
+
+class TagDispatcher:
+    """
+    Mapowanie: nazwa tagu -> funkcja obsługi handler(elem, state).
+    Jeden tag ma jedną funkcję obsługi (ponowna rejestracja ją zastępuje).
+    """
+
+    def __init__(self, handlers=None):
+        self._handlers = {}
+        self._resolved = {}
+        for tag, handler in (handlers or {}).items():
+            self.register(tag, handler)
+
+    def register(self, tag, handler):
+        self._handlers[local_name(tag)] = handler
+        self._resolved.clear()
+
+    def on(self, *tags):
+        """Dekorator: rejestruje funkcję dla jednego lub kilku tagów."""
+        def decorator(handler):
+            for tag in tags:
+                self.register(tag, handler)
+            return handler
+        return decorator
+
+    def handler_for(self, tag):
+        """Funkcja obsługi dla surowego tagu elementu (lub None)."""
+        handler = self._resolved.get(tag, _UNRESOLVED)
+        if handler is _UNRESOLVED:
+            handler = self._handlers.get(local_name(tag))
+            self._resolved[tag] = handler
+        return handler
+
+    def dispatch(self, root, state):
+        """
+        Przechodzi drzewo od root (w kolejności dokumentu, jak root.iter())
+        i woła handler(elem, state) dla elementów z zarejestrowanym tagiem.
+        Zwraca state.
+        """
+        resolved = self._resolved
+        for elem in root.iter():
+            handler = resolved.get(elem.tag, _UNRESOLVED)
+            if handler is _UNRESOLVED:
+                handler = self.handler_for(elem.tag)
+            if handler is not None:
+                handler(elem, state)
+        return state
@@ -0,0 +1,456 @@
+"""
+Rozwinięcie (flat pattern) detalu jako wielokąt – z obrysów WorkpieceMap.
+
+StaticComponentHull i VDeformableComponentHulls są zapisane każdy w swoim
+układzie współrzędnych. Układ MainPlane jest układem rozwinięcia, a pozostałe
+komponenty ustawiane są kolejno przez strefy gięcia: krawędź SideReference
+komponentu już ustawionego, pas strefy gięcia o szerokości łuku
+(VDeformableComponentHulls w poprzek linii gięcia) i SideReference drugiego
+komponentu po przeciwnej stronie pasa. Obrys komponentu leży zawsze
+po lewej stronie jego SideReference (tak zapisuje Delem).
+
+Ustawione obrysy łączone są w jeden wielokąt: wspólne krawędzie (również
+częściowo wspólne) znoszą się, a pozostałe składają się w pętle – zewnętrzną
+(z wycięciami) i otwory.
+
+Segment obrysu Delem to tylko początek, koniec i flaga łuku – bez promienia
+ani środka – więc łuki obrysów wchodzą do wielokąta jako cięciwy
+(pole, DXF i SVG liczone są po cięciwach).
+
+    pattern = flat_pattern(wp)          # z cache – ta sama geometria liczona raz
+    pattern.outline, pattern.holes, pattern.bend_lines, pattern.bounds
+    write_dxf(pattern, "detal.dxf")
+    write_svg(pattern, "detal.svg")
+"""
+
+import functools
+import math
+from collections import namedtuple
+from dataclasses import dataclass, replace
+from typing import Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from .outline import decode_outline, decode_outlines
+
+# Tolerancja łączenia wierzchołków i krawędzi [mm]
+TOLERANCE = 1e-3
+
+# Tyle różnych geometrii mieści domyślny cache
+DEFAULT_MAXSIZE = 4096
+
+# Warstwy DXF
+LAYER_OUTLINE = "OBRYS"
+LAYER_HOLES = "OTWORY"
+LAYER_BENDS = "GIECIA"
+
+
+# Strefa gięcia w układzie rozwinięcia: origin – środek SideReference lewego
+# komponentu, direction – jej kierunek (jednostkowy), pas gięcia o szerokości
+# width leży po prawej stronie direction; left / right – nazwy komponentów
+BendZone = namedtuple("BendZone", "name left right origin direction width")
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True)
+class FlatPattern:
+    """
+    Rozwinięcie detalu w układzie MainPlane (mm).
+      - outline    – (K, 2) wierzchołki obrysu zewnętrznego (przeciwnie do wskazówek zegara)
+      - holes      – obrysy otworów (zgodnie z ruchem wskazówek)
+      - pieces     – (nazwa komponentu, (K, 2)) – ustawione obrysy SC i DC
+      - bend_lines – (nazwa DC, (2, 2)) – linie gięcia
+      - unplaced   – komponenty statyczne bez połączenia ze strefami gięcia MainPlane
+      - zones      – BendZone ustawionych stref gięcia (dla dld.fold)
+    Tablice są tylko do odczytu (wynik bywa współdzielony przez cache).
+    """
+    name: str
+    outline: np.ndarray
+    holes: Tuple[np.ndarray, ...] = ()
+    pieces: Tuple[Tuple[str, np.ndarray], ...] = ()
+    bend_lines: Tuple[Tuple[str, np.ndarray], ...] = ()
+    unplaced: Tuple[str, ...] = ()
+    zones: Tuple[BendZone, ...] = ()
+
+    @property
+    def area(self):
+        """Pole rozwinięcia (obrys minus otwory) [mm²]."""
+        return _signed_area(self.outline) + sum(_signed_area(h) for h in self.holes)
+
+    @property
+    def bounds(self):
+        """(xmin, ymin, xmax, ymax) obrysu; zera dla pustego rozwinięcia."""
+        if not len(self.outline):
+            return (0.0, 0.0, 0.0, 0.0)
+        lo = self.outline.min(axis=0)
+        hi = self.outline.max(axis=0)
+        return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
+
+def _signed_area(points):
+    if len(points) < 3:
+        return 0.0
+    x = points[:, 0]
+    y = points[:, 1]
+    return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2.0
+
+
+def _polygon(coords):
+    """Wierzchołki (K, 2) obrysu z segmentów N×4 (punkty początkowe; łuk -> cięciwa)."""
+    return coords[:, :2].copy()
+
+
+def _line(value):
+    """
+    Pierwszy odcinek wartości Line ("x1 y1 x2 y2 false") lub Lines
+    ("1 Line x1 y1 x2 y2 false ...") jako (początek, koniec) lub None.
+    """
+    if not value:
+        return None
+    tokens = value.replace(",", ".").split()
+    if len(tokens) > 1 and tokens[1].lower() == "line":
+        tokens = tokens[2:]
+    try:
+        x1, y1, x2, y2 = (float(t) for t in tokens[:4])
+    except ValueError:
+        return None
+    return np.array([x1, y1]), np.array([x2, y2])
+
+
+def _rigid(direction_from, point_from, direction_to, point_to):
+    """Macierz 3×3 obrotu + przesunięcia: direction_from -> direction_to, point_from -> point_to."""
+    angle = math.atan2(direction_to[1], direction_to[0]) - math.atan2(direction_from[1], direction_from[0])
+    c, s = math.cos(angle), math.sin(angle)
+    rotation = np.array([[c, -s], [s, c]])
+    matrix = np.eye(3)
+    matrix[:2, :2] = rotation
+    matrix[:2, 2] = np.asarray(point_to) - rotation @ np.asarray(point_from)
+    return matrix
+
+
+def _apply(matrix, points):
+    return points @ matrix[:2, :2].T + matrix[:2, 2]
+
+
+def _unit(vector):
+    length = math.hypot(vector[0], vector[1])
+    return vector / length if length > 0 else vector
+
+
+def _bend_zone(hull_points, bend_line):
+    """(kierunek linii gięcia, punkt środka linii, min i max rzutu obrysu na normalną)."""
+    start, end = bend_line
+    direction = _unit(end - start)
+    normal = np.array([direction[1], -direction[0]])
+    offsets = (hull_points - start) @ normal
+    return direction, (start + end) / 2.0, float(offsets.min()), float(offsets.max())
+
+
+def _place(key):
+    """Ustawienie komponentów w układzie MainPlane – (pieces, bend_lines, unplaced, zones)."""
+    main_plane, statics, deformables = key
+    hulls = {name: _polygon(decode_outline(hull)[0]) for name, hull in statics}
+    if not hulls:
+        return [], [], (), []
+    root = main_plane if main_plane in hulls else statics[0][0]
+    placed = {root: np.eye(3)}
+
+    zones = []
+    for name, hulls_value, bend_line, left, left_side, right, right_side in deformables:
+        outlines = [_polygon(coords) for coords, _ in decode_outlines(hulls_value or "")]
+        outlines = [o for o in outlines if len(o)]
+        line = _line(bend_line)
+        sides = (_line(left_side), _line(right_side))
+        if not outlines or line is None or None in sides or left not in hulls or right not in hulls:
+            continue
+        zones.append((name, outlines, line, (left, right), sides))
+
+    pieces = []
+    bend_lines = []
+    placed_zones = []
+    pending = list(zones)
+    while pending:
+        progress = False
+        for zone in list(pending):
+            name, outlines, line, statics_lr, sides = zone
+            known = [i for i in (0, 1) if statics_lr[i] in placed]
+            if not known:
+                continue
+            this = known[0]
+            other = 1 - this
+            direction, middle, low, high = _bend_zone(np.vstack(outlines), line)
+            width = high - low
+
+            # krawędź ustawionego komponentu w układzie MainPlane; pas gięcia po jej prawej stronie
+            a, b = (_apply(placed[statics_lr[this]], np.array(p)) for p in sides[this])
+            u = _unit(b - a)
+            n = np.array([u[1], -u[0]])
+            mid = (a + b) / 2.0
+            if statics_lr[other] not in placed:
+                p, q = sides[other]
+                placed[statics_lr[other]] = _rigid(_unit(q - p), (p + q) / 2.0, -u, mid + width * n)
+
+            # strefa gięcia: linia gięcia wzdłuż krawędzi lewego komponentu,
+            # rzut obrysu na normalną [low, high] -> [0, width] od tej krawędzi
+            left_a, left_b = (_apply(placed[statics_lr[0]], np.array(p)) for p in sides[0])
+            zone_edge = middle + low * np.array([direction[1], -direction[0]])
+            matrix = _rigid(direction, zone_edge, _unit(left_b - left_a), (left_a + left_b) / 2.0)
+            for outline in outlines:
+                pieces.append((name, _apply(matrix, outline)))
+            bend_lines.append((name, _apply(matrix, np.array(line))))
+            placed_zones.append(BendZone(name, statics_lr[0], statics_lr[1], (left_a + left_b) / 2.0,
+                                         _unit(left_b - left_a), width))
+            pending.remove(zone)
+            progress = True
+        if not progress:
+            break
+
+    for sc_name, _ in statics:
+        if sc_name in placed:
+            pieces.append((sc_name, _apply(placed[sc_name], hulls[sc_name])))
+    unplaced = tuple(sc_name for sc_name, _ in statics if sc_name not in placed)
+    return pieces, bend_lines, unplaced, placed_zones
+
+
+def _split_edges(edges, vertices, tol):
+    """Dzieli krawędzie (E, 4) w wierzchołkach leżących na nich (częściowo wspólne krawędzie)."""
+    a = edges[:, None, :2]
+    d = edges[:, None, 2:] - a
+    length2 = np.sum(d * d, axis=2)
+    rel = vertices[None, :, :] - a
+    t = np.sum(rel * d, axis=2) / np.where(length2 > 0, length2, 1.0)
+    distance = np.abs(d[..., 0] * rel[..., 1] - d[..., 1] * rel[..., 0]) / np.sqrt(np.where(length2 > 0, length2, 1.0))
+    span = tol / np.sqrt(np.where(length2 > 0, length2, 1.0))
+    inside = (distance < tol) & (t > span) & (t < 1.0 - span)
+
+    result = []
+    for i, edge in enumerate(edges):
+        if not inside[i].any():
+            result.append(edge)
+            continue
+        ts = np.unique(np.concatenate(([0.0], t[i][inside[i]], [1.0])))
+        points = edge[:2] + ts[:, None] * (edge[2:] - edge[:2])
+        result.extend(np.hstack((points[:-1], points[1:])))
+    return np.array(result)
+
+
+def _drop_collinear(loop, tol):
+    keep = []
+    count = len(loop)
+    for i in range(count):
+        prev_p, p, next_p = loop[i - 1], loop[i], loop[(i + 1) % count]
+        d1 = p - prev_p
+        d2 = next_p - p
+        cross = d1[0] * d2[1] - d1[1] * d2[0]
+        if abs(cross) > tol * max(math.hypot(*d1), math.hypot(*d2)) or np.dot(d1, d2) < 0:
+            keep.append(p)
+    return np.array(keep) if len(keep) >= 3 else loop
+
+
+def union_polygons(polygons, tol=TOLERANCE):
+    """
+    Suma wielokątów stykających się krawędziami (bez nakładania się powierzchni).
+    Zwraca (obrys zewnętrzny (K, 2), [otwory]) – obrys przeciwnie do wskazówek
+    zegara, otwory zgodnie; wspólne odcinki krawędzi się znoszą.
+    """
+    oriented = []
+    for points in polygons:
+        if len(points) < 3:
+            continue
+        oriented.append(points if _signed_area(points) > 0 else points[::-1])
+    if not oriented:
+        return np.empty((0, 2)), []
+
+    edges = np.vstack([np.hstack((p, np.roll(p, -1, axis=0))) for p in oriented])
+    edges = _split_edges(edges, np.vstack(oriented), tol)
+
+    keys = np.round(edges / tol).astype(np.int64)
+    coords = {}
+    directed = {}
+    for edge, key in zip(edges, keys):
+        start = (key[0], key[1])
+        end = (key[2], key[3])
+        if start == end:
+            continue
+        coords.setdefault(start, edge[:2])
+        coords.setdefault(end, edge[2:])
+        reverse = directed.get((end, start), 0)
+        if reverse:
+            # krawędź wspólna dwóch wielokątów (przeciwne kierunki) – znika z obrysu
+            directed[(end, start)] = reverse - 1
+        else:
+            directed[(start, end)] = directed.get((start, end), 0) + 1
+
+    outgoing = {}
+    for (start, end), count in directed.items():
+        for _ in range(count):
+            outgoing.setdefault(start, []).append(end)
+
+    loops = []
+    while outgoing:
+        start = next(iter(outgoing))
+        loop = [start]
+        current = start
+        while True:
+            targets = outgoing.get(current)
+            if not targets:
+                break
+            following = targets.pop()
+            if not targets:
+                del outgoing[current]
+            if following == start:
+                break
+            loop.append(following)
+            current = following
+        if len(loop) >= 3:
+            loops.append(_drop_collinear(np.array([coords[k] for k in loop]), tol))
+
+    if not loops:
+        return np.empty((0, 2)), []
+    areas = [_signed_area(loop) for loop in loops]
+    outer = int(np.argmax(areas))
+    return loops[outer], [loop for i, loop in enumerate(loops) if i != outer]
+
+
+def geometry_key(wp):
+    """Klucz cache: wszystkie wartości WorkpieceMap potrzebne do rozwinięcia."""
+    statics = tuple((sc.name, sc.hull) for sc in wp.static_components if sc.hull)
+    deformables = tuple(
+        (dc.name, dc.hulls, dc.bend_line, dc.left_static, dc.left_side, dc.right_static, dc.right_side)
+        for dc in wp.deformable_components
+    )
+    return wp.main_plane, statics, deformables
+
+
+def compute_flat_pattern(key, name=""):
+    """FlatPattern dla klucza geometry_key (bez cache)."""
+    pieces, bend_lines, unplaced, zones = _place(key)
+    outline, holes = union_polygons([points for _, points in pieces])
+    return FlatPattern(
+        name=name,
+        outline=_readonly(outline),
+        holes=tuple(_readonly(h) for h in holes),
+        pieces=tuple((n, _readonly(p)) for n, p in pieces),
+        bend_lines=tuple((n, _readonly(line)) for n, line in bend_lines),
+        unplaced=unplaced,
+        zones=tuple(BendZone(z.name, z.left, z.right, _readonly(z.origin), _readonly(z.direction), z.width)
+                    for z in zones),
+    )
+
+
+class FlatPatternCache:
+    """
+    Cache LRU rozwinięć kluczowany geometrią (geometry_key) – powtarzające się
+    w zleceniach programy (ta sama geometria, inna nazwa pliku) liczone są raz.
+      - get(wp) – FlatPattern detalu (z nazwą detalu)
+      - stats   – liczniki: hits, misses
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError(f"maxsize musi być dodatnie: {maxsize}")
+        self.maxsize = maxsize
+        self._compute = functools.lru_cache(maxsize=maxsize)(compute_flat_pattern)
+
+    def get(self, wp):
+        pattern = self._compute(geometry_key(wp))
+        if pattern.name != wp.name:
+            pattern = replace(pattern, name=wp.name)
+        return pattern
+
+    @property
+    def stats(self):
+        info = self._compute.cache_info()
+        return {"hits": info.hits, "misses": info.misses}
+
+    def __len__(self):
+        return self._compute.cache_info().currsize
+
+    def clear(self):
+        """Czyści cache i liczniki."""
+        self._compute.cache_clear()
+
+
+_default_cache = FlatPatternCache()
+
+
+def flat_pattern(wp, cache=None):
+    """FlatPattern detalu (Workpiece) z cache (domyślnie wspólnego dla procesu)."""
+    if cache is None:
+        cache = _default_cache
+    return cache.get(wp)
+
+
+def flat_patterns(workpieces, cache=None):
+    """Rozwinięcia listy detali – powtórzona geometria liczona raz."""
+    if cache is None:
+        cache = _default_cache
+    return [cache.get(wp) for wp in workpieces]
+
+
+def _dxf_number(value):
+    text = f"{value:.6f}"
+    return "0.000000" if text == "-0.000000" else text
+
+
+def _dxf_polyline(lines, points, layer):
+    lines += ["0", "POLYLINE", "8", layer, "66", "1", "70", "1",
+              "10", "0.0", "20", "0.0", "30", "0.0"]
+    for x, y in points.tolist():
+        lines += ["0", "VERTEX", "8", layer, "10", _dxf_number(x), "20", _dxf_number(y), "30", "0.0"]
+    lines += ["0", "SEQEND", "8", layer]
+
+
+def write_dxf(pattern, path):
+    """
+    Zapisuje rozwinięcie do DXF (R12, sekcja ENTITIES): obrys, otwory, linie
+    gięcia. Łuki obrysu zapisywane są jako cięciwy (opis modułu).
+    """
+    lines = ["0", "SECTION", "2", "ENTITIES"]
+    if len(pattern.outline):
+        _dxf_polyline(lines, pattern.outline, LAYER_OUTLINE)
+    for hole in pattern.holes:
+        _dxf_polyline(lines, hole, LAYER_HOLES)
+    for _, (start, end) in pattern.bend_lines:
+        lines += ["0", "LINE", "8", LAYER_BENDS,
+                  "10", _dxf_number(start[0]), "20", _dxf_number(start[1]), "30", "0.0",
+                  "11", _dxf_number(end[0]), "21", _dxf_number(end[1]), "31", "0.0"]
+    lines += ["0", "ENDSEC", "0", "EOF"]
+    with open(path, "w", encoding="ascii", errors="replace") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_svg(pattern, path, margin=10.0):
+    """
+    Zapisuje rozwinięcie do SVG (mm, oś Y w górę jak w pliku .dld).
+    Łuki obrysu rysowane są jako cięciwy (opis modułu).
+    """
+    xmin, ymin, xmax, ymax = pattern.bounds
+    width = xmax - xmin + 2 * margin
+    height = ymax - ymin + 2 * margin
+
+    def path_data(points):
+        # odbicie osi Y: SVG liczy y w dół
+        coords = " ".join(f"{x - xmin + margin:.4f},{ymax - y + margin:.4f}" for x, y in points.tolist())
+        return f"M {coords} Z"
+
+    body = [" ".join(path_data(p) for p in (pattern.outline,) + pattern.holes if len(p))]
+    svg = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.3f}mm" height="{height:.3f}mm" '
+        f'viewBox="0 0 {width:.4f} {height:.4f}">',
+        f"  <title>{escape(pattern.name)}</title>",
+        f'  <path d="{body[0]}" fill="none" stroke="black" stroke-width="0.5" fill-rule="evenodd"/>',
+    ]
+    for _, (start, end) in pattern.bend_lines:
+        svg.append(
+            f'  <line x1="{start[0] - xmin + margin:.4f}" y1="{ymax - start[1] + margin:.4f}" '
+            f'x2="{end[0] - xmin + margin:.4f}" y2="{ymax - end[1] + margin:.4f}" '
+            f'stroke="red" stroke-width="0.3" stroke-dasharray="4 2"/>')
+    svg.append("</svg>")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(svg) + "\n")
@@ -0,0 +1,402 @@
+"""
+Gięcie detalu w 3D – z rozwinięcia (dld.flat), kątów stref gięcia
+(VDeformableComponentAngle / AngleAfter) i MainPlaneTransformation.
+
+Strefa gięcia to pas o szerokości w (łuk na włóknie obojętnym) po prawej
+stronie SideReference lewego komponentu. Ugięcie o θ = 180 - |kąt| zwija
+pas w łuk o promieniu r = w / θ, a prawy komponent obraca się sztywno
+wokół osi łuku – macierz 4×4 w układzie rozwinięcia (fold_matrices, dla
+wszystkich stref naraz). Kąt < 180 gnie w stronę +z układu MainPlane,
+kąt > 180 (zapis Delem ujemnych kątów) – w stronę -z.
+
+Położenie każdego komponentu to iloczyn macierzy stref na drodze od
+MainPlane (mnożenia wsadowe poziomami drzewa flansz), poprzedzony
+MainPlaneTransformation. Obrysy flansz przeliczane są jednym mnożeniem
+dla wszystkich wierzchołków detalu:
+
+    part = fold_workpiece(wp)                      # kąty z pliku
+    part.flanges, part.bends, part.bounds          # wielokąty 3D, obrys bryły
+    outside_dimensions(part)                       # wymiary zewnętrzne flansz
+    fold_workpiece(wp, {"DC00": 180})              # stan pośredni (np. przed gięciem DC00)
+    fold_files(paths, workers=8)                   # cały folder równolegle
+
+Wielokąty leżą na powierzchni środkowej blachy; bryła to ± g/2 wzdłuż
+normalnej (przy K = 0.5 powierzchnia środkowa to włókno obojętne, którego
+długość zapisuje rozwinięcie).
+"""
+
+import math
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from .dimensions import normalize_angles
+from .flat import flat_pattern
+from .parser import parse_workpiece
+from .units import to_position
+
+# Liczba odcinków łuku strefy gięcia
+ARC_STEPS = 8
+
+# Ugięcia mniejsze niż to [rad] traktowane jak brak gięcia
+ANGLE_EPS = 1e-9
+
+# Tyle plików dostaje naraz jeden proces (fold_files)
+CHUNK_SIZE = 16
+
+# Strefa po zgięciu: angle – ugięcie ze znakiem [°] (+ w stronę +z lewego komponentu),
+# radius – promień łuku na powierzchni środkowej, centre / axis – oś łuku w 3D,
+# middle – środek łuku na powierzchni środkowej, inner – kierunek od middle w stronę
+# wnętrza gięcia (do osi łuku; dla strefy płaskiej – normalna po stronie gięcia)
+FoldedZone = namedtuple("FoldedZone", "name left right angle radius centre axis middle inner")
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True)
+class FoldedPart:
+    """
+    Detal zgięty w 3D (mm).
+      - flanges    – (nazwa SC, (K, 3)) obrysy flansz na powierzchni środkowej
+      - normals    – (nazwa SC, (3,)) normalne flansz (obraz +z rozwinięcia)
+      - bends      – (nazwa DC, (K, 3)) pasy stref gięcia zwinięte w łuk
+      - zones      – FoldedZone stref
+      - transforms – (nazwa SC, (4, 4)) położenie flanszy względem rozwinięcia
+      - unplaced   – komponenty bez położenia (jak FlatPattern.unplaced)
+    """
+    name: str
+    thickness: float
+    flanges: Tuple[Tuple[str, np.ndarray], ...] = ()
+    normals: Tuple[Tuple[str, np.ndarray], ...] = ()
+    bends: Tuple[Tuple[str, np.ndarray], ...] = ()
+    zones: Tuple[FoldedZone, ...] = ()
+    transforms: Tuple[Tuple[str, np.ndarray], ...] = ()
+    unplaced: Tuple[str, ...] = ()
+
+    def skins(self):
+        """(nazwa, (K, 3)) obu powierzchni blachy (± g/2) każdej flanszy i strefy gięcia."""
+        half = self.thickness / 2.0
+        normals = dict(self.normals)
+        skins = []
+        for name, polygon in self.flanges:
+            skins.extend(((name, polygon + half * normals[name]), (name, polygon - half * normals[name])))
+        for zone, (name, strip) in zip(self.zones, self.bends):
+            if zone.centre is None:
+                unit = np.broadcast_to(zone.inner, strip.shape)
+            else:
+                # punkt łuku odsunięty od osi o ± g/2 (powierzchnia wewnętrzna i zewnętrzna)
+                radial = strip - zone.centre
+                radial -= np.outer(radial @ zone.axis, zone.axis)
+                length = np.linalg.norm(radial, axis=1, keepdims=True)
+                unit = np.divide(radial, length, out=np.zeros_like(radial), where=length > 0)
+            skins.extend(((name, strip + half * unit), (name, strip - half * unit)))
+        return skins
+
+    def solid_points(self):
+        """Wierzchołki obu powierzchni blachy (± g/2 wzdłuż normalnych), (N, 3)."""
+        skins = self.skins()
+        return np.vstack([points for _, points in skins]) if skins else np.empty((0, 3))
+
+    @property
+    def bounds(self):
+        """((xmin, ymin, zmin), (xmax, ymax, zmax)) bryły detalu."""
+        points = self.solid_points()
+        if not len(points):
+            return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+        return tuple(points.min(axis=0).tolist()), tuple(points.max(axis=0).tolist())
+
+    def extent(self, direction):
+        """Wymiar bryły wzdłuż kierunku direction (3,)."""
+        direction = np.asarray(direction, dtype=np.float64)
+        projection = self.solid_points() @ (direction / np.linalg.norm(direction))
+        return float(projection.max() - projection.min()) if len(projection) else 0.0
+
+
+def _position_matrix(value):
+    """Macierz 4×4 z wartości Position ("x y z oś_x oś_y oś_z kąt")."""
+    matrix = np.eye(4)
+    if not value:
+        return matrix
+    position = to_position(value)
+    axis = np.array([position.axis_x, position.axis_y, position.axis_z])
+    norm = np.linalg.norm(axis)
+    if norm > 0 and position.angle:
+        x, y, z = axis / norm
+        a = math.radians(position.angle)
+        c, s, t = math.cos(a), math.sin(a), 1.0 - math.cos(a)
+        matrix[:3, :3] = [[t * x * x + c, t * x * y - s * z, t * x * z + s * y],
+                          [t * x * y + s * z, t * y * y + c, t * y * z - s * x],
+                          [t * x * z - s * y, t * y * z + s * x, t * z * z + c]]
+    matrix[:3, 3] = (position.x, position.y, position.z)
+    return matrix
+
+
+def _zone_frames(origins, directions):
+    """(Z, 4, 4) układy stref: osie x – w poprzek pasa, y – wzdłuż linii gięcia, z – normalna."""
+    frames = np.zeros((len(origins), 4, 4))
+    frames[:, 0, 0] = directions[:, 1]
+    frames[:, 1, 0] = -directions[:, 0]
+    frames[:, :2, 1] = directions
+    frames[:, 2, 2] = 1.0
+    frames[:, :2, 3] = origins
+    frames[:, 3, 3] = 1.0
+    return frames
+
+
+def fold_matrices(origins, directions, widths, angles):
+    """
+    Macierze (Z, 4, 4) gięcia stref – w układzie rozwinięcia przenoszą
+    prawy komponent strefy do położenia po ugięciu o angles [rad, ze znakiem]
+    względem nieruchomego lewego. origins, directions (Z, 2), widths (Z,).
+    """
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+    directions = np.asarray(directions, dtype=np.float64).reshape(-1, 2)
+    widths = np.asarray(widths, dtype=np.float64)
+    angles = np.asarray(angles, dtype=np.float64)
+    count = len(origins)
+    theta = np.abs(angles)
+    sign = np.where(angles < 0, -1.0, 1.0)
+    bent = theta > ANGLE_EPS
+    radius = np.divide(widths, theta, out=np.zeros(count), where=bent)
+
+    # lokalnie: p -> c + R (p - w·x - c), c = (0, 0, ±r), R – obrót wokół osi y o ∓θ
+    c, s = np.cos(theta), np.sin(-sign * theta)
+    local = np.tile(np.eye(4), (count, 1, 1))
+    local[:, 0, 0] = c
+    local[:, 0, 2] = s
+    local[:, 2, 0] = -s
+    local[:, 2, 2] = c
+    centre = np.zeros((count, 3))
+    centre[:, 2] = sign * radius
+    shifted = -centre.copy()
+    shifted[:, 0] -= widths
+    local[:, :3, 3] = centre + np.einsum("zij,zj->zi", local[:, :3, :3], shifted)
+    local[~bent] = np.eye(4)
+
+    frames = _zone_frames(origins, directions)
+    return frames @ local @ np.linalg.inv(frames)
+
+
+def _arc_points(points, zone, angle, frame, pose):
+    """Punkty pasa strefy (K, 2) z rozwinięcia zwinięte w łuk i ustawione pozą lewego komponentu."""
+    local = (np.hstack((points, np.zeros((len(points), 1)), np.ones((len(points), 1))))
+             @ np.linalg.inv(frame).T)
+    theta = abs(angle)
+    if theta > ANGLE_EPS and zone.width > 0:
+        radius = zone.width / theta
+        sign = -1.0 if angle < 0 else 1.0
+        phi = np.clip(local[:, 0], 0.0, zone.width) / radius
+        local[:, 0] = radius * np.sin(phi)
+        local[:, 2] = sign * radius * (1.0 - np.cos(phi))
+    return (local @ (pose @ frame).T)[:, :3]
+
+
+def _subdivide(polygon, steps):
+    """Wielokąt z każdą krawędzią podzieloną na steps odcinków (łuk po zwinięciu)."""
+    following = np.roll(polygon, -1, axis=0)
+    t = np.arange(steps)[None, :, None] / steps
+    return (polygon[:, None, :] + t * (following - polygon)[:, None, :]).reshape(-1, 2)
+
+
+def fold_pattern(pattern, angles, thickness=0.0, main_plane_transformation="", name=None):
+    """
+    FoldedPart z FlatPattern; angles – {nazwa DC: kąt [°] w zapisie pliku}
+    (strefy bez kąta zostają płaskie, kąt 180 = brak gięcia).
+    """
+    zones = [z for z in pattern.zones if angles.get(z.name) is not None]
+    signed = []
+    for z in zones:
+        normalized = float(normalize_angles([angles[z.name]])[0])
+        deflection = math.radians(180.0 - abs(normalized))
+        signed.append(-deflection if normalized < 0 else deflection)
+    folds = fold_matrices([z.origin for z in zones], [z.direction for z in zones],
+                          [z.width for z in zones], signed) if zones else np.empty((0, 4, 4))
+
+    names = [n for n, _ in pattern.pieces if n not in {z.name for z in pattern.zones}]
+    root = names[0] if names else None
+    for n in names:
+        if n == "MainPlane":
+            root = n
+    poses = {}
+    if root is not None:
+        poses[root] = _position_matrix(main_plane_transformation)
+    # przejście poziomami drzewa flansz: wszystkie krawędzie poziomu jednym mnożeniem wsadowym
+    level = [root] if root is not None else []
+    while level:
+        parents = []
+        steps = []
+        children = []
+        current = set(level)
+        for i, z in enumerate(zones):
+            if z.left in current and z.right not in poses and z.right not in children:
+                parents.append(poses[z.left])
+                steps.append(folds[i])
+                children.append(z.right)
+            elif z.right in current and z.left not in poses and z.left not in children:
+                parents.append(poses[z.right])
+                steps.append(np.linalg.inv(folds[i]))
+                children.append(z.left)
+        if not children:
+            break
+        for child, pose in zip(children, np.matmul(np.array(parents), np.array(steps))):
+            poses[child] = pose
+        level = children
+
+    flange_pieces = [(n, points) for n, points in pattern.pieces if n in poses]
+    flanges = []
+    normals = []
+    if flange_pieces:
+        counts = [len(points) for _, points in flange_pieces]
+        index = np.repeat(np.arange(len(flange_pieces)), counts)
+        stacked = np.vstack([points for _, points in flange_pieces])
+        homogeneous = np.hstack((stacked, np.zeros((len(stacked), 1)), np.ones((len(stacked), 1))))
+        matrices = np.array([poses[n] for n, _ in flange_pieces])
+        folded = np.einsum("vij,vj->vi", matrices[index], homogeneous)[:, :3]
+        for (n, _), part in zip(flange_pieces, np.split(folded, np.cumsum(counts)[:-1])):
+            flanges.append((n, _readonly(part)))
+            normals.append((n, _readonly(poses[n][:3, 2].copy())))
+
+    by_zone = dict(zip((z.name for z in zones), zip(zones, signed)))
+    frames = dict(zip((z.name for z in zones), _zone_frames(np.array([z.origin for z in zones]).reshape(-1, 2),
+                                                            np.array([z.direction for z in zones]).reshape(-1, 2))))
+    bends = []
+    folded_zones = []
+    for n, points in pattern.pieces:
+        if n not in by_zone:
+            continue
+        zone, angle = by_zone[n]
+        if zone.left not in poses:
+            continue
+        pose = poses[zone.left]
+        bends.append((n, _readonly(_arc_points(_subdivide(points, ARC_STEPS), zone, angle,
+                                                frames[n], pose))))
+        theta = abs(angle)
+        radius = zone.width / theta if theta > ANGLE_EPS else math.inf
+        centre = None
+        if theta > ANGLE_EPS:
+            local_centre = np.array([0.0, 0.0, radius if angle > 0 else -radius, 1.0])
+            centre = _readonly((pose @ frames[n] @ local_centre)[:3])
+        axis = _readonly(pose[:3, :3] @ np.array([zone.direction[0], zone.direction[1], 0.0]))
+        # środek łuku (w połowie szerokości i długości pasa) i kierunek do osi łuku w tym punkcie
+        half = theta / 2.0
+        sign = math.copysign(1.0, angle)
+        along = (points - zone.origin) @ zone.direction
+        local_middle = np.array([zone.width / 2.0 if theta <= ANGLE_EPS else radius * math.sin(half),
+                                 (along.min() + along.max()) / 2.0,
+                                 0.0 if theta <= ANGLE_EPS else sign * radius * (1.0 - math.cos(half)), 1.0])
+        middle = _readonly((pose @ frames[n] @ local_middle)[:3])
+        inner = _readonly((pose @ frames[n])[:3, :3] @ np.array([-math.sin(half), 0.0, sign * math.cos(half)]))
+        folded_zones.append(FoldedZone(n, zone.left, zone.right, math.degrees(angle), radius, centre, axis,
+                                       middle, inner))
+
+    unplaced = tuple(pattern.unplaced) + tuple(n for n in names if n not in poses)
+    return FoldedPart(
+        name=pattern.name if name is None else name,
+        thickness=float(thickness),
+        flanges=tuple(flanges),
+        normals=tuple(normals),
+        bends=tuple(bends),
+        zones=tuple(folded_zones),
+        transforms=tuple((n, _readonly(poses[n])) for n in names if n in poses),
+        unplaced=unplaced,
+    )
+
+
+def fold_workpiece(wp, angles=None, cache=None):
+    """
+    FoldedPart detalu; angles – {nazwa DC: kąt} nadpisujące kąty z pliku
+    (DeformableComponent.bend_angle), np. stan po części kroków BendSequence.
+    """
+    file_angles = {dc.name: dc.bend_angle for dc in wp.deformable_components}
+    if angles:
+        file_angles.update(angles)
+    return fold_pattern(flat_pattern(wp, cache), file_angles, wp.thickness,
+                        wp.main_plane_transformation, wp.name)
+
+
+def outside_dimensions(part):
+    """
+    Wymiary zewnętrzne flansz {nazwa SC: mm} mierzone na zgiętej bryle:
+    rozpiętość flanszy w poprzek jej pierwszego gięcia, gdzie koniec przy
+    gięciu (równoległym do pierwszego) to przecięcie zewnętrznych powierzchni
+    obu flansz (ostry narożnik wirtualny). Dla zagięcia 180° – zewnętrzny
+    punkt łuku. Flansze bez gięć – pominięte.
+    """
+    half = part.thickness / 2.0
+    polygons = dict(part.flanges)
+    normals = dict(part.normals)
+    result = {}
+    for name, polygon in part.flanges:
+        zones = [z for z in part.zones if name in (z.left, z.right) and z.centre is not None
+                 and z.left in polygons and z.right in polygons]
+        if not zones:
+            continue
+        normal = normals[name]
+        first_axis = zones[0].axis / np.linalg.norm(zones[0].axis)
+        across = np.cross(normal, first_axis)
+        if (zones[0].centre - polygon.mean(axis=0)) @ across < 0:
+            across = -across
+        projection = polygon @ across
+        low, high = float(projection.min()), float(projection.max())
+        for zone in zones:
+            axis = zone.axis / np.linalg.norm(zone.axis)
+            if abs(axis @ first_axis) < 1.0 - 1e-6:
+                continue
+            other = zone.right if zone.left == name else zone.left
+            towards = 1.0 if (zone.centre - polygon.mean(axis=0)) @ across > 0 else -1.0
+            end = float(_sharp(polygon, normal, polygons[other], normals[other], zone, axis, half) @ across)
+            if towards > 0:
+                high = max(high, end)
+            else:
+                low = min(low, end)
+        result[name] = float(high - low)
+    return result
+
+
+def _outer_plane(polygon, normal, centre, half):
+    """(normalna, d) płaszczyzny zewnętrznej flanszy: powierzchnia po stronie przeciwnej do osi łuku."""
+    point = polygon[0]
+    inner = 1.0 if (centre - point) @ normal > 0 else -1.0
+    outer_point = point - inner * half * normal
+    return normal, float(normal @ outer_point)
+
+
+def _sharp(polygon, normal, other_polygon, other_normal, zone, axis, half):
+    """Punkt ostrego narożnika wirtualnego (3,) gięcia zone po stronie flanszy polygon."""
+    n1, d1 = _outer_plane(polygon, normal, zone.centre, half)
+    n2, d2 = _outer_plane(other_polygon, other_normal, zone.centre, half)
+    system = np.array([n1, n2, axis])
+    if abs(np.linalg.det(system)) < 1e-9:
+        # flansze równoległe (zagięcie 180°) – zewnętrzny punkt łuku
+        direction = np.cross(axis, n1)
+        if (zone.centre - polygon.mean(axis=0)) @ direction < 0:
+            direction = -direction
+        return zone.centre + direction * (zone.radius + half)
+    return np.linalg.solve(system, [d1, d2, float(axis @ zone.centre)])
+
+
+def fold_file(path):
+    """FoldedPart pliku .dld albo None (błędny XML)."""
+    try:
+        wp = parse_workpiece(path)
+    except ET.ParseError:
+        return None
+    return fold_workpiece(wp)
+
+
+def fold_files(paths, workers=None):
+    """
+    FoldedPart dla listy plików (None dla plików z błędem), w kolejności paths.
+    workers – liczba procesów (None – liczba rdzeni, 1 – bez procesów).
+    """
+    if workers == 1 or len(paths) <= CHUNK_SIZE:
+        return [fold_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fold_file, paths, chunksize=CHUNK_SIZE))
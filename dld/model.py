@@ -0,0 +1,119 @@
+"""
+Model danych detalu odczytanego z pliku Delem (.dld).
+
+Obiekty z tego modułu wypełnia jednorazowo parser (dld.parser) –
+wszystkie skrypty (MODUŁ4, g2o1, testery odcinków) czytają już tylko z nich,
+zamiast parsować XML od nowa.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class StaticComponent:
+    """
+    <StaticComponent> z <WorkpieceMap>:
+      - name        – WorkpieceComponentName (np. "MainPlane", "SC00")
+      - hull        – surowa wartość StaticComponentHull (unit="Outline")
+      - shortenings – lista (nazwa DC, surowa wartość ShorteningContour)
+    """
+    name: str
+    hull: Optional[str] = None
+    shortenings: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class DeformableComponent:
+    """
+    <VDeformableComponent> (strefa gięcia, np. "DC00").
+    Kąty w stopniach, promienie w mm; None oznacza brak elementu w pliku.
+    left_side / right_side – SideReference (wartość Line) komponentu
+    statycznego: krawędź przy strefie gięcia w układzie tego komponentu.
+    """
+    name: str
+    bend_line: Optional[str] = None
+    angle: Optional[float] = None
+    preferred_inner_radius: Optional[float] = None
+    actual_inner_radius: Optional[float] = None
+    hulls: Optional[str] = None
+    left_static: Optional[str] = None
+    right_static: Optional[str] = None
+    left_side: Optional[str] = None
+    right_side: Optional[str] = None
+    angle_after: Optional[float] = None
+    angle_before: Optional[float] = None
+    bend_allowance: Optional[float] = None
+
+    @property
+    def bend_angle(self):
+        """
+        Kąt gięcia wg logiki skryptów: VBendDeformation/AngleAfter,
+        a gdy go brak – VDeformableComponentAngle (domyślnie 0).
+        """
+        if self.angle_after is not None:
+            return self.angle_after
+        if self.angle is not None:
+            return self.angle
+        return 0.0
+
+
+@dataclass
+class BendStep:
+    """
+    Jeden <BendStep> z <BendSequence>. Kroki bez odpowiednika na rysunku
+    (CorrespondWithDrawing="No") mają pustą deformation i własny PreferredInnerRadius.
+    """
+    deformation: str = ""
+    static_component: str = ""
+    preferred_inner_radius: Optional[float] = None
+    bend_angle: Optional[float] = None
+    bend_length: Optional[float] = None
+
+
+@dataclass
+class Workpiece:
+    """
+    Detal odczytany z pliku .dld.
+    has_bend_sequence odróżnia brak <BendSequence> od sekwencji bez kroków.
+    tools – (ToolType, ToolName) narzędzi z BendSequence/ToolConfiguration.
+    main_plane_transformation – surowa wartość Position ułożenia MainPlane w 3D.
+    sections – None, gdy odczytano cały plik; przy odczycie częściowym
+    (parse_workpiece(..., sections=...)) krotka odczytanych sekcji.
+    """
+    name: str = ""
+    thickness: float = 0.0
+    dimensions: str = ""
+    material: str = ""
+    signature: str = ""
+    main_plane: str = ""
+    main_plane_transformation: str = ""
+    static_components: List[StaticComponent] = field(default_factory=list)
+    deformable_components: List[DeformableComponent] = field(default_factory=list)
+    has_bend_sequence: bool = False
+    blank_length: Optional[float] = None
+    bend_steps: List[BendStep] = field(default_factory=list)
+    tools: List[Tuple[str, str]] = field(default_factory=list)
+    sections: Optional[Tuple[str, ...]] = None
+
+    @property
+    def die(self):
+        """Nazwa pierwszej matrycy (ToolType "Die") z ToolConfiguration lub ""."""
+        for tool_type, tool_name in self.tools:
+            if tool_type == "Die":
+                return tool_name
+        return ""
+
+    def static(self, name):
+        """Zwraca StaticComponent o podanej nazwie (lub None)."""
+        for sc in self.static_components:
+            if sc.name == name:
+                return sc
+        return None
+
+    def deformable(self, name):
+        """Zwraca DeformableComponent o podanej nazwie (lub None)."""
+        for dc in self.deformable_components:
+            if dc.name == name:
+                return dc
+        return None
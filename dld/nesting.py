@@ -0,0 +1,320 @@
+"""
+Rozkrój (nesting) rozwinięć detali na standardowych arkuszach blachy.
+
+Każdy detal zajmuje prostokąt – bounding box rozwinięcia (FlatPattern z
+dld.flat) albo wymiary formatki z wykazu – i układany jest heurystyką
+skyline bottom-left: arkusz zapełniany od dołu, detal trafia tam, gdzie jego
+górna krawędź będzie najniżej (przy remisie – najbardziej w lewo), z obrotem
+o 90° lub bez. Gdy detal nie mieści się na żadnym otwartym arkuszu,
+otwierany jest następny.
+
+Wynik heurystyki zależy od kolejności detali, dlatego dla każdego formatu
+arkusza liczonych jest kilka kolejności (pole, dłuższy bok, krótszy bok,
+obwód i losowe zaburzenia kolejności po polu) – równolegle w procesach.
+Wybierany jest rozkrój z najmniejszym polem zużytych arkuszy.
+
+    blanks = [Blank.from_pattern(flat_pattern(wp))] * 20 + [Blank("P7", 143, 316.5)] * 4
+    result = nest(blanks, workers=8)
+    result.sheets, result.utilisation, result.placements
+    write_nesting_svg(result, "rozkroj.svg")
+
+Wykorzystanie materiału liczone jest z rzeczywistego pola rozwinięć
+(obrys minus otwory), nie z pola prostokątów.
+"""
+
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Tuple
+from xml.sax.saxutils import escape
+
+# Standardowe formaty arkuszy [mm] – (szerokość, długość); skyline rośnie wzdłuż długości
+STANDARD_SHEETS = ((1000, 2000), (1250, 2500), (1500, 3000))
+
+# Odstęp między detalami i od krawędzi arkusza [mm]
+DEFAULT_SPACING = 5.0
+DEFAULT_MARGIN = 5.0
+
+# Liczba losowych kolejności na format arkusza (oprócz stałych sortowań)
+DEFAULT_SHUFFLES = 8
+
+# Do tylu detali wszystkie kolejności liczone są w jednym procesie
+SERIAL_LIMIT = 50
+
+# Tolerancja porównań wymiarów [mm]
+EPS = 1e-6
+
+
+class Blank(namedtuple("Blank", "name width height area")):
+    """
+    Jeden detal do rozkroju: prostokąt width x height [mm] i pole materiału
+    area [mm²] (domyślnie pole prostokąta). Detal w kilku sztukach to
+    kilka takich samych Blank na liście.
+    """
+    __slots__ = ()
+
+    def __new__(cls, name, width, height, area=None):
+        width = float(width)
+        height = float(height)
+        return super().__new__(cls, name, width, height, width * height if area is None else float(area))
+
+    @classmethod
+    def from_pattern(cls, pattern, name=None):
+        """Blank z bounding boxa i pola rozwinięcia (dld.flat.FlatPattern)."""
+        xmin, ymin, xmax, ymax = pattern.bounds
+        return cls(pattern.name if name is None else name, xmax - xmin, ymax - ymin, pattern.area)
+
+
+# x, y – lewy dolny narożnik na arkuszu nr sheet (od 0); width / height po obrocie
+Placement = namedtuple("Placement", "name sheet x y width height rotated")
+
+
+@dataclass(frozen=True)
+class NestingResult:
+    """
+    Rozkrój grupy detali na arkuszach sheet_width x sheet_height [mm].
+      - placements – Placement każdego ułożonego detalu
+      - sheets     – liczba użytych arkuszy
+      - unplaced   – nazwy detali większych od arkusza (w obu orientacjach)
+      - parts_area – pole materiału ułożonych detali [mm²]
+      - last_used  – zajęta długość ostatniego arkusza [mm] (reszta to odpad do ponownego użycia)
+      - ordering   – kolejność, która dała ten rozkrój
+    """
+    sheet_width: float
+    sheet_height: float
+    placements: Tuple[Placement, ...] = ()
+    sheets: int = 0
+    unplaced: Tuple[str, ...] = ()
+    parts_area: float = 0.0
+    last_used: float = 0.0
+    ordering: str = ""
+
+    @property
+    def sheet_area(self):
+        """Pole wszystkich użytych arkuszy [mm²]."""
+        return self.sheets * self.sheet_width * self.sheet_height
+
+    @property
+    def utilisation(self):
+        """Wykorzystanie materiału: pole detali / pole użytych arkuszy (0..1)."""
+        return self.parts_area / self.sheet_area if self.sheets else 0.0
+
+    @property
+    def used_area(self):
+        """Pole zużytej blachy, gdy resztę ostatniego arkusza odkłada się na magazyn [mm²]."""
+        if not self.sheets:
+            return 0.0
+        return (self.sheets - 1) * self.sheet_width * self.sheet_height + self.sheet_width * self.last_used
+
+    def sheet_placements(self, sheet):
+        """Detale ułożone na arkuszu nr sheet."""
+        return [p for p in self.placements if p.sheet == sheet]
+
+
+class _Skyline:
+    """Linia horyzontu jednego arkusza: segmenty [x, y, szerokość] od lewej."""
+
+    __slots__ = ("width", "height", "segments", "low")
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.segments = [[0.0, 0.0, width]]
+        self.low = 0.0
+
+    def find(self, w, h):
+        """(góra, x, indeks segmentu, y) najlepszego miejsca dla w x h albo None."""
+        if self.low + h > self.height + EPS:
+            return None
+        segments = self.segments
+        limit = self.width + EPS
+        best = None
+        for i, (x, _, _) in enumerate(segments):
+            if x + w > limit:
+                break
+            y = 0.0
+            span = 0.0
+            j = i
+            while span < w - EPS:
+                seg = segments[j]
+                if seg[1] > y:
+                    y = seg[1]
+                span += seg[2]
+                j += 1
+            top = y + h
+            if top <= self.height + EPS and (best is None or top < best[0] - EPS
+                                              or (top < best[0] + EPS and x < best[1])):
+                best = (top, x, i, y)
+        return best
+
+    def place(self, index, x, y, w, h):
+        segments = self.segments
+        end = x + w
+        j = index
+        while j < len(segments) and segments[j][0] + segments[j][2] <= end + EPS:
+            j += 1
+        if j < len(segments) and segments[j][0] < end - EPS:
+            right = segments[j][0] + segments[j][2]
+            segments[j][0] = end
+            segments[j][2] = right - end
+        segments[index:j] = [[x, y + h, w]]
+        # sąsiednie segmenty na tej samej wysokości łączone w jeden
+        merged = [segments[0]]
+        for seg in segments[1:]:
+            if abs(seg[1] - merged[-1][1]) <= EPS:
+                merged[-1][2] += seg[2]
+            else:
+                merged.append(seg)
+        self.segments = merged
+        self.low = min(seg[1] for seg in merged)
+
+    @property
+    def top(self):
+        return max(seg[1] for seg in self.segments)
+
+
+def pack(blanks, sheet_width, sheet_height, spacing=DEFAULT_SPACING, margin=DEFAULT_MARGIN,
+         rotate=True, ordering=""):
+    """
+    NestingResult dla detali ułożonych w podanej kolejności (skyline
+    bottom-left, pierwszy arkusz, na którym detal się mieści).
+    """
+    # odstęp doliczany do każdego detalu (z prawej i u góry), margines od krawędzi arkusza
+    width = sheet_width - 2 * margin + spacing
+    height = sheet_height - 2 * margin + spacing
+    sheets = []
+    placements = []
+    unplaced = []
+    parts_area = 0.0
+    for blank in blanks:
+        w = blank.width + spacing
+        h = blank.height + spacing
+        shapes = [(w, h, False)]
+        if rotate and abs(w - h) > EPS:
+            shapes.append((h, w, True))
+        shapes = [s for s in shapes if s[0] <= width + EPS and s[1] <= height + EPS]
+        if not shapes:
+            unplaced.append(blank.name)
+            continue
+        for number, skyline in enumerate(sheets + [None]):
+            if skyline is None:
+                skyline = _Skyline(width, height)
+                sheets.append(skyline)
+            best = None
+            for sw, sh, rotated in shapes:
+                spot = skyline.find(sw, sh)
+                if spot is not None and (best is None or spot[:2] < best[0][:2]):
+                    best = (spot, sw, sh, rotated)
+            if best is None:
+                continue
+            (_, x, index, y), sw, sh, rotated = best
+            skyline.place(index, x, y, sw, sh)
+            placements.append(Placement(blank.name, number, margin + x, margin + y,
+                                        sw - spacing, sh - spacing, rotated))
+            parts_area += blank.area
+            break
+    last_used = 0.0
+    if sheets:
+        last_used = min(sheet_height, sheets[-1].top - spacing + 2 * margin)
+    return NestingResult(float(sheet_width), float(sheet_height), tuple(placements), len(sheets),
+                         tuple(unplaced), parts_area, last_used, ordering)
+
+
+def orderings(blanks, shuffles=DEFAULT_SHUFFLES, seed=0):
+    """Lista (nazwa, indeksy detali) – kolejności sprawdzane przez nest."""
+    def sides(b):
+        return max(b.width, b.height), min(b.width, b.height)
+
+    keys = {
+        "pole": lambda i: -blanks[i].width * blanks[i].height,
+        "dłuższy bok": lambda i: (-sides(blanks[i])[0], -sides(blanks[i])[1]),
+        "krótszy bok": lambda i: (-sides(blanks[i])[1], -sides(blanks[i])[0]),
+        "obwód": lambda i: -(blanks[i].width + blanks[i].height),
+    }
+    indices = range(len(blanks))
+    result = [(name, tuple(sorted(indices, key=key))) for name, key in keys.items()]
+    rng = random.Random(seed)
+    for n in range(shuffles):
+        noise = [rng.uniform(0.7, 1.3) for _ in indices]
+        order = sorted(indices, key=lambda i: -blanks[i].width * blanks[i].height * noise[i])
+        result.append((f"losowa {n + 1}", tuple(order)))
+    return result
+
+
+def _score(result):
+    # najpierw wszystkie detale ułożone, potem najmniej blachy (arkusze, odpad z ostatniego)
+    return (len(result.unplaced), result.sheet_area, result.used_area)
+
+
+def _pack_task(task):
+    blanks, order, name, sheet, spacing, margin, rotate = task
+    return pack([blanks[i] for i in order], sheet[0], sheet[1], spacing, margin, rotate, name)
+
+
+def nest_groups(groups, sheets=STANDARD_SHEETS, spacing=DEFAULT_SPACING, margin=DEFAULT_MARGIN,
+                rotate=True, shuffles=DEFAULT_SHUFFLES, workers=None, seed=0):
+    """
+    Rozkrój kilku grup detali (np. materiał i grubość) – słownik
+    klucz -> lista Blank. Zwraca klucz -> najlepszy NestingResult spośród
+    formatów sheets i kolejności. Wszystkie zadania grup liczone są we
+    wspólnej puli procesów (workers – liczba procesów, None – liczba rdzeni,
+    1 – bez procesów).
+    """
+    tasks = []
+    owners = []
+    for key, blanks in groups.items():
+        blanks = tuple(blanks)
+        for name, order in orderings(blanks, shuffles, seed):
+            for sheet in sheets:
+                tasks.append((blanks, order, name, sheet, spacing, margin, rotate))
+                owners.append(key)
+
+    pieces = sum(len(blanks) for blanks in groups.values())
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or pieces <= SERIAL_LIMIT:
+        results = map(_pack_task, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_pack_task, tasks))
+
+    best = {}
+    for key, result in zip(owners, results):
+        if key not in best or _score(result) < _score(best[key]):
+            best[key] = result
+    for key in groups:
+        if key not in best:
+            best[key] = NestingResult(float(sheets[0][0]), float(sheets[0][1]))
+    return best
+
+
+def nest(blanks, sheets=STANDARD_SHEETS, spacing=DEFAULT_SPACING, margin=DEFAULT_MARGIN,
+         rotate=True, shuffles=DEFAULT_SHUFFLES, workers=None, seed=0):
+    """Najlepszy NestingResult dla jednej grupy detali (zob. nest_groups)."""
+    return nest_groups({None: blanks}, sheets, spacing, margin, rotate, shuffles, workers, seed)[None]
+
+
+def write_nesting_svg(result, path, gap=50.0):
+    """Zapisuje arkusze rozkroju obok siebie do SVG (mm, oś Y w górę)."""
+    sheets = max(result.sheets, 1)
+    width = sheets * result.sheet_width + (sheets + 1) * gap
+    height = result.sheet_height + 2 * gap
+    svg = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.3f}mm" height="{height:.3f}mm" '
+        f'viewBox="0 0 {width:.4f} {height:.4f}">',
+    ]
+    for sheet in range(result.sheets):
+        left = gap + sheet * (result.sheet_width + gap)
+        svg.append(f'  <rect x="{left:.4f}" y="{gap:.4f}" width="{result.sheet_width:.4f}" '
+                   f'height="{result.sheet_height:.4f}" fill="none" stroke="black" stroke-width="1"/>')
+        for p in result.sheet_placements(sheet):
+            # odbicie osi Y: SVG liczy y w dół
+            x = left + p.x
+            y = gap + result.sheet_height - p.y - p.height
+            svg.append(f'  <rect x="{x:.4f}" y="{y:.4f}" width="{p.width:.4f}" height="{p.height:.4f}" '
+                       f'fill="none" stroke="blue" stroke-width="0.5"><title>{escape(p.name)}</title></rect>')
+    svg.append("</svg>")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(svg) + "\n")
@@ -0,0 +1,248 @@
+"""
+Dekoder wartości Outline / Outlines z plików Delem (NumPy).
+
+Wartość outline ma postać:
+    4 x1 y1 x2 y2 false x1 y1 x2 y2 false ...        (unit="Outline")
+    2 Outline 4 x1 y1 ... false Outline 3 x1 ...     (unit="Outlines", kilka obrysów)
+Każdy segment to 5 tokenów: współrzędne początku i końca oraz flaga łuku.
+
+decode_outline zamienia taką wartość jednym wywołaniem na tablicę N×4
+(x1, y1, x2, y2) i maskę łuków (dla Outlines – pierwszy obrys);
+decode_outlines zwraca wszystkie obrysy wartości Outlines.
+chord_lengths liczy długości cięciw dla wszystkich segmentów naraz,
+arc_lengths – długości po łuku (segmenty z flagą łuku) w tym samym przebiegu.
+"""
+
+import numpy as np
+
+# Tokeny oznaczające łuk (Delem zapisuje "true"; "prawda" – pliki z polskim Excelem)
+ARC_TOKENS = ("true", "prawda")
+
+
+def _empty():
+    return np.empty((0, 4), dtype=np.float64), np.empty(0, dtype=bool)
+
+
+def _decode_rows(body):
+    """
+    Wolna ścieżka dla uszkodzonych wartości: segmenty, których nie da się
+    zamienić na liczby, są pomijane (jak w dotychczasowych skryptach).
+    """
+    rows = []
+    arcs = []
+    for i in range(0, len(body), 5):
+        try:
+            rows.append([float(t) for t in body[i:i + 4]])
+        except ValueError:
+            continue
+        arcs.append(body[i + 4].lower() in ARC_TOKENS)
+    if not rows:
+        return _empty()
+    return np.array(rows, dtype=np.float64), np.array(arcs, dtype=bool)
+
+
+def _outline_spans(tokens, limit=None):
+    """
+    Przegląda nagłówki obrysów w tokenach wartości Outline / Outlines.
+    Zwraca listę (start, n_full) – pozycja pierwszego tokenu segmentów
+    i liczba pełnych segmentów każdego obrysu (najwyżej limit obrysów).
+    Odczyt kończy się na pierwszym błędnym nagłówku.
+    """
+    if len(tokens) > 1 and tokens[1].lower() == "outline":
+        try:
+            n_outlines = int(tokens[0])
+        except ValueError:
+            return []
+        pos = 1
+    else:
+        n_outlines, pos = 1, 0
+    if limit is not None:
+        n_outlines = min(n_outlines, limit)
+
+    spans = []
+    for _ in range(n_outlines):
+        if pos < len(tokens) and tokens[pos].lower() == "outline":
+            pos += 1
+        if pos >= len(tokens):
+            break
+        try:
+            n_segments = max(int(tokens[pos]), 0)
+        except ValueError:
+            break
+        start = pos + 1
+        n_full = min(n_segments, (len(tokens) - start) // 5)
+        spans.append((start, n_full))
+        pos = start + 5 * n_segments
+    return spans
+
+
+def _decode_span(tokens, start, n_full):
+    if n_full == 0:
+        return _empty()
+    body = tokens[start:start + 5 * n_full]
+
+    # Flagi łuku to co piąty token; reszta idzie do NumPy jednym wywołaniem
+    numbers = list(body)
+    flags = numbers[4::5]
+    del numbers[4::5]
+    try:
+        coords = np.array(numbers, dtype=np.float64).reshape(n_full, 4)
+    except ValueError:
+        return _decode_rows(body)
+    is_arc = np.array([flag.lower() in ARC_TOKENS for flag in flags], dtype=bool)
+    return coords, is_arc
+
+
+def decode_outline(value):
+    """
+    Dekoduje wartość Outline (lub pierwszy obrys wartości Outlines).
+    Zwraca (coords, is_arc):
+      - coords – ndarray float64 o kształcie (N, 4): x1, y1, x2, y2
+      - is_arc – ndarray bool o kształcie (N,)
+    Niepełny ostatni segment jest pomijany; pusta lub błędna wartość daje N = 0.
+    """
+    tokens = value.replace(',', '.').split()
+    spans = _outline_spans(tokens, limit=1)
+    if not spans:
+        return _empty()
+    return _decode_span(tokens, *spans[0])
+
+
+def decode_outlines(value):
+    """
+    Dekoduje wszystkie obrysy wartości Outlines (wartość Outline daje jeden obrys).
+    Zwraca listę (coords, is_arc) jak decode_outline, po jednej pozycji na obrys.
+
+    Tokeny są dzielone raz, a segmenty wszystkich obrysów zamieniane jednym
+    wywołaniem NumPy; tablice obrysów są widokami wspólnego bufora.
+    """
+    tokens = value.replace(',', '.').split()
+    spans = _outline_spans(tokens)
+    if len(spans) < 2:
+        return [_decode_span(tokens, *span) for span in spans]
+
+    numbers = []
+    for start, n_full in spans:
+        numbers.extend(tokens[start:start + 5 * n_full])
+    flags = numbers[4::5]
+    del numbers[4::5]
+    try:
+        coords = np.array(numbers, dtype=np.float64).reshape(-1, 4)
+    except ValueError:
+        # Uszkodzony obrys – każdy dekodujemy osobno (wolna ścieżka tylko dla niego)
+        return [_decode_span(tokens, *span) for span in spans]
+    is_arc = np.array([flag.lower() in ARC_TOKENS for flag in flags], dtype=bool)
+
+    outlines = []
+    row = 0
+    for _, n_full in spans:
+        outlines.append((coords[row:row + n_full], is_arc[row:row + n_full]))
+        row += n_full
+    return outlines
+
+
+def chord_lengths(coords):
+    """Długości cięciw wszystkich segmentów tablicy N×4 (jedna operacja wektorowa)."""
+    dx = coords[:, 2] - coords[:, 0]
+    dy = coords[:, 3] - coords[:, 1]
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def arc_lengths(coords, is_arc, radius=None, chords=None):
+    """
+    Długości segmentów jednego obrysu (N,): cięciwa dla odcinków prostych,
+    długość po łuku dla segmentów z flagą łuku. Kąt łuku θ:
+      - z promienia (radius – skalar albo (N,), NaN = nieznany): θ = 2 asin(c / 2r),
+      - bez promienia z sąsiednich segmentów – zaokrąglenie naroża jest styczne
+        do nich, więc θ to kąt skrętu między poprzednim a następnym segmentem
+        (obrys zamknięty; dla łuku obok łuku kierunek sąsiada to jego cięciwa).
+    Długość łuku = c * (θ / 2) / sin(θ / 2).
+    """
+    if chords is None:
+        chords = chord_lengths(coords)
+    if not is_arc.any():
+        return chords
+
+    dx = coords[:, 2] - coords[:, 0]
+    dy = coords[:, 3] - coords[:, 1]
+    px, py = np.roll(dx, 1), np.roll(dy, 1)
+    nx, ny = np.roll(dx, -1), np.roll(dy, -1)
+    sweep = np.abs(np.arctan2(px * ny - py * nx, px * nx + py * ny))
+    if radius is not None:
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), chords.shape)
+        known = np.isfinite(radius) & (radius > 0)
+        ratio = np.divide(chords, 2.0 * radius, out=np.zeros_like(chords), where=known)
+        sweep = np.where(known, 2.0 * np.arcsin(np.minimum(ratio, 1.0)), sweep)
+
+    half = sweep / 2.0
+    # θ -> 0: łuk = cięciwa (sin(θ/2) w mianowniku bez dzielenia przez 0)
+    scale = np.divide(half, np.sin(half), out=np.ones_like(half), where=half > 1e-12)
+    return np.where(is_arc, chords * scale, chords)
+
+
+def _segment_tuples(coords, is_arc, chords=None):
+    if chords is None:
+        chords = chord_lengths(coords)
+    return [
+        (x1, y1, x2, y2, arc, chord)
+        for (x1, y1, x2, y2), arc, chord in zip(coords.tolist(), is_arc.tolist(), chords.tolist())
+    ]
+
+
+def outline_segments(value):
+    """
+    Segmenty outline jako lista krotek (x1, y1, x2, y2, is_arc, chord_length) –
+    format używany dotychczas przez parse_outline_segments / parse_outline.
+    """
+    return _segment_tuples(*decode_outline(value))
+
+
+def outlines_segments(value):
+    """Segmenty (jak outline_segments) każdego obrysu wartości Outlines – lista list."""
+    return [_segment_tuples(coords, is_arc) for coords, is_arc in decode_outlines(value)]
+
+
+def outline_segment_lengths(value, radius=None):
+    """
+    (segmenty, długości) jednego dekodowania wartości Outline: segmenty jak
+    outline_segments, długości – lista arc_lengths (łuki po łuku, reszta = cięciwa).
+    """
+    coords, is_arc = decode_outline(value)
+    chords = chord_lengths(coords)
+    return _segment_tuples(coords, is_arc, chords), arc_lengths(coords, is_arc, radius, chords).tolist()
+
+
+def outlines_segment_lengths(value, radius=None):
+    """(segmenty, długości) – jak outline_segment_lengths – każdego obrysu wartości Outlines."""
+    result = []
+    for coords, is_arc in decode_outlines(value):
+        chords = chord_lengths(coords)
+        result.append((_segment_tuples(coords, is_arc, chords),
+                       arc_lengths(coords, is_arc, radius, chords).tolist()))
+    return result
+
+
+def outline_points(value):
+    """
+    Punkty początku i końca segmentów wszystkich obrysów [(x, y), ...]
+    (kolejno x1, y1, x2, y2 każdego segmentu) – np. do bounding boxa.
+    """
+    points = []
+    for coords, _ in decode_outlines(value):
+        points.extend(map(tuple, coords.reshape(-1, 2).tolist()))
+    return points
+
+
+def outline_dimension(value):
+    """
+    Długość cięciwy 2. segmentu (lub 1., gdy jest tylko jeden); 0.0 gdy brak segmentów.
+    Tak skrypty interpretują wymiar StaticComponentHull i ShorteningContour.
+    """
+    if not value:
+        return 0.0
+    chords = chord_lengths(decode_outline(value)[0])
+    if len(chords) >= 2:
+        return float(chords[1])
+    if len(chords):
+        return float(chords[0])
+    return 0.0
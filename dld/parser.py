@@ -0,0 +1,218 @@
+"""
+Jednoprzebiegowy parser plików Delem (.dld).
+
+Plik jest parsowany dokładnie raz, a wynik trafia do obiektu Workpiece
+(dld.model). Błąd składni XML jest zgłaszany jako ET.ParseError –
+tak jak dotychczas w skryptach, które same wołały ET.parse.
+
+Drzewo XML buduje backend z dld.backends: lxml (zapytania skompilowane raz
+jako XPath), gdy jest zainstalowany, w przeciwnym razie ElementTree.
+
+Skrypty geometryczne nie potrzebują <BendSequence> (dane maszynowe, zwykle
+większość pliku). parse_workpiece(..., sections=GEOMETRY) czyta plik
+strumieniowo (zawsze ElementTree) i przerywa odczyt zaraz po zamknięciu
+żądanych sekcji.
+"""
+
+import xml.etree.ElementTree as ET
+
+from .backends import ETREE, get_backend
+from .model import BendStep, DeformableComponent, StaticComponent, Workpiece
+from .units import convert
+
+# Sekcje pliku .dld, po których można przerwać odczyt (kolejność jak w pliku)
+WORKPIECE = "Workpiece"          # geometria: WorkpieceMap, grubość, materiał, signature
+BLANK_LENGTH = "BlankLength"     # początek BendSequence: rozwinięcie z pliku
+BEND_SEQUENCE = "BendSequence"   # cała sekwencja gięć (BendStep, narzędzia)
+
+GEOMETRY = (WORKPIECE,)
+
+# Porcja odczytu przy parsowaniu strumieniowym – mała, żeby nie czytać daleko za sekcję
+CHUNK_SIZE = 4096
+
+
+def _value(parent, path, xml=ETREE):
+    """Zwraca atrybut 'value' elementu parent/path lub None, gdy elementu brak."""
+    if parent is None:
+        return None
+    elem = xml.find(parent, path)
+    if elem is None:
+        return None
+    return elem.attrib.get("value", "")
+
+
+def _number(parent, path, xml=ETREE):
+    """
+    Wartość liczbowa elementu parent/path – konwersja wg atrybutu unit
+    (dld.units; brak unit = RealNumber). None, gdy elementu brak lub wartość
+    nie jest liczbą.
+    """
+    if parent is None:
+        return None
+    elem = xml.find(parent, path)
+    if elem is None:
+        return None
+    value = convert(elem.get("unit") or "RealNumber", elem.get("value", ""))
+    return value if isinstance(value, float) else None
+
+
+def format_number(value):
+    """Liczba z modelu jako tekst, bez zbędnego '.0' (np. 1650 -> "1650"); "" dla None."""
+    if value is None:
+        return ""
+    return f"{value:.15g}"
+
+
+def _parse_static(elem, xml):
+    sc = StaticComponent(name=(_value(elem, "WorkpieceComponentName", xml) or "").strip())
+    sc.hull = _value(elem, "StaticComponentPart/StaticComponentHull", xml)
+    for dcs in xml.findall(elem, "DeformableCompShortening"):
+        dc_name = _value(dcs, "DeformableComponentName", xml)
+        contour = _value(dcs, "ShorteningContour", xml)
+        if dc_name is None or contour is None:
+            continue
+        sc.shortenings.append((dc_name.strip(), contour))
+    return sc
+
+
+def _parse_deformable(elem, xml):
+    dc = DeformableComponent(name=_value(elem, "WorkpieceComponentName", xml) or "")
+    dc.bend_line = _value(elem, "VDeformableComponentBendLine", xml)
+    dc.angle = _number(elem, "VDeformableComponentAngle", xml)
+    dc.preferred_inner_radius = _number(elem, "PreferredInnerRadius", xml)
+    dc.actual_inner_radius = _number(elem, "ActualInnerRadius", xml)
+    dc.hulls = _value(elem, "VDeformableComponentHulls", xml)
+    dc.left_static = _value(elem, "LeftStaticComponent/StaticComponentName", xml)
+    dc.right_static = _value(elem, "RightStaticComponent/StaticComponentName", xml)
+    dc.left_side = _value(elem, "LeftStaticComponent/SideReference", xml)
+    dc.right_side = _value(elem, "RightStaticComponent/SideReference", xml)
+    deformation = xml.find(elem, "VBendDeformation")
+    dc.angle_after = _number(deformation, "AngleAfter", xml)
+    dc.angle_before = _number(deformation, "AngleBefore", xml)
+    dc.bend_allowance = _number(deformation, "BendAllowance", xml)
+    return dc
+
+
+def _parse_bend_step(elem, xml):
+    step = BendStep()
+    step.deformation = _value(elem, "Deformation", xml) or ""
+    step.static_component = _value(elem, "WorkpiecePosition/StaticComponentName", xml) or ""
+    step.preferred_inner_radius = _number(elem, "PreferredInnerRadius", xml)
+    ds_state = xml.find(elem, "DeformableSystemState")
+    step.bend_angle = _number(ds_state, "BendAngle", xml)
+    step.bend_length = _number(ds_state, "BendLength", xml)
+    return step
+
+
+def workpiece_from_root(root, xml=ETREE):
+    """
+    Buduje Workpiece z już sparsowanego drzewa (korzeń dokumentu .dld).
+    xml – backend, którym zbudowano drzewo (dld.backends).
+    """
+    wp = Workpiece()
+
+    workpiece = root if root.tag == "Workpiece" else xml.find(root, ".//Workpiece")
+    if workpiece is not None:
+        wp.name = _value(workpiece, "WorkpieceName", xml) or ""
+        wp.dimensions = (_value(workpiece, "WorkpieceDimensions", xml) or "").strip()
+        wp.material = _value(workpiece, "WorkpieceMaterial/MaterialName", xml) or ""
+        wp.main_plane = _value(workpiece, "WorkpieceMap/MainPlaneName", xml) or ""
+        wp.main_plane_transformation = _value(workpiece, "WorkpieceMap/MainPlaneTransformation", xml) or ""
+        signature = xml.find(workpiece, "signature")
+        if signature is not None and signature.text:
+            wp.signature = signature.text.strip()
+
+    thickness = _number(root, ".//WorkpieceThickness", xml)
+    if thickness is not None:
+        wp.thickness = thickness
+
+    wp.static_components = [_parse_static(e, xml) for e in xml.iter(root, "StaticComponent")]
+    wp.deformable_components = [_parse_deformable(e, xml) for e in xml.iter(root, "VDeformableComponent")]
+
+    bend_sequence = xml.find(root, ".//BendSequence")
+    if bend_sequence is not None:
+        wp.has_bend_sequence = True
+        wp.blank_length = _number(bend_sequence, "BlankLength", xml)
+        wp.bend_steps = [_parse_bend_step(e, xml) for e in xml.findall(bend_sequence, "BendStep")]
+        wp.tools = [((_value(ref, "ToolType", xml) or "").strip(), (_value(ref, "ToolName", xml) or "").strip())
+                    for ref in xml.findall(bend_sequence, "ToolConfiguration/ToolGroup/ToolTree/ToolReference")]
+
+    return wp
+
+
+def _read_chunks(file_path):
+    if hasattr(file_path, "read"):
+        source, close = file_path, False
+    else:
+        source, close = open(file_path, "rb"), True
+    try:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        if close:
+            source.close()
+
+
+def _parse_sections(file_path, sections):
+    """
+    Parsuje strumieniowo do chwili zamknięcia wszystkich elementów z sections.
+    Zwraca (korzeń z samymi żądanymi sekcjami, czy_przerwano_odczyt).
+    Elementy dalszej części porcji (np. początek BendSequence) są pomijane.
+    """
+    unknown = set(sections) - {WORKPIECE, BLANK_LENGTH, BEND_SEQUENCE}
+    if unknown:
+        raise ValueError(f"Nieznane sekcje pliku .dld: {', '.join(sorted(unknown))}")
+
+    wanted = set(sections)
+    found = {}
+    parser = ET.XMLPullParser(events=("end",))
+    chunks = _read_chunks(file_path)
+    stopped = False
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                if elem.tag in wanted:
+                    found[elem.tag] = elem
+                    wanted.discard(elem.tag)
+                    if not wanted:
+                        stopped = True
+                        break
+            if stopped:
+                break
+    finally:
+        chunks.close()
+    if not stopped:
+        parser.close()
+
+    root = ET.Element("data")
+    if WORKPIECE in found:
+        root.append(found[WORKPIECE])
+    if BEND_SEQUENCE in found:
+        root.append(found[BEND_SEQUENCE])
+    elif BLANK_LENGTH in found:
+        bend_sequence = ET.SubElement(root, BEND_SEQUENCE)
+        bend_sequence.append(found[BLANK_LENGTH])
+    return root, stopped
+
+
+def parse_workpiece(file_path, sections=None, backend=None):
+    """
+    Parsuje plik .dld (ścieżka lub obiekt plikowy otwarty binarnie) i zwraca Workpiece.
+    sections – opcjonalna lista sekcji (np. GEOMETRY lub (WORKPIECE, BLANK_LENGTH));
+    odczyt kończy się po ich zamknięciu, a wp.sections zawiera listę odczytanych sekcji.
+    backend – "etree" lub "lxml" (domyślnie wg dld.backends.get_backend).
+    Rzuca ET.ParseError, gdy plik nie jest poprawnym XML.
+    """
+    if not sections:
+        xml = get_backend(backend)
+        return workpiece_from_root(xml.parse(file_path), xml)
+
+    root, stopped = _parse_sections(file_path, sections)
+    wp = workpiece_from_root(root)
+    if stopped:
+        wp.sections = tuple(sorted(set(sections)))
+    return wp
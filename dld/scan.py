@@ -0,0 +1,166 @@
+"""
+Szybki odczyt wybranych wartości z pliku .dld bez budowania drzewa XML.
+
+Elementy danych Delem mają postać <Tag unit="..." value="..."/>, więc do
+przeglądu dużej liczby plików (grubość, materiał, tryb wymiarowania, kąty)
+wystarczy znaleźć w surowych bajtach atrybut value wskazanych tagów.
+scan_values przeszukuje plik zmapowany w pamięci (mmap) i tylko sekcję
+<Workpiece> – BendSequence za nią nie jest w ogóle czytany.
+
+Gdy plik wygląda inaczej niż zwykle (brak </Workpiece>, komentarze, CDATA,
+DOCTYPE, inne kodowanie niż UTF-8, obcięty koniec pliku), wynik liczy pełny
+parser ET – w tym zgłasza ET.ParseError dla błędnego XML.
+"""
+
+import mmap
+import re
+import xml.etree.ElementTree as ET
+
+from .units import convert
+
+# Tagi potrzebne do przeglądu (inwentaryzacji) folderów z programami
+INVENTORY_TAGS = (
+    "WorkpieceName",
+    "WorkpieceThickness",
+    "MaterialName",
+    "WorkpieceDimensions",
+    "VDeformableComponentAngle",
+    "AngleAfter",
+)
+
+_WORKPIECE_END = b"</Workpiece>"
+_ROOT_END = b"</xsl:stylesheet>"
+# Konstrukcje, przy których proste wyszukiwanie tagów mogłoby się pomylić
+_UNEXPECTED = (b"<!--", b"<![CDATA[", b"<!DOCTYPE")
+_XML_DECL_RE = re.compile(rb"^\s*<\?xml[^>]*?encoding=[\"']([A-Za-z0-9._-]+)[\"']")
+_VALUE_RE = re.compile(rb"""\svalue\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_ENTITY_RE = re.compile(r"&(#x[0-9A-Fa-f]+|#[0-9]+|amp|lt|gt|quot|apos);")
+_ENTITIES = {"amp": "&", "lt": "<", "gt": ">", "quot": '"', "apos": "'"}
+
+_tag_patterns = {}
+
+
+class UnexpectedStructure(Exception):
+    """Plik wymaga pełnego parsera (wewnętrzny sygnał scan_values)."""
+
+
+def _tag_pattern(tags):
+    """Wyrażenie dla zestawu tagów – kompilowane raz na zestaw."""
+    pattern = _tag_patterns.get(tags)
+    if pattern is None:
+        names = b"|".join(re.escape(t.encode("ascii")) for t in tags)
+        pattern = re.compile(rb"<(" + names + rb")(?=[\s/>])([^>]*)>")
+        _tag_patterns[tags] = pattern
+    return pattern
+
+
+def _entity(match):
+    name = match.group(1)
+    if name[0] == "#":
+        return chr(int(name[2:], 16) if name[1] in "xX" else int(name[1:]))
+    return _ENTITIES[name]
+
+
+def _decode(raw):
+    text = raw.decode("utf-8")
+    if "&" in text:
+        if "&" in _ENTITY_RE.sub("", text):
+            raise UnexpectedStructure("nieznana encja")
+        text = _ENTITY_RE.sub(_entity, text)
+    # Normalizacja białych znaków w atrybutach (jak w parserze XML)
+    if "\t" in text or "\n" in text or "\r" in text:
+        text = text.replace("\r\n", " ").replace("\t", " ").replace("\n", " ").replace("\r", " ")
+    return text
+
+
+def _scan_buffer(data, tags):
+    """Skanuje bufor (bytes lub mmap); rzuca UnexpectedStructure, gdy trzeba ET."""
+    match = _XML_DECL_RE.match(data[:200])
+    if match and match.group(1).lower() not in (b"utf-8", b"utf8", b"us-ascii", b"ascii"):
+        raise UnexpectedStructure("kodowanie")
+    if not data[-64:].rstrip().endswith(_ROOT_END):
+        raise UnexpectedStructure("obcięty plik")
+
+    end = data.find(_WORKPIECE_END)
+    if end < 0:
+        raise UnexpectedStructure("brak </Workpiece>")
+    for marker in _UNEXPECTED:
+        if data.find(marker, 0, end) >= 0:
+            raise UnexpectedStructure(marker.decode())
+
+    values = {tag: [] for tag in tags}
+    for match in _tag_pattern(tags).finditer(data, 0, end):
+        attrs = match.group(2)
+        value = _VALUE_RE.search(attrs)
+        if value is None:
+            values[match.group(1).decode("ascii")].append(None)
+            continue
+        raw = value.group(1) if value.group(1) is not None else value.group(2)
+        values[match.group(1).decode("ascii")].append(_decode(raw))
+    return values
+
+
+def values_from_tree(root, tags=INVENTORY_TAGS):
+    """Te same wartości co scan_values, z drzewa ET (tylko element Workpiece)."""
+    tags = tuple(tags)
+    workpiece = root if root.tag == "Workpiece" else root.find(".//Workpiece")
+    values = {tag: [] for tag in tags}
+    if workpiece is None:
+        return values
+    wanted = set(tags)
+    for elem in workpiece.iter():
+        if elem.tag in wanted:
+            values[elem.tag].append(elem.get("value"))
+    return values
+
+
+def scan_values(source, tags=INVENTORY_TAGS):
+    """
+    Zwraca {tag: [wartości atrybutu value w kolejności z pliku]} dla elementów
+    z sekcji <Workpiece>. Brak atrybutu value daje None na liście.
+    source – ścieżka do pliku lub bytes. Rzuca ET.ParseError dla błędnego XML
+    (wykrytego przez parser zapasowy).
+    """
+    tags = tuple(tags)
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            return _scan_buffer(source, tags)
+        with open(source, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # pusty plik – mmap nie obsługuje długości 0
+                raise UnexpectedStructure("pusty plik")
+            with data:
+                return _scan_buffer(data, tags)
+    except (UnexpectedStructure, UnicodeDecodeError):
+        pass
+
+    if isinstance(source, (bytes, bytearray)):
+        root = ET.fromstring(source)
+    else:
+        root = ET.parse(source).getroot()
+    return values_from_tree(root, tags)
+
+
+def _floats(values):
+    return [convert("RealNumber", value) for value in values]
+
+
+def scan_inventory(source):
+    """
+    Dane do przeglądu folderu: nazwa, grubość, materiał, tryb wymiarowania
+    i kąty gięć (AngleAfter, a gdy jego brak – VDeformableComponentAngle).
+    """
+    values = scan_values(source, INVENTORY_TAGS)
+    thickness = _floats(values["WorkpieceThickness"][:1])
+    angles = _floats(values["AngleAfter"])
+    if len(angles) != len(values["VDeformableComponentAngle"]):
+        angles = _floats(values["VDeformableComponentAngle"])
+    return {
+        "name": (values["WorkpieceName"] or [""])[0] or "",
+        "thickness": thickness[0] if thickness and thickness[0] is not None else 0.0,
+        "material": (values["MaterialName"] or [""])[0] or "",
+        "dimensions": ((values["WorkpieceDimensions"] or [""])[0] or "").strip(),
+        "angles": angles,
+    }
@@ -0,0 +1,192 @@
+"""
+Zwarta tabela odcinków outline (struct-of-arrays).
+
+Ekstraktor odcinków (test_odcinki_v.2.00o3miniDOMcopy.py) zapisywał każdy
+odcinek jako 12-elementową listę Pythona i trzymał listę dla całego folderu.
+SegmentTable trzyma te same dane w kolumnach array ('d', 'i', 'b'), a nazwy
+plików, komponentów i źródeł jako numery w słownikach – pamięć rośnie
+liniowo i kilkukrotnie wolniej niż przy listach list.
+
+Tabela prowadzi od razu indeksy:
+  - file_blocks(fid)  – kolejne outline jednego pliku (źródło, komponent, zakres wierszy)
+  - file_rows(fid)    – zakres wierszy pliku
+(fid – numer pliku zwrócony przez start_file), dzięki czemu podsumowanie
+pliku nie przegląda odcinków innych plików.
+"""
+
+from array import array
+
+# Źródła outline w kolejności, w jakiej zapisuje je ekstraktor
+SOURCES = (
+    "StaticComponentHull",
+    "ShorteningContour",
+    "VDeformableComponentBendLine",
+    "VDeformableComponentHulls",
+)
+
+# Kolumny arkusza wyniki_odcinki_v3.xlsx
+COLUMNS = [
+    "Nazwa pliku", "Komponent", "Źródło outline", "Odcinek nr",
+    "X1", "Y1", "X2", "Y2", "Łuk?", "Długość cięciwy", "Długość łuku", "Skrajny",
+]
+
+_SOURCE_IDS = {name: i for i, name in enumerate(SOURCES)}
+
+
+class Block:
+    """Jeden outline w tabeli: wiersze [start, stop) jednego komponentu i źródła."""
+
+    __slots__ = ("source", "component", "start", "stop")
+
+    def __init__(self, source, component, start, stop):
+        self.source = source
+        self.component = component
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+
+class SegmentTable:
+    """Kolumny odcinków wszystkich plików (patrz COLUMNS)."""
+
+    __slots__ = (
+        "files", "components", "_component_ids",
+        "file_id", "component_id", "source_id", "number",
+        "x1", "y1", "x2", "y2", "is_arc", "chord", "arc_length", "edge",
+        "_file_rows", "_file_blocks",
+    )
+
+    def __init__(self):
+        self.files = []
+        self.components = []
+        self._component_ids = {}
+        self.file_id = array("i")
+        self.component_id = array("i")
+        self.source_id = array("b")
+        self.number = array("i")
+        self.x1 = array("d")
+        self.y1 = array("d")
+        self.x2 = array("d")
+        self.y2 = array("d")
+        self.is_arc = array("b")
+        self.chord = array("d")
+        self.arc_length = array("d")
+        self.edge = array("b")
+        self._file_rows = []
+        self._file_blocks = []
+
+    def __len__(self):
+        return len(self.number)
+
+    def _component(self, name):
+        cid = self._component_ids.get(name)
+        if cid is None:
+            cid = self._component_ids[name] = len(self.components)
+            self.components.append(name)
+        return cid
+
+    def start_file(self, filename):
+        """
+        Rozpoczyna wiersze nowego pliku (kolejne add_outline trafiają do niego).
+        Zwraca numer pliku (fid) do file_rows / file_blocks.
+        """
+        self.files.append(filename)
+        start = len(self)
+        self._file_rows.append((start, start))
+        self._file_blocks.append([])
+        return len(self.files) - 1
+
+    def add_outline(self, component, source, segments, arc_length=None):
+        """
+        Dopisuje odcinki jednego outline do bieżącego pliku.
+        segments – krotki (x1, y1, x2, y2, is_arc, chord) jak z dld.outline_segments;
+        arc_length – stała długość łuku dla wszystkich odcinków, lista długości
+        po odcinku (jak z dld.outline_segment_lengths) albo None (= cięciwa).
+        """
+        fid = len(self.files) - 1
+        cid = self._component(component)
+        sid = _SOURCE_IDS[source]
+        start = len(self)
+        last = len(segments) - 1
+        lengths = arc_length if isinstance(arc_length, (list, tuple)) else None
+        for i, (x1, y1, x2, y2, is_arc, chord) in enumerate(segments):
+            self.file_id.append(fid)
+            self.component_id.append(cid)
+            self.source_id.append(sid)
+            self.number.append(i + 1)
+            self.x1.append(x1)
+            self.y1.append(y1)
+            self.x2.append(x2)
+            self.y2.append(y2)
+            self.is_arc.append(is_arc)
+            self.chord.append(chord)
+            if lengths is not None:
+                self.arc_length.append(lengths[i])
+            else:
+                self.arc_length.append(chord if arc_length is None else arc_length)
+            self.edge.append(i == 0 or i == last)
+        stop = len(self)
+        if stop > start:
+            self._file_blocks[fid].append(Block(source, component, start, stop))
+            self._file_rows[fid] = (self._file_rows[fid][0], stop)
+
+    def file_rows(self, fid):
+        """Zakres wierszy (start, stop) pliku."""
+        return self._file_rows[fid]
+
+    def file_blocks(self, fid):
+        """Outline pliku w kolejności dopisania."""
+        return self._file_blocks[fid]
+
+    def row(self, i):
+        """Wiersz i jako lista w kolejności COLUMNS."""
+        return [
+            self.files[self.file_id[i]], self.components[self.component_id[i]],
+            SOURCES[self.source_id[i]], self.number[i],
+            self.x1[i], self.y1[i], self.x2[i], self.y2[i], bool(self.is_arc[i]),
+            self.chord[i], self.arc_length[i], bool(self.edge[i]),
+        ]
+
+    def rows(self, start=0, stop=None):
+        stop = len(self) if stop is None else stop
+        for i in range(start, stop):
+            yield self.row(i)
+
+    def column_arrays(self, start=0, stop=None):
+        """
+        Kolumny wierszy [start, stop) jako tablice NumPy {nazwa z COLUMNS: ndarray}
+        (kopie – niezależne od dalszego dopisywania do tabeli).
+        """
+        import numpy as np
+
+        stop = len(self) if stop is None else stop
+        files = np.array(self.files, dtype=object)
+        components = np.array(self.components, dtype=object)
+        sources = np.array(SOURCES, dtype=object)
+
+        def view(buffer, dtype):
+            return np.frombuffer(buffer, dtype=dtype)[start:stop]
+
+        columns = [
+            files[view(self.file_id, np.intc)],
+            components[view(self.component_id, np.intc)],
+            sources[view(self.source_id, np.int8)],
+            view(self.number, np.intc).astype(np.int64),
+            view(self.x1, np.float64).copy(),
+            view(self.y1, np.float64).copy(),
+            view(self.x2, np.float64).copy(),
+            view(self.y2, np.float64).copy(),
+            view(self.is_arc, np.int8).astype(bool),
+            view(self.chord, np.float64).copy(),
+            view(self.arc_length, np.float64).copy(),
+            view(self.edge, np.int8).astype(bool),
+        ]
+        return dict(zip(COLUMNS, columns))
+
+    def to_dataframe(self, start=0, stop=None):
+        """DataFrame z kolumnami COLUMNS (pandas importowany dopiero tutaj)."""
+        import pandas as pd
+
+        return pd.DataFrame(self.column_arrays(start, stop), columns=COLUMNS)
@@ -0,0 +1,616 @@
+"""
+Sprawdzenie sekwencji gięć (BendSequence) – kolejność i kolizje z narzędziami.
+
+Każdy BendStep (Deformation "Def00DC01" -> strefa DC01) symulowany jest
+w dld.fold: strefy zgięte we wcześniejszych krokach mają kąt kroku, strefy
+jeszcze niezgięte są płaskie (180), a bieżąca przechodzi fazy ruchu belki
+(STAGES – ułamki ugięcia od płaskiej blachy do kąta kroku). Detal ustawiany
+jest w układzie prasy: ostrze stempla w środku łuku bieżącej strefy (po
+stronie wnętrza gięcia), y w górę, z wzdłuż linii gięcia, x w stronę
+zderzaka (flansza z WorkpiecePosition); matryca podniesiona do oparcia
+flansz o ramiona V.
+
+Narzędzia (ToolReference/ToolName – pierwszy stempel i pierwsza matryca)
+to przekroje wypukłe wyciągnięte wzdłuż z: stempel i matryca na długości
+gięcia, belka i stół na całej długości prasy. Kolizje: najpierw
+prostopadłościany otaczające (AABB) wszystkich powierzchni blachy kontra
+wszystkich części narzędzi naraz, potem dokładny test wielokątów dla par,
+które przeszły odsiew. Styk do CONTACT_TOLERANCE nie jest kolizją.
+
+    result = check_sequence(wp)             # z cache (geometria i sekwencja, narzędzia)
+    result.status                           # OK / BŁĄD / NIEPOTWIERDZONE
+    result.collisions, result.problems      # pewne (wymiary narzędzi znane)
+    result.unverified_collisions, result.unverified
+    check_files(paths, workers=8)           # setki programów równolegle
+
+Plik .dld zawiera tylko nazwy narzędzi. Wymiary: tablica ze zmiennej
+DLD_TOOL_TABLE (load_tool_table, kolumny TOOL_COLUMNS; belka i stół prasy
+jako wiersze typu BEAM / TABLE), brakujące – z nazwy (V22 – otwarcie
+matrycy, H115 – wysokość), a pozostałe wartości domyślne. Wymiary
+domyślne to zgadywanie: kolizje i problemy od nich zależne trafiają do
+unverified_collisions / unverified, a wynik bez znalezisk przy takich
+wymiarach nie jest potwierdzeniem (status NIEPOTWIERDZONE). Tylko
+z pełnymi wymiarami z tablicy wynik jest decyzją o wysłaniu programu na prasę.
+"""
+
+import functools
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Tuple
+
+import numpy as np
+
+from .dimensions import normalize_angles
+from .flat import compute_flat_pattern, geometry_key
+from .fold import ANGLE_EPS, fold_pattern
+from .parser import parse_workpiece
+from .units import read_table
+
+# Fazy ruchu belki: ułamek ugięcia bieżącej strefy
+STAGES = (0.0, 0.5, 1.0)
+
+# Wnikanie do tej głębokości [mm] to styk, nie kolizja
+CONTACT_TOLERANCE = 0.1
+
+# Domyślne wymiary narzędzi [mm, °]
+DEFAULT_PUNCH_HEIGHT = 100.0
+DEFAULT_PUNCH_ANGLE = 30.0
+DEFAULT_PUNCH_WIDTH = 20.0
+DEFAULT_DIE_HEIGHT = 60.0
+DEFAULT_DIE_ANGLE = 30.0
+DEFAULT_V_FACTOR = 8.0      # otwarcie V = 8 x grubość, gdy nieznane
+DIE_SHOULDER = 5.0          # szerokość ramienia matrycy (domyślna szerokość matrycy)
+DIE_BASE = 10.0             # najmniejsza grubość matrycy pod rowkiem V
+
+# Belka nad stemplem i stół pod matrycą (przekrój, na całej długości prasy) – domyślne
+BEAM_WIDTH = 100.0
+BEAM_HEIGHT = 200.0
+
+# Tyle różnych programów mieści domyślny cache
+DEFAULT_MAXSIZE = 4096
+
+# Tyle plików dostaje naraz jeden proces (check_files)
+CHUNK_SIZE = 16
+
+# ToolType z pliku; BEAM / TABLE – belka i stół prasy (tylko w tablicy narzędzi)
+PUNCH = "Punch"
+DIE = "Die"
+BEAM = "Beam"
+TABLE = "Table"
+
+# Status wyniku (SequenceCheck.status)
+STATUS_OK = "OK"
+STATUS_FAILED = "BŁĄD"
+STATUS_UNVERIFIED = "NIEPOTWIERDZONE"
+
+# Kolumny tablicy narzędzi (puste wartości – z nazwy albo domyślne)
+TOOL_COLUMNS = ("Narzędzie", "Typ", "Wysokość", "Kąt", "Szerokość", "Otwarcie V")
+
+# Narzędzie: kind – PUNCH / DIE, height – wysokość, angle – kąt ostrza / rowka V,
+# width – szerokość przekroju, opening – otwarcie V (tylko matryca),
+# guessed – nazwy pól z wartością domyślną (puste – wymiary znane)
+ToolSpec = namedtuple("ToolSpec", "name kind height angle width opening guessed")
+
+# Kolizja: step – numer kroku, stage – faza ruchu belki, piece – flansza / strefa,
+# tool – część narzędzia, verified – wymiary tej części znane (nie domyślne)
+Collision = namedtuple("Collision", "step stage piece tool verified")
+
+# Krok sekwencji: index – numer BendStep (od 1), deformation – strefa DC, angle – kąt kroku,
+# collisions – wszystkie kolizje kroku, problems – pewne problemy, unverified – problemy
+# zależne od wymiarów domyślnych
+StepCheck = namedtuple("StepCheck",
+                       "index deformation static_component angle collisions problems unverified")
+
+_DEFORMATION = re.compile(r"^Def\d*(.+)$")
+_OPENING = re.compile(r"(?:^|[-_ ])V=?(\d+(?:[.,]\d+)?)")
+_HEIGHT = re.compile(r"(?:^|[-_ ])H(\d+(?:[.,]\d+)?)")
+
+
+@dataclass(frozen=True)
+class SequenceCheck:
+    """
+    Wynik sprawdzenia sekwencji gięć detalu.
+      - has_sequence – plik ma <BendSequence>
+      - steps        – StepCheck kroków gnących strefy z rysunku
+      - skipped      – numery kroków bez odpowiednika na rysunku (niesprawdzane)
+      - missing      – strefy z rysunku, których nie gnie żaden krok
+      - tools        – (stempel, matryca, belka, stół) użyte w symulacji
+      - pairs, exact – par (powierzchnia blachy, część narzędzia) i dokładnych testów po odsiewie AABB
+    """
+    name: str
+    has_sequence: bool
+    steps: Tuple[StepCheck, ...] = ()
+    skipped: Tuple[int, ...] = ()
+    missing: Tuple[str, ...] = ()
+    tools: Tuple[ToolSpec, ...] = ()
+    pairs: int = 0
+    exact: int = 0
+
+    @property
+    def collisions(self):
+        """Kolizje z narzędziami o znanych wymiarach."""
+        return tuple(c for step in self.steps for c in step.collisions if c.verified)
+
+    @property
+    def unverified_collisions(self):
+        """Kolizje z narzędziami o wymiarach domyślnych (do sprawdzenia, nie rozstrzygające)."""
+        return tuple(c for step in self.steps for c in step.collisions if not c.verified)
+
+    @property
+    def problems(self):
+        """Pewne problemy inne niż kolizje (krok: opis)."""
+        problems = [f"krok {step.index}: {text}" for step in self.steps for text in step.problems]
+        problems.extend(f"strefa {name} nie jest gięta w sekwencji" for name in self.missing)
+        return tuple(problems)
+
+    @property
+    def unverified(self):
+        """Problemy zależne od wymiarów domyślnych (krok: opis)."""
+        return tuple(f"krok {step.index}: {text}" for step in self.steps for text in step.unverified)
+
+    @property
+    def guessed_tools(self):
+        """Narzędzia z wymiarami domyślnymi: (rodzaj, nazwa, pola domyślne)."""
+        return tuple((t.kind, t.name, t.guessed) for t in self.tools if t.guessed)
+
+    @property
+    def feasible(self):
+        """Brak pewnych kolizji i problemów (nie oznacza potwierdzenia – zob. status)."""
+        return self.has_sequence and not self.collisions and not self.problems
+
+    @property
+    def status(self):
+        """
+        STATUS_FAILED – pewna kolizja / problem, STATUS_OK – brak znalezisk przy
+        znanych wymiarach wszystkich narzędzi, STATUS_UNVERIFIED – pozostałe
+        (wynik zależy od wymiarów domyślnych); None – brak sekwencji.
+        """
+        if not self.has_sequence:
+            return None
+        if not self.feasible:
+            return STATUS_FAILED
+        if self.unverified_collisions or self.unverified or self.guessed_tools:
+            return STATUS_UNVERIFIED
+        return STATUS_OK
+
+
+def _number_or_none(value):
+    text = str(value).strip().replace(",", ".")
+    return float(text) if text else None
+
+
+def load_tool_table(path):
+    """
+    Tablica narzędzi {(typ, nazwa): ToolSpec} z pliku .csv (";" lub ",") albo .xlsx
+    z kolumnami TOOL_COLUMNS. Typ: Punch / Die (nazwy jak ToolName w plikach .dld)
+    albo Beam / Table – belka i stół prasy (Wysokość, Szerokość; nazwa dowolna).
+    """
+    table = {}
+    for row in read_table(path, TOOL_COLUMNS, "Tablica narzędzi"):
+        name = str(row["Narzędzie"]).strip()
+        kind = str(row["Typ"]).strip()
+        if not name:
+            continue
+        if kind not in (PUNCH, DIE, BEAM, TABLE):
+            raise ValueError(f"Tablica narzędzi {path}: typ {kind!r} narzędzia {name} "
+                             f"(oczekiwano {PUNCH} / {DIE} / {BEAM} / {TABLE})")
+        table[(kind, name)] = ToolSpec(name, kind, *(_number_or_none(row[c]) for c in TOOL_COLUMNS[2:]), ())
+    return table
+
+
+_default_table = None
+
+
+def default_tool_table():
+    """Tablica narzędzi procesu: plik ze zmiennej DLD_TOOL_TABLE albo pusta (wymiary z nazw)."""
+    global _default_table
+    if _default_table is None:
+        path = os.environ.get("DLD_TOOL_TABLE")
+        _default_table = load_tool_table(path) if path else {}
+    return _default_table
+
+
+def _from_name(pattern, name):
+    match = pattern.search(name)
+    return float(match.group(1).replace(",", ".")) if match else None
+
+
+def _fill(values, defaults):
+    """Wartości z domyślnymi w miejsce None i nazwy pól uzupełnionych domyślnie."""
+    filled = {}
+    guessed = []
+    for field, value in values.items():
+        if value is None:
+            value = defaults[field]
+            guessed.append(field)
+        filled[field] = value
+    return filled, tuple(guessed)
+
+
+def tool_spec(kind, name, thickness, table=None):
+    """ToolSpec narzędzia: wymiary z tablicy, brakujące – z nazwy albo domyślne (pole guessed)."""
+    if table is None:
+        table = default_tool_table()
+    known = table.get((kind, name))
+    height, angle, width, opening = known[2:6] if known else (None, None, None, None)
+    height = height or _from_name(_HEIGHT, name)
+    if kind == PUNCH:
+        values, guessed = _fill({"height": height, "angle": angle, "width": width},
+                                {"height": DEFAULT_PUNCH_HEIGHT, "angle": DEFAULT_PUNCH_ANGLE,
+                                 "width": DEFAULT_PUNCH_WIDTH})
+        return ToolSpec(name, kind, opening=None, guessed=guessed, **values)
+    opening = opening or _from_name(_OPENING, name)
+    default_opening = round(DEFAULT_V_FACTOR * (thickness or 1.0), 1)
+    values, guessed = _fill({"height": height, "angle": angle, "width": width, "opening": opening},
+                            {"height": DEFAULT_DIE_HEIGHT, "angle": DEFAULT_DIE_ANGLE,
+                             "width": (opening or default_opening) + 2 * DIE_SHOULDER,
+                             "opening": default_opening})
+    return ToolSpec(name, kind, guessed=guessed, **values)
+
+
+def machine_spec(kind, table=None):
+    """ToolSpec belki (BEAM) albo stołu (TABLE): pierwszy wiersz tego typu z tablicy albo domyślne."""
+    if table is None:
+        table = default_tool_table()
+    known = next((spec for (k, _), spec in sorted(table.items()) if k == kind), None)
+    values, guessed = _fill({"height": known.height if known else None, "width": known.width if known else None},
+                            {"height": BEAM_HEIGHT, "width": BEAM_WIDTH})
+    return ToolSpec(known.name if known else "", kind, angle=None, opening=None, guessed=guessed, **values)
+
+
+def tool_set(wp, table=None):
+    """
+    (stempel, matryca, belka, stół) detalu – stempel i matryca pierwsze
+    z BendSequence/ToolConfiguration (bez nazwy, gdy brak).
+    """
+    names = {}
+    for kind, name in wp.tools:
+        names.setdefault(kind, name)
+    return (tool_spec(PUNCH, names.get(PUNCH, ""), wp.thickness, table),
+            tool_spec(DIE, names.get(DIE, ""), wp.thickness, table),
+            machine_spec(BEAM, table),
+            machine_spec(TABLE, table))
+
+
+def deformation_zone(deformation):
+    """Nazwa strefy DC z wartości Deformation kroku ("Def00DC01" -> "DC01")."""
+    match = _DEFORMATION.match(deformation)
+    return match.group(1) if match else deformation
+
+
+def _rectangle(x0, y0, x1, y1):
+    return np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.float64)
+
+
+def _punch_parts(spec):
+    """Części wypukłe (przeciwnie do wskazówek zegara) stempla z ostrzem w (0, 0), w górę."""
+    half_angle = math.radians(spec.angle) / 2.0
+    tip = min(spec.width / 2.0 / math.tan(half_angle), spec.height)
+    tip_half = tip * math.tan(half_angle)
+    parts = [np.array([[0.0, 0.0], [tip_half, tip], [-tip_half, tip]])]
+    if tip < spec.height:
+        parts.append(_rectangle(-tip_half, tip, tip_half, spec.height))
+    return parts
+
+
+def _die_parts(spec):
+    """Części wypukłe matrycy z górą ramion w y = 0 i rowkiem V w x = 0; wysokość matrycy."""
+    half = spec.opening / 2.0
+    depth = half / math.tan(math.radians(spec.angle) / 2.0)
+    height = max(spec.height, depth + DIE_BASE)
+    outer = max(spec.width / 2.0, half + DIE_BASE)
+    left = np.array([[-outer, -height], [0.0, -height], [0.0, -depth], [-half, 0.0], [-outer, 0.0]])
+    right = np.array([[0.0, -height], [outer, -height], [outer, 0.0], [half, 0.0], [0.0, -depth]])
+    return [left, right], height
+
+
+def _tool_parts(punch, die, beam, bed, die_top, z_range):
+    """
+    (etykieta, wielokąt (K, 2), z_min, z_max, znane) części narzędzi w układzie prasy;
+    znane – wymiary części i tego, na czym jest zamocowana, nie są domyślne.
+    """
+    low, high = z_range
+    punch_name = punch.name or "stempel"
+    die_name = die.name or "matryca"
+    parts = [(punch_name, polygon, low, high, not punch.guessed) for polygon in _punch_parts(punch)]
+    parts.append(("belka", _rectangle(-beam.width / 2.0, punch.height, beam.width / 2.0,
+                                      punch.height + beam.height), -math.inf, math.inf,
+                  not beam.guessed and "height" not in punch.guessed))
+    die_polygons, die_height = _die_parts(die)
+    offset = np.array([0.0, die_top])
+    parts.extend((die_name, polygon + offset, low, high, not die.guessed) for polygon in die_polygons)
+    parts.append(("stół", _rectangle(-bed.width / 2.0, die_top - die_height - bed.height,
+                                     bed.width / 2.0, die_top - die_height), -math.inf, math.inf,
+                  not bed.guessed and not die.guessed))
+    return parts
+
+
+def _press_frame(part, zone, positioned):
+    """(R (3, 3), ostrze (3,)) – punkt p w układzie prasy to R @ (p - ostrze)."""
+    up = zone.inner / np.linalg.norm(zone.inner)
+    along = zone.axis - (zone.axis @ up) * up
+    along /= np.linalg.norm(along)
+    depth = np.cross(up, along)
+    tip = zone.middle + up * part.thickness / 2.0
+    flanges = dict(part.flanges)
+    if positioned in flanges and (flanges[positioned].mean(axis=0) - tip) @ depth < 0:
+        # flansza przy zderzaku z tyłu prasy (obrót o 180° wokół pionu)
+        depth, along = -depth, -along
+    return np.array([depth, up, along]), tip
+
+
+def _flat_component(part, start, current):
+    """
+    Flansze i strefy gięcia połączone płasko z flanszą start: przejście przez
+    strefy jeszcze niezgięte (180°) z pominięciem bieżącej strefy current.
+    """
+    flanges = {start}
+    zones = []
+    level = [start]
+    while level:
+        reached = []
+        for zone in part.zones:
+            if zone.name == current or abs(zone.angle) > ANGLE_EPS or zone.name in zones:
+                continue
+            for here, there in ((zone.left, zone.right), (zone.right, zone.left)):
+                if here in level and there not in flanges:
+                    zones.append(zone.name)
+                    flanges.add(there)
+                    reached.append(there)
+        level = reached
+    return flanges, zones
+
+
+def _die_top(part, zone, rotation, tip, opening):
+    """
+    Wysokość ramion matrycy (oparcie blachy po obu stronach strefy na ± V/2)
+    i flansze nie sięgające ramion. Po każdej stronie liczy się cała część
+    blachy płasko połączona z flanszą strefy (_flat_component) – flansza za
+    niezgiętą jeszcze strefą leży w tej samej płaszczyźnie i też opiera się
+    o ramię.
+    """
+    half = part.thickness / 2.0
+    flanges = dict(part.flanges)
+    normals = dict(part.normals)
+    bends = dict(part.bends)
+    heights = []
+    short = []
+    for name in (zone.left, zone.right):
+        normal = normals[name] if normals[name] @ zone.inner >= 0 else -normals[name]
+        side = 1.0 if ((flanges[name] - tip) @ rotation.T)[:, 0].mean() >= 0 else -1.0
+        component, flat_zones = _flat_component(part, name, zone.name)
+        sheet = np.vstack([flanges[n] for n in component if n in flanges] + [bends[n] for n in flat_zones])
+        outer = (sheet - half * normal - tip) @ rotation.T
+        reach = outer[:, 0] * side
+        if reach.max() < opening / 2.0 - CONTACT_TOLERANCE:
+            short.append(name)
+            continue
+        order = np.argsort(reach)
+        heights.append(float(np.interp(opening / 2.0, reach[order], outer[order, 1])))
+    return (min(heights) if heights else -part.thickness), short
+
+
+def _clip_slab(ring, low, high):
+    """Wielokąt 3D (K, 3) obcięty do warstwy low <= z <= high (Sutherland–Hodgman)."""
+    for bound, keep in ((low, 1.0), (high, -1.0)):
+        if not math.isfinite(bound) or not len(ring):
+            continue
+        distance = keep * (ring[:, 2] - bound)
+        clipped = []
+        for p, q, dp, dq in zip(ring, np.roll(ring, -1, axis=0), distance, np.roll(distance, -1)):
+            if dp >= 0:
+                clipped.append(p)
+            if (dp >= 0) != (dq >= 0):
+                clipped.append(p + (q - p) * (dp / (dp - dq)))
+        ring = np.array(clipped).reshape(-1, 3)
+    return ring
+
+
+def _inside(point, ring):
+    """Czy punkt (2,) leży wewnątrz wielokąta ring (K, 2) (reguła parzystości)."""
+    a, b = ring, np.roll(ring, -1, axis=0)
+    crosses = (a[:, 1] > point[1]) != (b[:, 1] > point[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = a[:, 0] + (point[1] - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+    return bool(np.count_nonzero(crosses & (point[0] < x)) % 2)
+
+
+def _intersects(ring, polygon, tolerance):
+    """
+    Czy wielokąt ring (K, 2) wchodzi we wnętrze wypukłego polygon (przeciwnie do
+    wskazówek zegara) głębiej niż tolerance – przycinanie odcinków półpłaszczyznami
+    (Cyrus–Beck) dla wszystkich krawędzi naraz, potem polygon wewnątrz ring.
+    """
+    if len(ring) < 2:
+        return False
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    normals = np.column_stack((-edges[:, 1], edges[:, 0]))
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    offsets = np.einsum("ij,ij->i", normals, polygon) + tolerance
+    inside = ring @ normals.T - offsets
+    delta = (np.roll(ring, -1, axis=0) - ring) @ normals.T
+    parallel = np.abs(delta) < 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = -inside / delta
+    enter = np.where(delta > 1e-12, t, -np.inf).max(axis=1)
+    leave = np.where(delta < -1e-12, t, np.inf).min(axis=1)
+    outside = (parallel & (inside < 0)).any(axis=1)
+    if ((~outside) & (np.maximum(enter, 0.0) < np.minimum(leave, 1.0))).any():
+        return True
+    return len(ring) > 2 and _inside(polygon.mean(axis=0), ring)
+
+
+def _collisions(skins, tools):
+    """Kolizje [(powierzchnia, narzędzie, znane)], liczba par i dokładnych testów (po odsiewie AABB)."""
+    if not skins or not tools:
+        return [], 0, 0
+    low = np.array([ring.min(axis=0) for _, ring in skins])
+    high = np.array([ring.max(axis=0) for _, ring in skins])
+    tool_low = np.array([[*polygon.min(axis=0), z0] for _, polygon, z0, _, _ in tools])
+    tool_high = np.array([[*polygon.max(axis=0), z1] for _, polygon, _, z1, _ in tools])
+    overlap = np.all((low[:, None] < tool_high[None] - CONTACT_TOLERANCE)
+                     & (high[:, None] > tool_low[None] + CONTACT_TOLERANCE), axis=2)
+    found = []
+    for i, j in np.argwhere(overlap):
+        label, polygon, z0, z1, known = tools[j]
+        ring = _clip_slab(skins[i][1], z0 + CONTACT_TOLERANCE, z1 - CONTACT_TOLERANCE)
+        if _intersects(ring[:, :2], polygon, CONTACT_TOLERANCE):
+            found.append((skins[i][0], label, known))
+    return found, overlap.size, int(overlap.sum())
+
+
+def _stage_angle(angle, stage):
+    """Kąt strefy w fazie stage (0 – płaska, 1 – kąt angle), ze znakiem kierunku gięcia."""
+    normalized = float(normalize_angles([angle])[0])
+    return math.copysign(180.0 - stage * (180.0 - abs(normalized)), normalized)
+
+
+def sequence_key(wp, table=None):
+    """Klucz cache: geometria (geometry_key), kąty, kroki sekwencji i narzędzia."""
+    return (
+        geometry_key(wp),
+        wp.thickness,
+        wp.main_plane_transformation,
+        tuple((dc.name, dc.bend_angle) for dc in wp.deformable_components),
+        wp.has_bend_sequence,
+        tuple((deformation_zone(s.deformation) if s.deformation else "", s.static_component, s.bend_angle)
+              for s in wp.bend_steps),
+        tool_set(wp, table),
+    )
+
+
+def compute_sequence_check(key, name=""):
+    """SequenceCheck dla klucza sequence_key (bez cache)."""
+    geometry, thickness, transformation, angles, has_sequence, steps, tools = key
+    if not has_sequence:
+        return SequenceCheck(name, False, tools=tools)
+    punch, die, beam, bed = tools
+    pattern = compute_flat_pattern(geometry)
+    targets = {n: a for n, a in angles if a is not None}
+    state = {n: 180.0 for n in targets}
+    checked = []
+    skipped = []
+    bent = set()
+    pairs = exact = 0
+    for index, (zone_name, positioned, step_angle) in enumerate(steps, 1):
+        if not zone_name:
+            skipped.append(index)
+            continue
+        if zone_name not in targets:
+            checked.append(StepCheck(index, zone_name, positioned, step_angle, (),
+                                     (f"brak strefy {zone_name} na rysunku",), ()))
+            continue
+        target = targets[zone_name]
+        if step_angle is not None:
+            # BendAngle kroku to kąt bez kierunku – kierunek z kąta strefy na rysunku
+            target = math.copysign(step_angle, float(normalize_angles([target])[0]))
+        collisions = {}
+        problems = []
+        unverified = []
+        for stage in STAGES:
+            angles_now = dict(state)
+            angles_now[zone_name] = _stage_angle(target, stage)
+            part = fold_pattern(pattern, angles_now, thickness, transformation)
+            zone = next((z for z in part.zones if z.name == zone_name), None)
+            flanges = dict(part.flanges)
+            if zone is None or zone.left not in flanges or zone.right not in flanges:
+                problems.append(f"strefa {zone_name} bez położenia w rozwinięciu")
+                break
+            rotation, tip = _press_frame(part, zone, positioned)
+            die_top, short = _die_top(part, zone, rotation, tip, die.opening)
+            # zależy tylko od otwarcia V – pewne, gdy otwarcie znane
+            found_in = unverified if "opening" in die.guessed else problems
+            for flange in short:
+                text = f"flansza {flange} nie sięga ramion matrycy V{die.opening:g}"
+                if text not in found_in:
+                    found_in.append(text)
+            skins = [(n, (ring - tip) @ rotation.T) for n, ring in part.skins() if n != zone_name]
+            strip = (dict(part.bends)[zone_name] - tip) @ rotation.T
+            tool_parts = _tool_parts(punch, die, beam, bed, die_top, (strip[:, 2].min(), strip[:, 2].max()))
+            found, n_pairs, n_exact = _collisions(skins, tool_parts)
+            pairs += n_pairs
+            exact += n_exact
+            for piece, tool, known in found:
+                collisions.setdefault((piece, tool), Collision(index, stage, piece, tool, known))
+        state[zone_name] = target
+        bent.add(zone_name)
+        checked.append(StepCheck(index, zone_name, positioned, target, tuple(collisions.values()),
+                                 tuple(problems), tuple(unverified)))
+    return SequenceCheck(
+        name=name,
+        has_sequence=True,
+        steps=tuple(checked),
+        skipped=tuple(skipped),
+        missing=tuple(n for n in targets if n not in bent),
+        tools=tools,
+        pairs=pairs,
+        exact=exact,
+    )
+
+
+class SequenceCheckCache:
+    """
+    Cache LRU sprawdzeń sekwencji kluczowany sequence_key – ten sam program
+    (geometria, sekwencja) z tymi samymi narzędziami sprawdzany jest raz.
+      - get(wp, table) – SequenceCheck detalu (z nazwą detalu)
+      - stats          – liczniki: hits, misses
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError(f"maxsize musi być dodatnie: {maxsize}")
+        self.maxsize = maxsize
+        self._compute = functools.lru_cache(maxsize=maxsize)(compute_sequence_check)
+
+    def get(self, wp, table=None):
+        result = self._compute(sequence_key(wp, table))
+        if result.name != wp.name:
+            result = replace(result, name=wp.name)
+        return result
+
+    @property
+    def stats(self):
+        info = self._compute.cache_info()
+        return {"hits": info.hits, "misses": info.misses}
+
+    def __len__(self):
+        return self._compute.cache_info().currsize
+
+    def clear(self):
+        """Czyści cache i liczniki."""
+        self._compute.cache_clear()
+
+
+_default_cache = SequenceCheckCache()
+
+
+def check_sequence(wp, cache=None, table=None):
+    """SequenceCheck detalu (Workpiece) z cache (domyślnie wspólnego dla procesu)."""
+    if cache is None:
+        cache = _default_cache
+    return cache.get(wp, table)
+
+
+def check_file(path):
+    """SequenceCheck pliku .dld albo None (błędny XML)."""
+    try:
+        wp = parse_workpiece(path)
+    except ET.ParseError:
+        return None
+    return check_sequence(wp)
+
+
+def check_files(paths, workers=None):
+    """
+    SequenceCheck dla listy plików (None dla plików z błędem), w kolejności paths.
+    workers – liczba procesów (None – liczba rdzeni, 1 – bez procesów).
+    """
+    if workers == 1 or len(paths) <= CHUNK_SIZE:
+        return [check_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check_file, paths, chunksize=CHUNK_SIZE))
@@ -0,0 +1,144 @@
+"""
+Kolumnowy magazyn odcinków (Parquet / Feather) zamiast wyniki_odcinki_v3.xlsx.
+
+Magazyn to katalog z jednym plikiem na detal:
+
+    wyniki_odcinki_v3/
+        prd.40047020.dld.parquet
+        prd.60x30.dld.parquet
+        ...
+
+Każdy plik ma kolumny arkusza (dld.segments.COLUMNS). Testery czytają
+tylko potrzebne pliki i kolumny:
+
+    read_segments("wyniki_odcinki_v3", files=["prd.60x30.dld"],
+                  columns=["Komponent", "Odcinek nr", "Długość łuku"])
+
+Wymaga pakietu pyarrow (pip install pyarrow); bez niego store_available()
+zwraca False, a skrypty zostają przy Excelu – segments_loader wybiera
+źródło za nie:
+
+    load_segments = segments_loader(columns=["Komponent", "Odcinek nr"])
+    df = load_segments("prd.60x30.dld")
+"""
+
+import os
+
+from .segments import COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow jest opcjonalny
+    pa = None
+
+# Domyślny katalog magazynu (obok dawnego wyniki_odcinki_v3.xlsx)
+SEGMENT_STORE = "wyniki_odcinki_v3"
+
+# Arkusz odcinków, z którego czytają skrypty bez magazynu
+SEGMENT_WORKBOOK = "wyniki_odcinki_v3.xlsx"
+
+FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+
+
+def store_available():
+    return pa is not None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Magazyn odcinków wymaga pakietu pyarrow (pip install pyarrow)")
+
+
+def _partition_path(store_dir, filename, fmt):
+    return os.path.join(store_dir, filename + FORMATS[fmt])
+
+
+def clear_store(store_dir=SEGMENT_STORE):
+    """Tworzy katalog magazynu lub usuwa z niego pliki z poprzedniego przebiegu."""
+    os.makedirs(store_dir, exist_ok=True)
+    for name in os.listdir(store_dir):
+        if name.endswith(tuple(FORMATS.values())):
+            os.remove(os.path.join(store_dir, name))
+
+
+def write_file_segments(table, fid, store_dir=SEGMENT_STORE, fmt="parquet"):
+    """Zapisuje odcinki jednego pliku z SegmentTable (fid z start_file) jako osobną partycję."""
+    _require_pyarrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"Nieznany format magazynu: {fmt}")
+    start, stop = table.file_rows(fid)
+    arrays = table.column_arrays(start, stop)
+    arrow_table = pa.table({
+        name: pa.array(values, type=pa.string()) if values.dtype == object else pa.array(values)
+        for name, values in arrays.items()
+    })
+    path = _partition_path(store_dir, table.files[fid], fmt)
+    if fmt == "parquet":
+        pq.write_table(arrow_table, path)
+    else:
+        feather.write_feather(arrow_table, path)
+    return path
+
+
+def write_segments(table, store_dir=SEGMENT_STORE, fmt="parquet"):
+    """Zapisuje wszystkie pliki z tabeli (po jednej partycji na plik)."""
+    for fid in range(len(table.files)):
+        write_file_segments(table, fid, store_dir, fmt)
+
+
+def store_files(store_dir=SEGMENT_STORE):
+    """Nazwy detali (plików .dld) zapisanych w magazynie."""
+    names = []
+    for name in sorted(os.listdir(store_dir)):
+        for ext in FORMATS.values():
+            if name.endswith(ext):
+                names.append(name[:-len(ext)])
+    return names
+
+
+def _read_partition(store_dir, filename, columns):
+    for fmt, ext in FORMATS.items():
+        path = _partition_path(store_dir, filename, fmt)
+        if os.path.exists(path):
+            if fmt == "parquet":
+                return pq.read_table(path, columns=columns)
+            return feather.read_table(path, columns=columns)
+    return None
+
+
+def read_segments(store_dir=SEGMENT_STORE, files=None, columns=None):
+    """
+    DataFrame odcinków z magazynu.
+      files   – nazwy detali (np. "prd.60x30.dld"); None = wszystkie
+      columns – kolumny do odczytu; None = wszystkie (COLUMNS)
+    Detale bez partycji są pomijane.
+    """
+    _require_pyarrow()
+    columns = list(columns) if columns is not None else list(COLUMNS)
+    names = store_files(store_dir) if files is None else files
+    tables = []
+    for filename in names:
+        part = _read_partition(store_dir, filename, columns)
+        if part is not None and part.num_rows:
+            tables.append(part)
+    if not tables:
+        import pandas as pd
+        return pd.DataFrame(columns=columns)
+    return pa.concat_tables(tables).to_pandas()
+
+
+def segments_loader(columns=None, store_dir=SEGMENT_STORE, workbook=SEGMENT_WORKBOOK):
+    """
+    Zwraca funkcję file_name -> DataFrame odcinków detalu.
+    Magazyn store_dir czytany jest plik po pliku i tylko kolumny columns;
+    bez magazynu (albo bez pyarrow) – cały arkusz workbook raz, a funkcja
+    zwraca go dla każdego detalu (filtrowanie po "Nazwa pliku" po stronie
+    wywołującego, jak dotąd).
+    """
+    if store_available() and os.path.isdir(store_dir):
+        return lambda file_name: read_segments(store_dir, files=[file_name], columns=columns)
+    import pandas as pd
+    df_odcinki = pd.read_excel(workbook)
+    return lambda file_name: df_odcinki
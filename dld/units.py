@@ -0,0 +1,191 @@
+"""
+Konwersja wartości z plików .dld według atrybutu unit.
+
+Każdy element danych Delem ma postać <Tag unit="..." value="..."/>. Zamiast
+ręcznego float(...)/replace(',', '.')/try-except w każdym skrypcie, wartość
+zamienia się jednym wywołaniem:
+
+    convert("MilliMeter", "2,5")       -> 2.5
+    convert("Boolean", "false")        -> False
+    element_value(elem)                -> wg elem.get("unit")
+
+Rejestr CONVERTERS: unit -> funkcja(str) -> wartość natywna. Nieznany unit
+zwraca tekst bez zmian; wartość, której nie da się zamienić, daje None.
+
+Tablice procesu (K, narzędzia, pomiary wykrojów) czyta read_table – wiersze
+jako słowniki tekstów, zamiana liczb po stronie wywołującego:
+
+    read_table("tablica_k.csv", ("Materiał", "Grubość", "Narzędzie", "K"), "Tablica K")
+"""
+
+import csv
+from collections import namedtuple
+from datetime import datetime
+
+from .outline import decode_outline, decode_outlines
+
+CONVERTERS = {}
+
+# MainPlaneTransformation, WorkPieceMarkerPosition itp. ("0 0 0 0 0 1 0"):
+# przesunięcie x, y, z, oś obrotu i kąt obrotu
+Position = namedtuple("Position", "x y z axis_x axis_y axis_z angle")
+# SideReference ("84 0 84 50 false")
+Line = namedtuple("Line", "x1 y1 x2 y2 is_arc")
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_BOOLEANS = {"true": True, "false": False, "prawda": True, "fałsz": False}
+
+
+def converter(*units):
+    """Dekorator: rejestruje funkcję konwersji dla podanych jednostek."""
+    def decorator(func):
+        for unit in units:
+            CONVERTERS[unit] = func
+        return func
+    return decorator
+
+
+@converter("MilliMeter", "Degrees", "RealNumber", "KiloNewton",
+           "KiloNewtonPerSquareMm", "MilliMeterPerSecond", "Seconds")
+def to_float(value):
+    """Liczba rzeczywista; przecinek dziesiętny (pliki z polskim Excelem) też jest przyjmowany."""
+    try:
+        return float(value)
+    except ValueError:
+        return float(value.replace(',', '.'))
+
+
+@converter("NaturalNumber")
+def to_int(value):
+    return int(value)
+
+
+@converter("Boolean")
+def to_bool(value):
+    return _BOOLEANS[value.strip().lower()]
+
+
+@converter("Text")
+def to_text(value):
+    return value
+
+
+@converter("Enumeration")
+def to_enum(value):
+    return value.strip()
+
+
+@converter("DateTime")
+def to_datetime(value):
+    return datetime.strptime(value.strip(), DATETIME_FORMAT)
+
+
+def _vector(value, size):
+    numbers = tuple(to_float(t) for t in value.split())
+    if len(numbers) != size:
+        raise ValueError(f"oczekiwano {size} liczb, jest {len(numbers)}")
+    return numbers
+
+
+@converter("Point", "DirectionVector")
+def to_vector(value):
+    """Punkt / wektor 3D jako krotka (x, y, z)."""
+    return _vector(value, 3)
+
+
+@converter("Position")
+def to_position(value):
+    return Position(*_vector(value, 7))
+
+
+@converter("Line")
+def to_line(value):
+    tokens = value.split()
+    if len(tokens) != 5:
+        raise ValueError("Line wymaga 5 tokenów")
+    return Line(*(to_float(t) for t in tokens[:4]), tokens[4].lower() in ("true", "prawda"))
+
+
+@converter("Lines")
+def to_lines(value):
+    """Lista Line z wartości "n Line x1 y1 x2 y2 flag Line ..."."""
+    tokens = value.split()
+    count = int(tokens[0])
+    lines = []
+    pos = 1
+    for _ in range(count):
+        if tokens[pos].lower() == "line":
+            pos += 1
+        lines.append(to_line(" ".join(tokens[pos:pos + 5])))
+        pos += 5
+    return lines
+
+
+@converter("Outline")
+def to_outline(value):
+    """(coords N×4, is_arc) – patrz dld.outline.decode_outline."""
+    return decode_outline(value)
+
+
+@converter("Outlines")
+def to_outlines(value):
+    """Lista (coords N×4, is_arc), po jednej na obrys – patrz dld.outline.decode_outlines."""
+    return decode_outlines(value)
+
+
+def convert(unit, value):
+    """
+    Zamienia tekst atrybutu value na wartość natywną wg unit.
+    None dla value=None lub wartości niezgodnej z jednostką.
+    """
+    if value is None:
+        return None
+    func = CONVERTERS.get(unit)
+    if func is None:
+        return value
+    try:
+        return func(value)
+    except (ValueError, KeyError, IndexError):
+        return None
+
+
+def element_value(elem):
+    """Wartość elementu <Tag unit="..." value="..."/> po konwersji (None, gdy brak elementu)."""
+    if elem is None:
+        return None
+    return convert(elem.get("unit"), elem.get("value"))
+
+
+def typed_values(root):
+    """
+    Jedno przejście po drzewie: {tag: [wartości natywne w kolejności z pliku]}
+    dla wszystkich elementów z atrybutem unit.
+    """
+    values = {}
+    for elem in root.iter():
+        unit = elem.get("unit")
+        if unit is None:
+            continue
+        values.setdefault(elem.tag, []).append(convert(unit, elem.get("value")))
+    return values
+
+
+def read_table(path, columns, label="Tablica"):
+    """
+    Wiersze pliku .csv (";" lub ",") albo .xlsx jako lista słowników
+    {kolumna: tekst} (puste pola Excela – ""). Brak którejś z columns
+    w niepustym pliku – ValueError z opisem label.
+    """
+    if path.lower().endswith((".xlsx", ".xls")):
+        import pandas as pd  # tylko dla tablic w Excelu
+        records = pd.read_excel(path, dtype=str).fillna("").to_dict("records")
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            sample = f.readline()
+            f.seek(0)
+            records = list(csv.DictReader(f, delimiter=";" if ";" in sample else ","))
+
+    missing = [c for c in columns if records and c not in records[0]]
+    if missing:
+        raise ValueError(f"{label} {path}: brak kolumn {', '.join(missing)}")
+    return records
@@ -1,17 +1,19 @@
 import os
-import re
+import sys
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dld.scan import scan_values
 
 def extract_points_from_file(filepath):
     """
-    Ekstrakcja wartości StaticComponentHull i ShorteningContour z pliku.
+    Ekstrakcja wartości StaticComponentHull i ShorteningContour z pliku
+    (pierwsze wystąpienie; skaner bajtowy bez budowania drzewa XML).
     """
-    with open(filepath, 'r', encoding='utf-8') as file:
-        data = file.read()
-    static_component_hull = re.search(r'<StaticComponentHull .*?value="([^"]+)"', data)
-    shortening_contour = re.search(r'<ShorteningContour .*?value="([^"]+)"', data)
+    values = scan_values(filepath, ("StaticComponentHull", "ShorteningContour"))
 
-    hull = static_component_hull.group(1) if static_component_hull else "Brak danych"
-    contour = shortening_contour.group(1) if shortening_contour else "Brak danych"
+    hull = next((v for v in values["StaticComponentHull"] if v), "Brak danych")
+    contour = next((v for v in values["ShorteningContour"] if v), "Brak danych")
 
     return hull, contour
 
@@ -1,17 +1,25 @@
+import os
+import sys
 import xml.etree.ElementTree as ET
 import math
 
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from dld import parse_workpiece
+from dld.blank import default_k_table
+
 # Stałe
 GRUBOSC = 2  # Grubość materiału w mm
 KAT = 90  # Kąt gięcia w stopniach
 
 # Funkcja do obliczania rozwinięcia
-def oblicz_rozwinięcie(dlugosc_a, dlugosc_b, dlugosc_luku, kat, grubosc):
+def oblicz_rozwinięcie(dlugosc_a, dlugosc_b, dlugosc_luku, kat, grubosc, material="", narzedzie=""):
     # Przeliczenie kąta na radiany
     kat_rad = math.radians(kat)
     
-    # Obliczenie współczynnika K (dla kąta 90 stopni i grubości 2mm, K ≈ 0.33)
-    K = 0.33  # Wartość domyślna dla 90 stopni i grubości 2mm
+    # Współczynnik K z tablicy (materiał, grubość, matryca) – DLD_K_TABLE;
+    # bez wpisu K ≈ 0.33 (wartość dla 90 stopni i grubości 2mm)
+    K = default_k_table().lookup(material, grubosc, narzedzie, default=0.33)
     
     # Obliczenie rozwinięcia
     rozwinięcie = dlugosc_a + dlugosc_b + (dlugosc_luku * (math.pi / 2) * (grubosc + K))
@@ -70,8 +78,9 @@ if dlugosc_a is not None and dlugosc_b is not None and dlugosc_luku is not None:
     print(f"Długość B: {dlugosc_b} mm")
     print(f"Długość łuku: {dlugosc_luku} mm")
     
-    # Obliczenie rozwinięcia
-    rozwinięcie = oblicz_rozwinięcie(dlugosc_a, dlugosc_b, dlugosc_luku, KAT, GRUBOSC)
+    # Obliczenie rozwinięcia (K dla materiału i matrycy z pliku)
+    wp = parse_workpiece(sciezka_pliku)
+    rozwinięcie = oblicz_rozwinięcie(dlugosc_a, dlugosc_b, dlugosc_luku, KAT, GRUBOSC, wp.material, wp.die)
     print(f"Rozwinięcie: {rozwinięcie:.2f} mm")
     
     # Obliczenie wymiarów zewnętrznych i wewnętrznych
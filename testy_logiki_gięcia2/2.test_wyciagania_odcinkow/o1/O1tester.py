@@ -2,26 +2,33 @@ import pandas as pd
 import xml.etree.ElementTree as ET
 import math
 import os
+import sys
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from dld import build_chain, load_workpiece
+from dld.store import segments_loader
+
+# Kolumny odcinków potrzebne testom – z magazynu kolumnowego czytamy tylko je
+SEGMENT_COLUMNS = ["Nazwa pliku", "Komponent", "Źródło outline", "Odcinek nr", "Długość łuku"]
 
 def normalize_angle(angle_deg):
     if angle_deg > 180:
         return angle_deg - 360
     return angle_deg
 
-def compute_inside_dimensions(file_name, df_odcinki):
+def compute_inside_dimensions(file_name, wp, df_odcinki):
     """
     Dla detalu file_name z wyniki_odcinki_v3.xlsx pobiera wiersze z odcinka nr 2 i dzieli je na:
-      - bazowe wartości (StaticComponentHull)
+      - bazowe wartości (StaticComponentHull, Komponent = nazwa flanszy)
       - wartości DC (ShorteningContour, Komponent zaczyna się od "DC")
-    Następnie, jeśli:
-      * liczba bazowych wartości wynosi 2 i mamy 1 wartość DC:
-             new[0] = baza[0] + DC[0]
-             new[1] = baza[1] + DC[0]
-      * jeżeli liczba bazowych wartości > 2 i liczba DC = (liczba_baz - 1):
-             new[0] = baza[0] + DC[0]
-             dla i = 1..(n-2): new[i] = DC[i-1] + baza[i] + DC[i]
-             new[n-1] = baza[-1] + DC[-1]
-    Zwraca ciąg liczb oddzielonych przecinkami (zaokrąglonych do 6 miejsc).
+    Każda flansza dostaje wartości DC WŁASNYCH gięć – sąsiedztwo z łańcucha
+    Left/RightStaticComponent detalu wp (dld.build_chain):
+             new[flansza] = baza[flansza] + suma DC[gięcia flanszy]
+    (dla prostego łańcucha: skrajne flansze + 1 DC, środkowe + 2 DC).
+    Bez detalu wp zwracane są same wartości bazowe.
+    Zwraca ciąg liczb oddzielonych przecinkami (zaokrąglonych do 6 miejsc),
+    w kolejności wierszy StaticComponentHull.
     """
     df_file = df_odcinki[df_odcinki["Nazwa pliku"] == file_name]
     df_seg2 = df_file[df_file["Odcinek nr"] == 2]
@@ -32,32 +39,28 @@ def compute_inside_dimensions(file_name, df_odcinki):
     for _, row in df_base.iterrows():
         try:
             val = float(str(row["Długość łuku"]).replace(',', '.'))
-            base_values.append(val)
+            base_values.append((row["Komponent"], val))
         except:
             pass
             
-    # Pobieramy wartości DC z ShorteningContour (Komponent zaczyna się od "DC")
+    # Pobieramy wartości DC z ShorteningContour (Komponent zaczyna się od "DC");
+    # DC opisane w kilku flanszach – liczy się pierwszy wiersz
     df_dc = df_seg2[(df_seg2["Źródło outline"] == "ShorteningContour") &
                     (df_seg2["Komponent"].str.startswith("DC"))]
-    dc_values = []
+    dc_values = {}
     for _, row in df_dc.iterrows():
         try:
             val = float(str(row["Długość łuku"]).replace(',', '.'))
-            dc_values.append(val)
+            dc_values.setdefault(row["Komponent"], val)
         except:
             pass
-            
+
+    adjacent = build_chain(wp).adjacent if wp is not None else {}
     computed_dims = []
-    if len(base_values) == 2 and len(dc_values) == 1:
-        computed_dims.append(base_values[0] + dc_values[0])
-        computed_dims.append(base_values[1] + dc_values[0])
-    elif len(base_values) > 2 and len(dc_values) == len(base_values) - 1:
-        computed_dims.append(base_values[0] + dc_values[0])
-        for i in range(1, len(base_values)-1):
-            computed_dims.append(dc_values[i-1] + base_values[i] + dc_values[i])
-        computed_dims.append(base_values[-1] + dc_values[-1])
-    else:
-        computed_dims = base_values
+    for name, val in base_values:
+        for dc_name in adjacent.get(name, ()):
+            val += dc_values.get(dc_name, 0.0)
+        computed_dims.append(val)
     return ",".join(str(round(x, 6)) for x in computed_dims)
 
 def compute_dc_shortening(file_name, df_odcinki):
@@ -80,43 +83,19 @@ def compute_dc_shortening(file_name, df_odcinki):
             pass
     return ",".join(str(round(x, 2)) for x in dc_values)
 
-def compute_bending_angles_from_xml(file_name):
+def compute_bending_angles(wp):
     """
-    Dla danego pliku XML (np. "prd.40047020.dld") pobiera elementy VDeformableComponent,
-    których WorkpieceComponentName zaczyna się od "DC". Dla takich elementów:
-      - Próbuje odczytać kąt gięcia z "VDeformableComponentAngle"
-      - Jeśli brak, sprawdza "VBendDeformation/AngleAfter"
+    Dla detalu (Workpiece odczytany z pliku .dld, np. "prd.40047020.dld") bierze komponenty
+    VDeformableComponent, których nazwa zaczyna się od "DC". Dla takich komponentów:
+      - Bierze kąt z "VBendDeformation/AngleAfter", a jeśli brak – z "VDeformableComponentAngle"
       - Normalizuje kąt i zaokrągla do całości.
     Zwraca ciąg kątów oddzielonych przecinkami (np. "-90,150").
     """
-    try:
-        tree = ET.parse(file_name)
-        root = tree.getroot()
-    except ET.ParseError:
-        return ""
     angles = []
-    for v in root.findall(".//VDeformableComponent"):
-        comp_elem = v.find("WorkpieceComponentName")
-        if comp_elem is not None:
-            comp_name = comp_elem.attrib.get("value", "")
-            if comp_name.startswith("DC"):
-                angle_after = 0.0
-                angle_elem = v.find("VDeformableComponentAngle")
-                if angle_elem is not None:
-                    try:
-                        angle_after = float(angle_elem.attrib.get("value", "0"))
-                    except ValueError:
-                        angle_after = 0.0
-                deformation_elem = v.find("VBendDeformation")
-                if deformation_elem is not None:
-                    angle_after_elem = deformation_elem.find("AngleAfter")
-                    if angle_after_elem is not None:
-                        try:
-                            angle_after = float(angle_after_elem.attrib.get("value", "0"))
-                        except ValueError:
-                            pass
-                angle_norm = normalize_angle(angle_after)
-                angles.append(int(round(angle_norm)))
+    for dc in wp.deformable_components:
+        if dc.name.startswith("DC"):
+            angle_norm = normalize_angle(dc.bend_angle)
+            angles.append(int(round(angle_norm)))
     return ",".join(str(x) for x in angles)
 
 def compute_grouped_dimensions(file_name, df_odcinki):
@@ -178,10 +157,10 @@ def compute_grouped_dimensions(file_name, df_odcinki):
         output_lines.append(line)
     return "\n".join(output_lines)
 
-def compute_grouped2(file_name, df_odcinki):
+def compute_grouped2(file_name, wp, df_odcinki):
     """
     NOWA FUNKCJA: Tworzy "grouped2" – podsumowanie na podstawie oryginalnej struktury .dld:
-      - Wczytujemy plik .dld
+      - Korzystamy z detalu wp (Workpiece odczytany z pliku .dld)
       - Dla każdego <StaticComponent>:
         * bierzemy <WorkpieceComponentName> => np. "MainPlane", "SC00", ...
         * w df_odcinki (odcinek nr=2, source=StaticComponentHull) szukamy wiersza z Komponent="MainPlane" => to staticVal
@@ -195,13 +174,6 @@ def compute_grouped2(file_name, df_odcinki):
     Zwraca wielolinijkowy string gotowy do wstawienia do kolumny 'grouped2'.
     """
 
-    # Wczytujemy .dld i parsujemy <StaticComponent>
-    try:
-        tree = ET.parse(file_name)
-        root = tree.getroot()
-    except ET.ParseError:
-        return ""
-
     # Dla wygody stwórz "słownik" mapujący (komponent) -> (arcLength static).
     # Odczytamy to z df_odcinki
     def get_static_value(comp_name):
@@ -243,12 +215,9 @@ def compute_grouped2(file_name, df_odcinki):
         return vals
 
     lines = []
-    # Iterujemy po <StaticComponent> w pliku .dld
-    for sc in root.findall(".//StaticComponent"):
-        wcn = sc.find("WorkpieceComponentName")
-        if wcn is None:
-            continue
-        static_name = wcn.attrib.get("value","")
+    # Iterujemy po <StaticComponent> detalu
+    for sc in wp.static_components:
+        static_name = sc.name
         # Odczytaj staticVal z df_odcinki
         static_val = get_static_value(static_name)
         if static_val is None:
@@ -258,21 +227,18 @@ def compute_grouped2(file_name, df_odcinki):
         # Szukamy <DeformableCompShortening>
         dc_values_all = []
         dc_names = []
-        for def_comp in sc.findall("DeformableCompShortening"):
-            dcn = def_comp.find("DeformableComponentName")
-            if dcn is not None:
-                dc_name = dcn.attrib.get("value","")
-                # Odczyt z df_odcinki
-                found_vals = get_dc_value(dc_name)
-                if found_vals:
-                    # Bywa, że jest kilka wierszy => np. segmenty
-                    # W example sumowaliśmy je? 
-                    # W tym zadaniu sumowanie jest zależne od Twojej definicji.
-                    # Ale w przykładzie "DC00=8.0" to raczej 1 wiersz albo 1 sum. 
-                    # Załóżmy, że jak jest wiele segmentów, je sumujemy:
-                    ssum = sum(found_vals)
-                    dc_values_all.append(ssum)
-                    dc_names.append(dc_name)
+        for dc_name, _ in sc.shortenings:
+            # Odczyt z df_odcinki
+            found_vals = get_dc_value(dc_name)
+            if found_vals:
+                # Bywa, że jest kilka wierszy => np. segmenty
+                # W example sumowaliśmy je? 
+                # W tym zadaniu sumowanie jest zależne od Twojej definicji.
+                # Ale w przykładzie "DC00=8.0" to raczej 1 wiersz albo 1 sum. 
+                # Załóżmy, że jak jest wiele segmentów, je sumujemy:
+                ssum = sum(found_vals)
+                dc_values_all.append(ssum)
+                dc_names.append(dc_name)
 
         # Mamy np. dc_names=["DC00","DC01"], dc_values_all=[8.0,10.04]
         # Tworzymy computed dims:
@@ -314,9 +280,9 @@ def compute_grouped2(file_name, df_odcinki):
 def main():
     try:
         df_zw = pd.read_excel("wyniki_zw_v3.xlsx")
-        df_odcinki = pd.read_excel("wyniki_odcinki_v3.xlsx")
+        load_segments = segments_loader(SEGMENT_COLUMNS)
     except Exception as e:
-        print("Błąd wczytywania plików Excel:", e)
+        print("Błąd wczytywania plików z wynikami:", e)
         return
     
     df_test = df_zw.copy()
@@ -329,10 +295,17 @@ def main():
     for idx, row in df_test.iterrows():
         file_name = row["Nazwa pliku"]
         typ = str(row["Typ"]).strip().lower()
+        df_odcinki = load_segments(file_name)
+
+        # Plik .dld odczytujemy raz (przez cache) dla kolumn 1), 3) i 5)
+        try:
+            wp = load_workpiece(file_name)
+        except ET.ParseError:
+            wp = None
 
         # 1) Wymiary wewn. (test)
         if typ == "inside":
-            computed_dim = compute_inside_dimensions(file_name, df_odcinki)
+            computed_dim = compute_inside_dimensions(file_name, wp, df_odcinki)
             computed_dimensions_list.append(computed_dim)
         else:
             computed_dimensions_list.append("")
@@ -342,7 +315,7 @@ def main():
         dc_shortening_list.append(dc_val)
 
         # 3) Kąty gięcia (test)
-        angles_val = compute_bending_angles_from_xml(file_name)
+        angles_val = compute_bending_angles(wp) if wp is not None else ""
         bending_angles_list.append(angles_val)
 
         # 4) Grouped Dimensions (test)
@@ -350,7 +323,7 @@ def main():
         grouped_dimensions_list.append(grouped_dims)
 
         # 5) NOWA KOLUMNA: grouped2
-        g2 = compute_grouped2(file_name, df_odcinki)
+        g2 = compute_grouped2(file_name, wp, df_odcinki) if wp is not None else ""
         grouped2_list.append(g2)
 
     df_test["Wymiary wewnętrzne (test)"] = computed_dimensions_list
@@ -1,7 +1,16 @@
 import pandas as pd
 import xml.etree.ElementTree as ET
-import math
 import os
+import sys
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu; segmenty outline
+# (x1, y1, x2, y2, is_arc, chord_length) dekoduje dld.outline
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from dld import outline_dimension
+from dld.store import segments_loader
+
+# Kolumny odcinków potrzebne testom – z magazynu kolumnowego czytamy tylko je
+SEGMENT_COLUMNS = ["Nazwa pliku", "Komponent", "Źródło outline", "Odcinek nr", "Długość łuku"]
 
 # Funkcja normalizująca kąt do zakresu [-180, 180]
 def normalize_angle(angle_deg):
@@ -9,40 +18,6 @@ def normalize_angle(angle_deg):
         return angle_deg - 360
     return angle_deg
 
-# Funkcja pomocnicza – zwraca listę segmentów z outline (każdy segment to krotka:
-# (x1, y1, x2, y2, is_arc, chord_length))
-def parse_outline_segments(outline_str):
-    tokens = outline_str.split()
-    if not tokens:
-        return []
-    # Sprawdzenie formatu – jeżeli drugi token to "Outline", to liczba segmentów jest pod tokenem 2
-    if len(tokens) > 1 and tokens[1] == "Outline":
-        try:
-            n_segments = int(tokens[2])
-        except ValueError:
-            return []
-        start_index = 3
-    else:
-        try:
-            n_segments = int(tokens[0])
-        except ValueError:
-            return []
-        start_index = 1
-    segments = []
-    for i in range(n_segments):
-        idx = start_index + i * 5
-        try:
-            x1 = float(tokens[idx].replace(',', '.'))
-            y1 = float(tokens[idx+1].replace(',', '.'))
-            x2 = float(tokens[idx+2].replace(',', '.'))
-            y2 = float(tokens[idx+3].replace(',', '.'))
-            is_arc = tokens[idx+4].lower() in ["true", "prawda"]
-        except (ValueError, IndexError):
-            continue
-        chord_length = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-        segments.append((x1, y1, x2, y2, is_arc, chord_length))
-    return segments
-
 # Funkcje bounding box i wyznaczania width/height (używane przy parsowaniu, gdyby były potrzebne)
 def parse_outline_value(value_str):
     tokens = value_str.split()
@@ -210,23 +185,11 @@ def compute_grouped2_dimensions(file_name):
     def get_static_value(elem):
         hull_elem = elem.find("./StaticComponentPart/StaticComponentHull")
         if hull_elem is not None:
-            val_str = hull_elem.attrib.get("value", "")
-            segments = parse_outline_segments(val_str)
-            if len(segments) >= 2:
-                # Drugi segment (indeks 1)
-                return segments[1][5]  # chord_length
-            elif segments:
-                return segments[0][5]
+            return outline_dimension(hull_elem.attrib.get("value", ""))
         return 0.0
     
     def get_dc_value(elem):
-        val_str = elem.attrib.get("value", "")
-        segments = parse_outline_segments(val_str)
-        if len(segments) >= 2:
-            return segments[1][5]
-        elif segments:
-            return segments[0][5]
-        return 0.0
+        return outline_dimension(elem.attrib.get("value", ""))
     
     report_lines = []
     for static in root.findall(".//StaticComponent"):
@@ -257,9 +220,9 @@ def compute_grouped2_dimensions(file_name):
 def main():
     try:
         df_zw = pd.read_excel("wyniki_zw_v3.xlsx")
-        df_odcinki = pd.read_excel("wyniki_odcinki_v3.xlsx")
+        load_segments = segments_loader(SEGMENT_COLUMNS)
     except Exception as e:
-        print("Błąd wczytywania plików Excel:", e)
+        print("Błąd wczytywania plików z wynikami:", e)
         return
     
     df_test = df_zw.copy()
@@ -272,6 +235,7 @@ def main():
     for idx, row in df_test.iterrows():
         file_name = row["Nazwa pliku"]
         typ = str(row["Typ"]).strip().lower()
+        df_odcinki = load_segments(file_name)
         if typ == "inside":
             computed_dim = compute_inside_dimensions(file_name, df_odcinki)
             computed_dimensions_list.append(computed_dim)
@@ -0,0 +1,79 @@
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld.blank import load_k_table
+from dld.calibration import (
+    K_RANGE, SOURCE_DELEM, check_reproduction, collect_samples, fit_k_factors, load_blank_lengths, write_k_table,
+)
+
+# Domyślna tablica wynikowa – obok skryptu
+TABLICA_K = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablica_k.csv")
+
+
+def main():
+    """
+    Kalibracja współczynników K z rozwinięć detali z plików .dld.
+
+    Uruchomienie:
+        python kalibracja_k.py [folder_z_dld] [tablica_k.csv|.xlsx] [liczba_procesów] [pomiary.csv|.xlsx]
+
+    Bez pliku pomiarów rozwinięcie to BlankLength policzone przez sterownik,
+    nie pomiar – K odtwarza wtedy rozwinięcia sterownika przy promieniu
+    narzędzia (dld.calibration), a nie zachowanie blachy. Plik pomiarów
+    (kolumny "Plik", "Długość [mm]") daje K ze zmierzonych wykrojów.
+    Kolumna "Źródło" tablicy mówi, skąd pochodzi każde K. K spoza przedziału
+    (0, 1) nie trafia do tablicy; po zapisie skrypt sprawdza, czy tablica
+    odtwarza w dld.blank rozwinięcia, do których ją dopasowano.
+
+    Tablicę wczytuje dld.blank.load_k_table – dla skryptów wystarczy ustawić
+    zmienną środowiskową DLD_K_TABLE na ścieżkę pliku.
+    """
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    wynik = sys.argv[2] if len(sys.argv) > 2 else TABLICA_K
+    procesy = int(sys.argv[3]) if len(sys.argv) > 3 and sys.argv[3] else None
+    pomiary = load_blank_lengths(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    pliki = sorted(glob.glob(os.path.join(folder, "**", "*.dld"), recursive=True))
+    if not pliki:
+        print(f"Nie znaleziono plików .dld w folderze: {folder}")
+        return
+
+    start = time.perf_counter()
+    probki = collect_samples(pliki, workers=procesy, measured=pomiary)
+    zrodlo = "ze zmierzonym wykrojem" if pomiary is not None else "z BlankLength"
+    print(f"Plików: {len(pliki)}, {zrodlo} i gięciami: {len(probki)} "
+          f"({time.perf_counter() - start:.1f} s)")
+    if not probki:
+        return
+
+    wyniki = fit_k_factors(probki)
+    print(f"{'Materiał':<20} {'Grubość':>8} {'Narzędzie':<18} {'K':>7} {'Próbek':>7} {'RMS [mm]':>10}  Źródło")
+    for w in wyniki:
+        grubosc = "*" if w.thickness is None else f"{w.thickness:g}"
+        print(f"{w.material:<20} {grubosc:>8} {w.tool or '*':<18} {w.k_factor:7.4f} {w.samples:7d} "
+              f"{w.rms:10.4f}  {w.source}")
+    if any(SOURCE_DELEM in w.source for w in wyniki):
+        print("UWAGA: K z BlankLength sterownika (nie z pomiaru) – odtwarza rozwinięcia Delem "
+              "przy promieniu narzędzia; do kalibracji procesu podaj plik zmierzonych wykrojów.")
+
+    odrzucone = write_k_table(wyniki, wynik)
+    print(f"Zapisano tablicę K: {wynik} (DLD_K_TABLE={wynik})")
+    for w in odrzucone:
+        grubosc = "*" if w.thickness is None else f"{w.thickness:g}"
+        print(f"Odrzucone (K poza {K_RANGE}): {w.material or '*'} / {grubosc} / {w.tool or '*'}: "
+              f"K = {w.k_factor:.4f}, próbek {w.samples}")
+
+    # Kontrola: tablica po wczytaniu musi odtwarzać rozwinięcia próbek
+    roznice = np.abs(check_reproduction(probki, load_k_table(wynik)))
+    print(f"Odtworzenie rozwinięć tablicą: mediana {np.median(roznice):.3f} mm, "
+          f"maks. {roznice.max():.3f} mm, > 0,5 mm: {int((roznice > 0.5).sum())}/{len(roznice)}")
+
+
+if __name__ == "__main__":
+    main()
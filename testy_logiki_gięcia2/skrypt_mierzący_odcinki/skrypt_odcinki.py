@@ -1,6 +1,12 @@
-import math
+import os
+import sys
 
-def oblicz_prostke(odcinki, grubosc, katy, promien_wewn):
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld.bendtable import bend_geometry
+from dld.blank import default_k_table
+
+def oblicz_prostke(odcinki, grubosc, katy, promien_wewn, material="", narzedzie=""):
     """
     Oblicza długość rozwinięcia (prostki) dla giętej blachy.
     
@@ -9,19 +15,22 @@ def oblicz_prostke(odcinki, grubosc, katy, promien_wewn):
       - grubosc: grubość blachy (np. 2 lub 3)
       - katy: lista kątów gięcia w stopniach (np. [90] lub [90, 80])
       - promien_wewn: promień wewnętrzny gięcia
+      - material, narzedzie: MaterialName i matryca – klucz tablicy współczynników K
       
     Zwraca:
       - Całkowitą długość rozwinięcia (prostki)
     """
-    # Przyjmujemy, że włókno obojętne znajduje się w połowie grubości
-    wspolczynnik_neutralny = 0.5  
-    promien_neutralny = promien_wewn + wspolczynnik_neutralny * grubosc
+    # Współczynnik K z tablicy (DLD_K_TABLE); bez wpisu przyjmujemy,
+    # że włókno obojętne znajduje się w połowie grubości
+    wspolczynnik_neutralny = default_k_table().lookup(material, grubosc, narzedzie, default=0.5)
 
     # Długość wszystkich prostych odcinków (podawanych jako "zewnętrzne" długości)
     dlugosc_odcinkow = sum(odcinki)
 
     # Długość łuków gięcia: suma (kąt [w radianach] * promień_neutralny) dla każdego gięcia
-    dlugosc_lukow = sum(math.radians(kat) * promien_neutralny for kat in katy)
+    # (łuk po neutralnej z tablicy geometrii gięcia dld.bendtable)
+    dlugosc_lukow = sum(bend_geometry(kat, promien_wewn, grubosc, wspolczynnik_neutralny).neutral_arc
+                        for kat in katy)
     
     return dlugosc_odcinkow + dlugosc_lukow
 
@@ -1,8 +1,12 @@
 import os
-import math
+import sys
 import pandas as pd
 import xml.etree.ElementTree as ET
 
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dld import format_number, load_workpiece, outline_dimension, outline_segments
+
 # --------------- Fragmenty zapożyczone z kod_testowy.py ---------------
 
 def normalize_angle(angle_deg):
@@ -11,153 +15,35 @@ def normalize_angle(angle_deg):
         return angle_deg - 360
     return angle_deg
 
-def parse_outline_segments(outline_str):
-    """
-    Parsuje ciąg znaków outline (z atrybutu 'value'), zwraca listę segmentów:
-    (x1, y1, x2, y2, is_arc, chord_length).
-    
-    Obsługuje dwa formaty:
-      1) [liczba_segmentów x1 y1 x2 y2 isArc ...]
-      2) Outline liczba_segmentów x1 y1 x2 y2 isArc ...
+def compute_bending_angles(wp):
     """
-    tokens = outline_str.split()
-    if not tokens:
-        return []
-    
-    # Sprawdzamy, czy mamy format z "Outline"
-    if len(tokens) > 1 and tokens[1].lower() == "outline":
-        try:
-            n_segments = int(tokens[2])
-        except ValueError:
-            return []
-        start_index = 3
-    else:
-        # Format standardowy
-        try:
-            n_segments = int(tokens[0])
-        except ValueError:
-            return []
-        start_index = 1
-
-    segments = []
-    for i in range(n_segments):
-        idx = start_index + i*5
-        try:
-            x1 = float(tokens[idx].replace(',', '.'))
-            y1 = float(tokens[idx+1].replace(',', '.'))
-            x2 = float(tokens[idx+2].replace(',', '.'))
-            y2 = float(tokens[idx+3].replace(',', '.'))
-            is_arc = tokens[idx+4].lower() in ["true", "prawda"]
-        except (ValueError, IndexError):
-            continue
-        chord_length = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-        segments.append((x1, y1, x2, y2, is_arc, chord_length))
-    return segments
-
-def compute_bending_angles_from_xml(file_path):
-    """
-    Pobiera kąty gięcia (AngleAfter) dla deformowalnych komponentów DC z pliku .dld.
+    Pobiera kąty gięcia (AngleAfter) dla deformowalnych komponentów DC detalu.
     Zwraca ciąg znaków z kątami (np. "90, 90, -45").
     """
-    try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-    except ET.ParseError:
-        return ""
-
     angles = []
-    for v in root.findall(".//VDeformableComponent"):
-        comp_elem = v.find("WorkpieceComponentName")
-        if comp_elem is not None:
-            comp_name = comp_elem.attrib.get("value", "")
-            if comp_name.startswith("DC"):
-                angle_after = 0.0
-                # Szukamy VDeformableComponentAngle
-                angle_elem = v.find("VDeformableComponentAngle")
-                if angle_elem is not None:
-                    try:
-                        angle_after = float(angle_elem.attrib.get("value", "0"))
-                    except ValueError:
-                        angle_after = 0.0
-                # Opcjonalnie sprawdzamy VBendDeformation -> AngleAfter
-                deformation_elem = v.find("VBendDeformation")
-                if deformation_elem is not None:
-                    angle_after_elem = deformation_elem.find("AngleAfter")
-                    if angle_after_elem is not None:
-                        try:
-                            angle_after = float(angle_after_elem.attrib.get("value", "0"))
-                        except ValueError:
-                            pass
-                angle_norm = normalize_angle(angle_after)
-                angles.append(int(round(angle_norm)))
+    for dc in wp.deformable_components:
+        if dc.name.startswith("DC"):
+            angle_norm = normalize_angle(dc.bend_angle)
+            angles.append(int(round(angle_norm)))
     return ", ".join(str(a) for a in angles)
 
-def compute_grouped2_dimensions(file_path):
+def compute_grouped2_dimensions(wp):
     """
     Zwraca zgrupowane dane 'Grouped2' w postaci wieloliniowego tekstu:
       <StaticName>: static=..., DC count=N, DC values: ..., Computed dims: ...
     zgodnie z logiką z kod_testowy.py.
     """
-    try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-    except ET.ParseError as e:
-        return f"Błąd parsowania pliku {file_path}: {e}"
-
-    def get_static_value(static_elem):
-        """
-        Zczytujemy z <StaticComponentPart>/<StaticComponentHull> drugi segment outline
-        (lub pierwszy, jeśli jest tylko jeden). Tam chord_length jest interpretowane jako 'static'.
-        """
-        hull_elem = static_elem.find("./StaticComponentPart/StaticComponentHull")
-        if hull_elem is not None:
-            val_str = hull_elem.attrib.get("value", "")
-            segments = parse_outline_segments(val_str)
-            if len(segments) >= 2:
-                return segments[1][5]  # chord_length z 2. odcinka (indeks 1)
-            elif segments:
-                return segments[0][5]
-        return 0.0
-
-    def get_dc_value(shortening_elem):
-        """
-        Z <ShorteningContour> pobieramy wartość chord_length z 2. segmentu (lub 1. jeśli 2 brak).
-        """
-        val_str = shortening_elem.attrib.get("value", "")
-        segments = parse_outline_segments(val_str)
-        if len(segments) >= 2:
-            return segments[1][5]
-        elif segments:
-            return segments[0][5]
-        return 0.0
-
     report_lines = []
-    # Iterujemy po StaticComponent
-    for static in root.findall(".//StaticComponent"):
-        comp_elem = static.find("WorkpieceComponentName")
-        if comp_elem is None:
-            continue
-        static_name = comp_elem.attrib.get("value", "").strip()
-        static_val = get_static_value(static)
-
-        # Szukamy zagnieżdżonych DeformableCompShortening
-        dc_elems = static.findall("DeformableCompShortening")
-        dc_info = []
-        for dcs in dc_elems:
-            dc_name_elem = dcs.find("DeformableComponentName")
-            short_elem = dcs.find("ShorteningContour")
-            if dc_name_elem is None or short_elem is None:
-                continue
-            dc_name = dc_name_elem.attrib.get("value", "").strip()
-            dc_val = get_dc_value(short_elem)
-            dc_info.append((dc_name, dc_val))
+    for sc in wp.static_components:
+        static_val = outline_dimension(sc.hull)
+        dc_info = [(dc_name, outline_dimension(contour)) for dc_name, contour in sc.shortenings]
 
         dc_count = len(dc_info)
         dc_values_str = ", ".join(f"{name}={round(val,2)}" for name, val in dc_info)
         computed_dim = static_val + sum(val for _, val in dc_info)
 
         line = (
-            f"{static_name}: static={round(static_val,6)}, "
+            f"{sc.name}: static={round(static_val,6)}, "
             f"DC count={dc_count}, DC values: {dc_values_str}; "
             f"Computed dims: {round(computed_dim,6)}"
         )
@@ -167,9 +53,9 @@ def compute_grouped2_dimensions(file_path):
 
 # --------------- Funkcja wyciągająca dane zbiorcze z pliku (podobna do process_summary) ---------------
 
-def parse_dld_summary(file_path):
+def parse_dld_summary(wp):
     """
-    Zwraca słownik z danymi:
+    Zwraca słownik z danymi detalu:
       - grubosc
       - liczba_odcinkow
       - promien_wewn (zebrany z ActualInnerRadius – pierwszy napotkany)
@@ -180,93 +66,41 @@ def parse_dld_summary(file_path):
       - typ (Inside/Outside z WorkpieceDimensions -> value)
     """
     data = {
-        "grubosc": 0.0,
+        "grubosc": wp.thickness,
         "liczba_odcinkow": None,
         "promien_wewn": "",
         "dlugosc_zlamu": "",
         "rozwiniecie": "",
         "wymiary": "",
         "luki": "",
-        "typ": ""
+        "typ": wp.dimensions
     }
 
-    # Odczyt XML
-    try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-    except ET.ParseError:
-        return data
-
-    # --- Grubość (WorkpieceThickness) ---
-    thickness_el = root.find(".//WorkpieceThickness")
-    if thickness_el is not None:
-        try:
-            data["grubosc"] = float(thickness_el.attrib.get("value", "0").replace(',', '.'))
-        except ValueError:
-            pass
-
-    # --- Liczba odcinków (BendStep + 1) ---
-    bend_sequence = root.find(".//BendSequence")
-    if bend_sequence is not None:
-        bend_steps = bend_sequence.findall("BendStep")
-        data["liczba_odcinkow"] = len(bend_steps) + 1 if bend_steps else 1
-
-        # Rozwinięcie z pliku: BlankLength
-        blank_length_el = bend_sequence.find("BlankLength")
-        if blank_length_el is not None:
-            data["rozwiniecie"] = blank_length_el.attrib.get("value", "").replace(',', '.')
-
-        # Długość złamu: z pierwszego BendStep
-        if bend_steps:
-            first_step = bend_steps[0]
-            ds_state = first_step.find("DeformableSystemState")
-            if ds_state is not None:
-                bend_length_el = ds_state.find("BendLength")
-                if bend_length_el is not None:
-                    data["dlugosc_zlamu"] = bend_length_el.attrib.get("value", "").replace(',', '.')
+    # --- Liczba odcinków (BendStep + 1), rozwinięcie i długość złamu z BendSequence ---
+    if wp.has_bend_sequence:
+        data["liczba_odcinkow"] = len(wp.bend_steps) + 1
+        data["rozwiniecie"] = format_number(wp.blank_length)
+        if wp.bend_steps:
+            data["dlugosc_zlamu"] = format_number(wp.bend_steps[0].bend_length)
 
     # --- Promień wewnętrzny (ActualInnerRadius) – pierwszy napotkany ---
-    air_el = root.find(".//VDeformableComponent/ActualInnerRadius")
-    if air_el is not None:
-        data["promien_wewn"] = air_el.attrib.get("value", "").replace(',', '.')
-
-    # --- Typ (Inside/Outside) -> z atrybutu WorkpieceDimensions ---
-    workpiece_dim = root.find(".//Workpiece/WorkpieceDimensions")
-    if workpiece_dim is not None:
-        data["typ"] = workpiece_dim.attrib.get("value", "").strip()
+    for dc in wp.deformable_components:
+        if dc.actual_inner_radius is not None:
+            data["promien_wewn"] = format_number(dc.actual_inner_radius)
+            break
 
     # --- Wymiary (StaticComponentHull, odcinek nr 2) ---
-    # Zbieramy sumę długości łuku z odcinka nr 2 po wszystkich StaticComponent z "Hull"
-    # (Podobne do w kod_testowy, ale uproszczone)
-    base_dims = []
-    for sc in root.findall(".//StaticComponent"):
-        hull = sc.find("StaticComponentPart/StaticComponentHull")
-        if hull is not None:
-            outline_val = hull.attrib.get("value", "")
-            segments = parse_outline_segments(outline_val)
-            # Bierzemy drugi segment (indeks 1), jeśli istnieje
-            if len(segments) >= 2:
-                arc_len = segments[1][5]  # chord_length
-            elif len(segments) == 1:
-                arc_len = segments[0][5]
-            else:
-                arc_len = 0.0
-            base_dims.append(arc_len)
+    base_dims = [outline_dimension(sc.hull) for sc in wp.static_components if sc.hull is not None]
     if base_dims:
         data["wymiary"] = ", ".join(str(round(x, 2)) for x in base_dims)
 
     # --- Łuki (VDeformableComponentHulls, odcinek nr 1) ---
-    # Zbieramy chord_length z pierwszego segmentu (indeks 0), dla wszystkich VDeformableComponent
     v_comp_hulls = []
-    for vcomp in root.findall(".//VDeformableComponent"):
-        hulls_el = vcomp.find("VDeformableComponentHulls")
-        if hulls_el is not None:
-            outline_val = hulls_el.attrib.get("value", "")
-            segments = parse_outline_segments(outline_val)
+    for dc in wp.deformable_components:
+        if dc.hulls is not None:
+            segments = outline_segments(dc.hulls)
             if segments:
-                # Bierzemy pierwszy segment
-                arc_len = segments[0][5]
-                v_comp_hulls.append(arc_len)
+                v_comp_hulls.append(segments[0][5])
     if v_comp_hulls:
         data["luki"] = ", ".join(str(round(x, 1)) for x in v_comp_hulls)
 
@@ -332,12 +166,19 @@ def main():
             df.at[idx, "dane_plik_dld"] = f"Brak pliku: {plik_dld_nazwa}"
             continue
 
+        # Plik parsujemy raz – wszystkie ekstraktory czytają z tego samego obiektu
+        try:
+            wp = load_workpiece(sciezka_dld)
+        except ET.ParseError as e:
+            df.at[idx, "dane_plik_dld"] = f"Błąd parsowania pliku {plik_dld_nazwa}: {e}"
+            continue
+
         # Wyciągamy dane zbiorcze
-        dane_summary = parse_dld_summary(sciezka_dld)
+        dane_summary = parse_dld_summary(wp)
         # Wyciągamy kąty gięcia (test)
-        katy_test = compute_bending_angles_from_xml(sciezka_dld)
+        katy_test = compute_bending_angles(wp)
         # Wyciągamy Grouped2 (wieloliniowy tekst)
-        grouped2 = compute_grouped2_dimensions(sciezka_dld)
+        grouped2 = compute_grouped2_dimensions(wp)
 
         # Na potrzeby kolumny "Długości a/b/c/d.../n" musimy wyłuskać same "Computed dims" z grouped2
         computed_dims_list = []
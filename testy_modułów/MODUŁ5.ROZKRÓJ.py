@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+import pandas as pd
+import xml.etree.ElementTree as ET
+
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dld import Blank, flat_pattern, load_workpiece, nest_groups, write_nesting_svg
+from dld.nesting import STANDARD_SHEETS
+
+# Filtr elementów giętych – jak w MODUŁ1
+FILTR_GIETYCH = r'\bG\b|\bGS\b|\bGSO\b'
+
+# Katalog z rysunkami arkuszy (w bieżącym folderze)
+KATALOG_ROZKROJU = "rozkroj"
+
+
+def parse_sheets(tekst):
+    """Formaty arkuszy z tekstu "1500x3000,1250x2500" -> ((1500.0, 3000.0), ...)."""
+    formaty = []
+    for pozycja in tekst.split(","):
+        a, b = pozycja.lower().split("x")
+        a, b = float(a.replace(",", ".")), float(b.replace(",", "."))
+        formaty.append((min(a, b), max(a, b)))
+    return tuple(formaty)
+
+
+def material_from_name(nazwa):
+    """Materiał z kolumny NAZWA (np. "5_S235_SL40034102_p2_1st_GS_5310_" -> "S235")."""
+    if isinstance(nazwa, str):
+        parts = nazwa.split("_")
+        if len(parts) >= 2:
+            return parts[1]
+    return ""
+
+
+def thickness_of(row):
+    """Grubość z kolumny Grubość (0, gdy pusta lub nieliczbowa)."""
+    try:
+        grubosc = float(str(row.get("Grubość")).replace(",", "."))
+    except ValueError:
+        return 0.0
+    return 0.0 if pd.isna(grubosc) else grubosc
+
+
+def blank_from_dld(folder_dld, plik_dld, nazwa):
+    """Blank z rozwinięcia pliku .dld albo None (brak pliku, błąd, niepełne rozwinięcie)."""
+    if pd.isna(plik_dld) or not str(plik_dld).strip():
+        return None
+    plik_dld = str(plik_dld).strip()
+    if not plik_dld.lower().endswith(".dld"):
+        plik_dld += ".dld"
+    sciezka = os.path.join(folder_dld, plik_dld)
+    if not os.path.isfile(sciezka):
+        return None
+    try:
+        rozwiniecie = flat_pattern(load_workpiece(sciezka))
+    except ET.ParseError:
+        return None
+    if rozwiniecie.unplaced or not len(rozwiniecie.outline):
+        return None
+    return Blank.from_pattern(rozwiniecie, nazwa)
+
+
+def blank_from_list(row, nazwa):
+    """Blank z wymiarów formatki w wykazie (Abmess_1 x Abmes_2) albo None."""
+    try:
+        a = float(str(row.get("Abmess_1")).replace(",", "."))
+        b = float(str(row.get("Abmes_2")).replace(",", "."))
+    except ValueError:
+        return None
+    if not (a > 0 and b > 0):
+        return None
+    return Blank(nazwa, a, b)
+
+
+def main():
+    """
+    Rozkrój elementów giętych z wykazu na standardowych arkuszach blachy.
+
+    Uruchomienie (w folderze z wykazem):
+        python MODUŁ5.ROZKRÓJ.py [wynik.xlsx|wykaz.xlsx] [arkusze np. 1500x3000,1250x2500] [procesy]
+
+    Domyślnie czyta wynik.xlsx z MODUŁ1 (kolumna plik_dld), a gdy go brak –
+    wykaz.xlsx. Dla wierszy z plikiem .dld w folderze plik_dld wymiary
+    i pole detalu pochodzą z rozwinięcia (dld.flat), dla pozostałych –
+    z wymiarów formatki Abmess_1 x Abmes_2. Ilość sztuk z kolumny Anz.
+    (pusta – 1 sztuka; wiersze z ilością nieliczbową i bez wymiarów są
+    pomijane i wypisywane).
+    Detale grupowane są po grubości i materiale; dla każdej grupy wybierany
+    jest format arkusza z najmniejszym zużyciem blachy.
+
+    Wynik: rozkroj.xlsx (zestawienie grup i rozmieszczenie detali) oraz
+    rysunki arkuszy SVG w podkatalogu rozkroj.
+    """
+    sciezka_we = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.getcwd(), "wynik.xlsx")
+    if len(sys.argv) <= 1 and not os.path.isfile(sciezka_we):
+        sciezka_we = os.path.join(os.getcwd(), "wykaz.xlsx")
+    arkusze = parse_sheets(sys.argv[2]) if len(sys.argv) > 2 else STANDARD_SHEETS
+    procesy = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    if not os.path.isfile(sciezka_we):
+        print(f"Nie znaleziono pliku wejściowego: {sciezka_we}")
+        return
+
+    df = pd.read_excel(sciezka_we)
+    df_giete = df[df["TECHNOLOGIA"].astype(str).str.contains(FILTR_GIETYCH, na=False, regex=True)]
+    folder_dld = os.path.join(os.getcwd(), "plik_dld")
+
+    grupy = {}
+    z_dld = z_wykazu = 0
+    pominiete = []
+    # Ilości jako liczby; wpisy nieliczbowe -> NaN (wiersz pomijany), puste -> 1 sztuka
+    ilosci = pd.to_numeric(df_giete["Anz."], errors="coerce") if "Anz." in df_giete else None
+    for indeks, row in df_giete.iterrows():
+        nazwa = str(row.get("NAZWA", "")).strip()
+        ilosc = row.get("Anz.")
+        if pd.isna(ilosc):
+            ilosc = 1
+        elif pd.isna(ilosci[indeks]):
+            pominiete.append((nazwa, f"błędna ilość: {ilosc}"))
+            continue
+        else:
+            ilosc = int(ilosci[indeks])
+        blank = blank_from_dld(folder_dld, row.get("plik_dld"), nazwa)
+        if blank is not None:
+            z_dld += 1
+        else:
+            blank = blank_from_list(row, nazwa)
+            if blank is None:
+                pominiete.append((nazwa, "brak wymiarów"))
+                continue
+            z_wykazu += 1
+        klucz = (thickness_of(row), material_from_name(nazwa))
+        grupy.setdefault(klucz, []).extend([blank] * ilosc)
+
+    sztuk = sum(len(b) for b in grupy.values())
+    print(f"Pozycji giętych: {len(df_giete)} (z rozwinięcia .dld: {z_dld}, z wymiarów wykazu: {z_wykazu}), "
+          f"sztuk: {sztuk}")
+    for nazwa, powod in pominiete:
+        print(f"  pominięto ({powod}): {nazwa}")
+    if not grupy:
+        return
+
+    start = time.perf_counter()
+    wyniki = nest_groups(grupy, sheets=arkusze, workers=procesy)
+    print(f"Rozkrój policzony w {time.perf_counter() - start:.1f} s")
+
+    katalog = os.path.join(os.getcwd(), KATALOG_ROZKROJU)
+    os.makedirs(katalog, exist_ok=True)
+    zestawienie = []
+    rozmieszczenie = []
+    print(f"{'Grubość':>8} {'Materiał':<10} {'Arkusz':>11} {'Sztuk':>6} {'Arkuszy':>8} {'Wykorzystanie':>14}")
+    for (grubosc, material), wynik in sorted(wyniki.items()):
+        arkusz = f"{wynik.sheet_width:g}x{wynik.sheet_height:g}"
+        print(f"{grubosc:>8g} {material:<10} {arkusz:>11} {len(wynik.placements):6d} {wynik.sheets:8d} "
+              f"{wynik.utilisation:13.1%}")
+        for nazwa in wynik.unplaced:
+            print(f"  nie mieści się na arkuszu: {nazwa}")
+        zestawienie.append({
+            "Grubość": grubosc, "Materiał": material, "Arkusz": arkusz,
+            "Sztuk": len(wynik.placements), "Arkuszy": wynik.sheets,
+            "Wykorzystanie [%]": round(100 * wynik.utilisation, 1),
+            "Pole detali [m2]": round(wynik.parts_area / 1e6, 3),
+            "Pole arkuszy [m2]": round(wynik.sheet_area / 1e6, 3),
+            "Zajęta długość ostatniego arkusza [mm]": round(wynik.last_used, 1),
+            "Nie mieszczą się": ", ".join(wynik.unplaced),
+        })
+        for p in wynik.placements:
+            rozmieszczenie.append({
+                "Grubość": grubosc, "Materiał": material, "Arkusz nr": p.sheet + 1, "NAZWA": p.name,
+                "X": round(p.x, 1), "Y": round(p.y, 1), "Szerokość": round(p.width, 1),
+                "Wysokość": round(p.height, 1), "Obrót 90°": "tak" if p.rotated else "",
+            })
+        write_nesting_svg(wynik, os.path.join(katalog, f"{grubosc:g}_{material}_{arkusz}.svg"))
+
+    sciezka_wy = os.path.join(os.getcwd(), "rozkroj.xlsx")
+    with pd.ExcelWriter(sciezka_wy) as writer:
+        pd.DataFrame(zestawienie).to_excel(writer, sheet_name="zestawienie", index=False)
+        pd.DataFrame(rozmieszczenie).to_excel(writer, sheet_name="rozmieszczenie", index=False)
+    print(f"Zakończono. Wyniki w pliku: {sciezka_wy}, rysunki arkuszy w: {katalog}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,38 @@
 import os
+import sys
 import math
 import pandas as pd
 import xml.etree.ElementTree as ET
 
-def calculate_out_dimension(external_dim, offset, angle):
-    """
-    Oblicza wymiar OUT:
-    x_out = x_zewn + offset * tan((180 - kąt) / 2).
-    """
-    angle_rad = math.radians((180 - angle) / 2.0)
-    return round(external_dim + offset * math.tan(angle_rad), 2)
+# Wspólna biblioteka dld/ leży w katalogu głównym projektu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from dld.dimensions import convert_dimensions
 
-def calculate_in_dimension(external_dim, inner_radius, thickness, angle):
+def calculate_out_in(dane_list):
     """
-    Oblicza wymiar IN:
-    x_in = x_zewn + (łuk po neutralnej) / 2
-    gdzie łuk po neutralnej = (R_wewn + grubość/2) * (π * kąt / 180).
+    Uzupełnia a_out / b_out / a_in / b_in w słownikach z parse_dld_file dla
+    całego wykazu naraz (jedno wywołanie dld.dimensions.convert_dimensions):
+    x_out = x_zewn + offset * tan((180 - kąt) / 2),
+    x_in  = x_zewn + (łuk po neutralnej) / 2,
+    gdzie offset = R_wewn + grubość, łuk po neutralnej = (R_wewn + grubość/2) * (π * kąt / 180).
     """
-    neutral_arc_length = (inner_radius + thickness / 2.0) * math.radians(angle)
-    return round(external_dim + neutral_arc_length / 2.0, 2)
+    if not dane_list:
+        return
+    n = len(dane_list)
+    # a dla wszystkich plików, potem b dla wszystkich plików
+    dims = convert_dimensions(
+        [d["a_zewn"] for d in dane_list] + [d["b_zewn"] for d in dane_list],
+        [d["kat"] for d in dane_list] * 2,
+        [d["promien_wewn"] for d in dane_list] * 2,
+        [d["grubosc"] for d in dane_list] * 2,
+    )
+    out_values = dims.out.tolist()
+    in_values = dims.inner.tolist()
+    for i, dane in enumerate(dane_list):
+        dane["a_out"] = round(out_values[i], 2)
+        dane["b_out"] = round(out_values[n + i], 2)
+        dane["a_in"] = round(in_values[i], 2)
+        dane["b_in"] = round(in_values[n + i], 2)
 
 def parse_dld_file(dld_path):
     """
@@ -77,12 +91,6 @@ def parse_dld_file(dld_path):
         # Brak kluczowych danych
         return None
 
-    offset = inner_radius + thickness
-    a_out = calculate_out_dimension(a_zewn, offset, angle)
-    b_out = calculate_out_dimension(b_zewn, offset, angle)
-    a_in = calculate_in_dimension(a_zewn, inner_radius, thickness, angle)
-    b_in = calculate_in_dimension(b_zewn, inner_radius, thickness, angle)
-
     neutral_arc_length = (inner_radius + thickness / 2.0) * math.radians(angle)
     rozwiniecie = round(neutral_arc_length, 2)
 
@@ -92,10 +100,6 @@ def parse_dld_file(dld_path):
         "kat": angle,
         "a_zewn": a_zewn,
         "b_zewn": b_zewn,
-        "a_out": a_out,
-        "b_out": b_out,
-        "a_in": a_in,
-        "b_in": b_in,
         "rozwiniecie": rozwiniecie,
     }
 
@@ -134,6 +138,7 @@ def main():
     if not os.path.isdir(folder_tmp):
         os.makedirs(folder_tmp)
 
+    odczytane = []  # (idx, nazwa pliku, dane z parse_dld_file)
     for idx, row in df.iterrows():
         plik_dld_nazwa = row.get("plik_dld", "")
 
@@ -166,6 +171,12 @@ def main():
                 print(f"Błąd przy zapisie 'Błąd parsowania': {e}")
             continue
 
+        odczytane.append((idx, plik_dld_nazwa, dane_dld))
+
+    # Wymiary out / in całego wykazu liczone razem
+    calculate_out_in([dane_dld for _, _, dane_dld in odczytane])
+
+    for idx, plik_dld_nazwa, dane_dld in odczytane:
         # Spróbujmy wypełnić kolumny
         try:
             opis_txt = (